@@ -0,0 +1,299 @@
+"""Adjust how many MDXICAdvancedTool processes run at once from system load.
+
+``AdaptiveController`` samples CPU utilisation, available memory and the
+RSS of every running tool process. It lowers the concurrency limit when
+the CPUs are saturated or memory runs short, and raises it again, one step
+at a time, while there is spare CPU and memory for one more tool of the
+size seen so far. A new launch is held back whenever available memory
+minus that expected tool size would fall below the configured headroom.
+
+Uses psutil when installed and ``/proc`` otherwise; where neither is
+available the controller keeps its starting limit.
+
+Settings live in the active config profile::
+
+    "adaptive_concurrency": {"enabled": true, "min": 1, "max": 8,
+                             "memory_headroom_mb": 2048, "cpu_high": 0.9, "cpu_low": 0.6}
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional
+
+try:
+    import psutil  # type: ignore[import]
+except ImportError:  # pragma: no cover - optional dependency
+    psutil = None
+
+DEFAULT_MEMORY_HEADROOM_MB = 2048
+DEFAULT_CPU_HIGH = 0.9
+DEFAULT_CPU_LOW = 0.6
+SAMPLE_INTERVAL = 2.0
+# Wait this long after a change before changing the limit again, so a
+# newly started tool has time to show up in the load figures.
+SETTLE_SECONDS = 10.0
+
+
+class SystemSample(NamedTuple):
+    cpu_busy: Optional[float]  # fraction of all CPUs busy since the previous sample
+    available_bytes: Optional[int]
+    total_bytes: Optional[int]
+
+
+class SystemProbe:
+    """Reads system CPU and memory figures through psutil or ``/proc``."""
+
+    def __init__(self):
+        self._last_cpu = None
+        # The first CPU reading only sets the reference point.
+        if psutil is not None:
+            psutil.cpu_percent(interval=None)
+        else:
+            self._proc_cpu_busy()
+
+    def sample(self) -> SystemSample:
+        if psutil is not None:
+            memory = psutil.virtual_memory()
+            return SystemSample(psutil.cpu_percent(interval=None) / 100.0, memory.available, memory.total)
+        return SystemSample(self._proc_cpu_busy(), *_proc_meminfo())
+
+    def _proc_cpu_busy(self) -> Optional[float]:
+        try:
+            with open("/proc/stat", "r", encoding="ascii") as handle:
+                fields = handle.readline().split()[1:]
+        except (OSError, IndexError):
+            return _load_average_busy()
+        values = [int(value) for value in fields]
+        idle = values[3] + (values[4] if len(values) > 4 else 0)
+        total = sum(values[:8])
+        previous, self._last_cpu = self._last_cpu, (idle, total)
+        if previous is None or total == previous[1]:
+            return None
+        return 1.0 - (idle - previous[0]) / (total - previous[1])
+
+
+def _load_average_busy() -> Optional[float]:
+    try:
+        return os.getloadavg()[0] / (os.cpu_count() or 1)
+    except (AttributeError, OSError):
+        return None
+
+
+def _proc_meminfo():
+    values: Dict[str, int] = {}
+    try:
+        with open("/proc/meminfo", "r", encoding="ascii") as handle:
+            for line in handle:
+                name, _, rest = line.partition(":")
+                parts = rest.split()
+                if parts:
+                    values[name] = int(parts[0]) * 1024
+    except (OSError, ValueError):
+        return None, None
+    return values.get("MemAvailable"), values.get("MemTotal")
+
+
+def process_rss(pid: int) -> Optional[int]:
+    """Resident set size of ``pid`` and its children, or ``None`` if it cannot be read."""
+    if psutil is not None:
+        try:
+            process = psutil.Process(pid)
+            members = [process] + process.children(recursive=True)
+        except psutil.Error:
+            return None
+        total = 0
+        for member in members:
+            try:
+                total += member.memory_info().rss
+            except psutil.Error:
+                pass
+        return total
+    try:
+        with open(f"/proc/{pid}/status", "r", encoding="ascii") as handle:
+            for line in handle:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        return None
+    return None
+
+
+class AdaptiveSettings(NamedTuple):
+    min_workers: int = 1
+    max_workers: int = os.cpu_count() or 1
+    memory_headroom_bytes: int = DEFAULT_MEMORY_HEADROOM_MB << 20
+    cpu_high: float = DEFAULT_CPU_HIGH
+    cpu_low: float = DEFAULT_CPU_LOW
+
+    @classmethod
+    def from_mapping(cls, values: Optional[Mapping[str, Any]]) -> "AdaptiveSettings":
+        """Settings from a config mapping; missing or invalid values keep their defaults."""
+        values = values or {}
+        defaults = cls()
+
+        def number(key, default, kind=float):
+            try:
+                return kind(values.get(key, default))
+            except (TypeError, ValueError):
+                return default
+
+        upper = max(1, number("max", defaults.max_workers, int))
+        lower = min(upper, max(1, number("min", defaults.min_workers, int)))
+        headroom_mb = max(0.0, number("memory_headroom_mb", DEFAULT_MEMORY_HEADROOM_MB))
+        return cls(
+            lower,
+            upper,
+            int(headroom_mb * (1 << 20)),
+            number("cpu_high", defaults.cpu_high),
+            number("cpu_low", defaults.cpu_low),
+        )
+
+
+class AdaptiveController:
+    """Concurrency limit that follows CPU load and memory; safe to use from several threads."""
+
+    def __init__(self,
+                 settings: AdaptiveSettings,
+                 start_workers: Optional[int] = None,
+                 probe: Optional[SystemProbe] = None,
+                 interval: float = SAMPLE_INTERVAL,
+                 settle_seconds: float = SETTLE_SECONDS):
+        self.settings = settings
+        self.interval = interval
+        self.settle_seconds = settle_seconds
+        start = start_workers if start_workers is not None else settings.min_workers
+        self.limit = min(settings.max_workers, max(settings.min_workers, start))
+        self._probe = probe or SystemProbe()
+        self._lock = threading.Lock()
+        self._rss: Dict[int, int] = {}  # running pid -> last RSS
+        self._peaks: Dict[int, int] = {}  # running pid -> peak RSS
+        self._peak_tool_rss = 0
+        self._last_sample: Optional[SystemSample] = None
+        self._sampled_at = 0.0
+        self._changed_at = 0.0
+        self.reason = "starting"
+
+    def register(self, pid: int) -> None:
+        with self._lock:
+            self._rss[pid] = self._peaks[pid] = 0
+
+    def unregister(self, pid: int) -> None:
+        with self._lock:
+            self._rss.pop(pid, None)
+            self._peak_tool_rss = max(self._peak_tool_rss, self._peaks.pop(pid, 0))
+
+    def record_peak(self, peak_rss: int) -> None:
+        """Account for a finished tool's peak RSS as measured by the OS."""
+        with self._lock:
+            self._peak_tool_rss = max(self._peak_tool_rss, peak_rss)
+
+    def expected_tool_bytes(self) -> int:
+        """Memory a further tool process is expected to need: the largest RSS seen so far."""
+        with self._lock:
+            return max([self._peak_tool_rss] + list(self._peaks.values()))
+
+    def running_rss(self) -> int:
+        with self._lock:
+            return sum(self._rss.values())
+
+    def update(self, running: int, waiting: int, now: Optional[float] = None) -> int:
+        """Take a new sample if one is due and adjust the limit; returns the limit."""
+        now = time.monotonic() if now is None else now
+        if now - self._sampled_at < self.interval and self._last_sample is not None:
+            return self.limit
+        sample = self._probe.sample()
+        with self._lock:
+            pids = list(self._rss)
+        readings = {pid: process_rss(pid) for pid in pids}
+        with self._lock:
+            for pid, rss in readings.items():
+                if rss is not None and pid in self._rss:
+                    self._rss[pid] = rss
+                    self._peaks[pid] = max(self._peaks[pid], rss)
+        self._sampled_at = now
+        self._last_sample = sample
+        self._adjust(sample, running, waiting, now)
+        return self.limit
+
+    def _memory_short(self, sample: SystemSample, extra_tools: int) -> bool:
+        if sample.available_bytes is None:
+            return False
+        expected = self.expected_tool_bytes()
+        with self._lock:
+            # Tools that are still growing towards the expected size will take more.
+            growth = sum(max(0, expected - rss) for rss in self._rss.values())
+        need = self.settings.memory_headroom_bytes + growth + extra_tools * expected
+        return sample.available_bytes < need
+
+    def _adjust(self, sample: SystemSample, running: int, waiting: int, now: float) -> None:
+        settings = self.settings
+        # Launches are held back on low memory at once (see may_launch); the
+        # limit itself only moves once the previous change has settled.
+        if now - self._changed_at < self.settle_seconds:
+            return
+        if self._memory_short(sample, 0):
+            if self.limit > settings.min_workers:
+                self._set_limit(max(settings.min_workers, min(self.limit, running) - 1), "low memory", now)
+            return
+        if sample.cpu_busy is not None and sample.cpu_busy > settings.cpu_high:
+            if self.limit > settings.min_workers:
+                self._set_limit(self.limit - 1, f"CPU {sample.cpu_busy:.0%} busy", now)
+            return
+        cpu_spare = sample.cpu_busy is None or sample.cpu_busy < settings.cpu_low
+        if (cpu_spare and waiting and running >= self.limit and self.limit < settings.max_workers
+                and not self._memory_short(sample, 1)):
+            self._set_limit(self.limit + 1, "spare CPU and memory", now)
+
+    def _set_limit(self, limit: int, reason: str, now: float) -> None:
+        self.limit = limit
+        self.reason = reason
+        self._changed_at = now
+
+    def may_launch(self, running: int) -> bool:
+        """Whether another tool process may start now."""
+        if running < self.settings.min_workers:
+            return True
+        if running >= self.limit:
+            return False
+        sample = self._last_sample
+        return sample is None or not self._memory_short(sample, 1)
+
+    def describe(self) -> str:
+        sample = self._last_sample
+        parts = [f"limit {self.limit} ({self.reason})"]
+        if sample is not None and sample.cpu_busy is not None:
+            parts.append(f"CPU {sample.cpu_busy:.0%}")
+        if sample is not None and sample.available_bytes is not None:
+            parts.append(f"{sample.available_bytes / (1 << 30):.1f} GB free")
+        tools_rss = self.running_rss()
+        if tools_rss:
+            parts.append(f"tools {tools_rss / (1 << 30):.2f} GB")
+        return ", ".join(parts)
+
+
+def controller_from_config(values: Optional[Mapping[str, Any]], concurrency: int) -> Optional[AdaptiveController]:
+    """An ``AdaptiveController`` starting at ``concurrency``, or ``None`` when the setting is off."""
+    if not isinstance(values, Mapping) or not values.get("enabled", True):
+        return None
+    return AdaptiveController(AdaptiveSettings.from_mapping(values), start_workers=concurrency)
+
+
+def sample_report() -> List[str]:
+    """Current figures as text, for checking what the controller would see on this machine."""
+    probe = SystemProbe()
+    time.sleep(0.5)
+    sample = probe.sample()
+    source = "psutil" if psutil is not None else "/proc"
+    return [
+        f"source:    {source}",
+        f"cpu busy:  {'unknown' if sample.cpu_busy is None else format(sample.cpu_busy, '.0%')}",
+        f"available: {'unknown' if sample.available_bytes is None else f'{sample.available_bytes / (1 << 30):.2f} GB'}",
+        f"total:     {'unknown' if sample.total_bytes is None else f'{sample.total_bytes / (1 << 30):.2f} GB'}",
+    ]
+
+
+if __name__ == "__main__":
+    print("\n".join(sample_report()))
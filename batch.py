@@ -0,0 +1,389 @@
+"""Run many solver inputs through MDXICAdvancedTool, longest or shortest predicted job first.
+
+Jobs are ordered with the runtime predictions of ``runtime_model`` and
+handed to the workers in that order (list scheduling). Longest-first keeps
+the end of a mixed batch from waiting on one long straggler; shortest-first
+returns most results early. The ETA simulates the same schedule over the
+predicted runtimes, counting what is left of the jobs already running.
+
+    python -m batch --solver PressureOven [--order longest|shortest|listed] [--jobs N] [--adaptive] input.json ...
+
+With ``--adaptive`` (or the ``adaptive_concurrency`` setting) the number
+of jobs running at once follows CPU load and free memory, starting from
+``--jobs``; see ``adaptive_concurrency``. Each job runs in its own scratch
+directory and its results are staged back while later jobs run; see
+``scratch``. A relative ``OutputFolder`` is taken relative to the
+application folder, as for a run from the main window, not to the input
+file or the current directory.
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import statistics
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional
+
+import json_io
+from adaptive_concurrency import AdaptiveController, controller_from_config
+from execution_policy import ExecutionPolicy, SlotPlanner, SlotPool, policy_settings
+from run_logs import APP_DIR, append_log_line, append_log_summary, default_log_dir, write_run_log
+from runtime_model import Estimate, RuntimeModel, extract_features, format_duration
+from scratch import ResultStager, ScratchJob, scratch_root
+from snapshot_store import SnapshotStore, store_for_logs
+from tool_runner import SOLVER_CODES, build_command, run_tool_process
+from tracing import span
+
+ORDERS = ("longest", "shortest", "listed")
+# Event name for messages about the batch as a whole rather than one job.
+BATCH_EVENT = "(batch)"
+
+
+class BatchJob(NamedTuple):
+    name: str
+    solver: str
+    input_path: Path
+    solver_input: Any
+    estimate: Optional[Estimate]
+
+
+class JobResult(NamedTuple):
+    status: str  # "ran" or "failed"
+    return_code: Optional[int] = None
+    seconds: float = 0.0
+    log_path: Optional[Path] = None
+    message: str = ""
+
+
+def make_jobs(solver: str, input_paths: Iterable, model: Optional[RuntimeModel] = None) -> List[BatchJob]:
+    """Read each solver input and predict its runtime; raises ``ValueError`` for unreadable inputs."""
+    if solver not in SOLVER_CODES:
+        raise ValueError(f"Unknown solver '{solver}'.")
+    jobs = []
+    names = set()
+    for path in input_paths:
+        path = Path(path).expanduser().absolute()
+        try:
+            solver_input = json_io.load_path(path)
+        except (OSError, json_io.JSONDecodeError) as exc:
+            raise ValueError(f"Cannot read {path}: {exc}") from exc
+        name = path.stem
+        counter = 1
+        while name in names:
+            counter += 1
+            name = f"{path.stem}_{counter}"
+        names.add(name)
+        estimate = model.predict(solver, extract_features(solver_input)) if model is not None else None
+        jobs.append(BatchJob(name, solver, path, solver_input, estimate))
+    return jobs
+
+
+def predicted_seconds(jobs: List[BatchJob]) -> List[float]:
+    """Predicted runtime per job; jobs without a prediction count as a typical job of the batch."""
+    known = [job.estimate.seconds for job in jobs if job.estimate is not None]
+    typical = statistics.median(known) if known else 0.0
+    return [job.estimate.seconds if job.estimate is not None else typical for job in jobs]
+
+
+def order_jobs(jobs: List[BatchJob], order: str = "longest") -> List[BatchJob]:
+    if order == "listed":
+        return list(jobs)
+    if order not in ORDERS:
+        raise ValueError(f"Unknown order '{order}'; expected one of {', '.join(ORDERS)}.")
+    seconds = predicted_seconds(jobs)
+    ranked = sorted(range(len(jobs)), key=lambda index: seconds[index], reverse=order == "longest")
+    return [jobs[index] for index in ranked]
+
+
+def simulate_makespan(durations: Iterable[float], workers: int, busy: Iterable[float] = ()) -> float:
+    """Finish time of list-scheduling ``durations`` in order on ``workers`` slots.
+
+    ``busy`` holds the remaining seconds of jobs already occupying slots.
+    """
+    slots = sorted(busy)[:max(1, workers)]
+    slots += [0.0] * (max(1, workers) - len(slots))
+    heapq.heapify(slots)
+    for duration in durations:
+        heapq.heappush(slots, heapq.heappop(slots) + duration)
+    return max(slots)
+
+
+class BatchRunner:
+    def __init__(self,
+                 jobs: List[BatchJob],
+                 tool_path,
+                 parameter: str = "",
+                 max_workers: int = 1,
+                 order: str = "longest",
+                 snapshot_store: Optional[SnapshotStore] = None,
+                 on_event: Optional[Callable[[str, str], None]] = None,
+                 controller: Optional[AdaptiveController] = None,
+                 execution_policy: Optional[Dict[str, Any]] = None,
+                 scratch_dir: str = "",
+                 on_log_finished: Optional[Callable[[Path], None]] = None,
+                 stager: Optional[ResultStager] = None,
+                 log_dir=None,
+                 base_dir=None):
+        self.jobs = order_jobs(jobs, order)
+        self.tool_path = Path(tool_path).expanduser().absolute()
+        self.parameter = parameter
+        self.max_workers = max(1, max_workers)
+        self.snapshot_store = snapshot_store
+        self.on_event = on_event
+        self.controller = controller
+        pool_size = controller.settings.max_workers if controller is not None else self.max_workers
+        self.slots = SlotPool(SlotPlanner(policy_settings(execution_policy, "batch"), pool_size))
+        self.scratch_root = scratch_root(scratch_dir)
+        self.stager = stager or ResultStager()
+        self.log_dir = Path(log_dir) if log_dir is not None else default_log_dir()
+        self.base_dir = Path(base_dir) if base_dir is not None else APP_DIR
+        self.on_log_finished = on_log_finished
+        self._staging: Dict[str, Any] = {}
+        self._predicted = dict(zip((job.name for job in self.jobs), predicted_seconds(self.jobs)))
+        self._has_estimates = any(job.estimate is not None for job in self.jobs)
+        self._started: Dict[str, float] = {}
+        self._finished: set = set()
+        self._lock = threading.Lock()
+
+    def eta_seconds(self) -> float:
+        """Predicted seconds until the whole batch has finished."""
+        now = time.perf_counter()
+        with self._lock:
+            busy = [
+                max(0.0, self._predicted[name] - (now - started))
+                for name, started in self._started.items()
+                if name not in self._finished
+            ]
+            queued = [self._predicted[job.name] for job in self.jobs if job.name not in self._started]
+        return simulate_makespan(queued, self.workers(), busy)
+
+    def workers(self) -> int:
+        """Current number of jobs allowed to run at once."""
+        return self.controller.limit if self.controller is not None else self.max_workers
+
+    def _emit(self, job_name: str, message: str) -> None:
+        if self.on_event is None:
+            return
+        if self._has_estimates:
+            message += f"; batch ETA {format_duration(self.eta_seconds())}"
+        self.on_event(job_name, message)
+
+    def _run_job(self, job: BatchJob) -> JobResult:
+        with self._lock:
+            self._started[job.name] = time.perf_counter()
+        self._emit(job.name, "started")
+        slot, policy = self.slots.acquire()
+        try:
+            with span("batch.job", job=job.name, solver=job.solver, slot=slot):
+                return self._execute(job, policy)
+        finally:
+            self.slots.release(slot)
+            with self._lock:
+                self._finished.add(job.name)
+
+    def _execute(self, job: BatchJob, policy: ExecutionPolicy) -> JobResult:
+        try:
+            scratch = ScratchJob(self.scratch_root, job.name)
+            _, outputs = scratch.prepare_input(job.solver_input, base_dir=self.base_dir)
+        except (OSError, TypeError, ValueError) as exc:
+            return JobResult("failed", message=f"Cannot prepare scratch directory: {exc}")
+        command = build_command(self.tool_path, SOLVER_CODES[job.solver], scratch.input_path, self.parameter)
+        log_path = write_run_log(
+            f"batch:{job.name}",
+            job.solver,
+            self.tool_path,
+            job.input_path,
+            command,
+            None,
+            solver_input=job.solver_input,
+            snapshot_store=self.snapshot_store,
+            log_dir=scratch.path,
+        )
+        append_log_line(log_path, "POLICY", policy.describe())
+        started = time.perf_counter()
+        pids = []
+
+        def on_start(pid):
+            pids.append(pid)
+            if self.controller is not None:
+                self.controller.register(pid)
+
+        try:
+            result = run_tool_process(
+                command,
+                on_line=lambda label, line: append_log_line(log_path, label, line),
+                capture=False,
+                on_start=on_start,
+                policy=policy,
+                cwd=scratch.path,
+            )
+        except OSError as exc:
+            append_log_summary(log_path, "failed to launch")
+            log_path = scratch.move_log(log_path, self.log_dir)
+            self._log_finished(log_path)
+            scratch.cleanup()
+            return JobResult("failed", log_path=log_path, message=f"Failed to start tool: {exc}")
+        finally:
+            if self.controller is not None:
+                for pid in pids:
+                    self.controller.unregister(pid)
+        elapsed = time.perf_counter() - started
+        if self.controller is not None and result.peak_rss_bytes:
+            self.controller.record_peak(result.peak_rss_bytes)
+        append_log_summary(log_path, result.return_code, elapsed)
+        log_path = scratch.move_log(log_path, self.log_dir)
+        self._log_finished(log_path)
+        # Copying results back overlaps with the next job instead of holding its slot.
+        with self._lock:
+            self._staging[job.name] = self.stager.submit(scratch, outputs, log_path)
+        if result.return_code != 0:
+            return JobResult("failed", result.return_code, elapsed, log_path, f"exit code {result.return_code}")
+        return JobResult("ran", result.return_code, elapsed, log_path)
+
+    def _log_finished(self, log_path) -> None:
+        if log_path and self.on_log_finished is not None:
+            self.on_log_finished(log_path)
+
+    def _may_launch(self, running: int) -> bool:
+        if self.controller is not None:
+            return self.controller.may_launch(running)
+        return running < self.max_workers
+
+    def _update_controller(self, running: int, waiting: int) -> None:
+        limit, reason = self.controller.limit, self.controller.reason
+        self.controller.update(running, waiting)
+        if (self.controller.limit, self.controller.reason) != (limit, reason) and self.on_event is not None:
+            self.on_event(BATCH_EVENT, f"concurrency {self.controller.describe()}")
+
+    def run(self) -> Dict[str, JobResult]:
+        results: Dict[str, JobResult] = {}
+        queue = list(self.jobs)
+        with ThreadPoolExecutor(max_workers=self.slots.planner.slots) as executor:
+            running = {}
+            while queue or running:
+                if self.controller is not None:
+                    self._update_controller(len(running), len(queue))
+                while queue and self._may_launch(len(running)):
+                    job = queue.pop(0)
+                    running[executor.submit(self._run_job, job)] = job
+                # With a controller, wake up regularly to re-sample and maybe launch more.
+                timeout = self.controller.interval if self.controller is not None and queue else None
+                done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job = running.pop(future)
+                    try:
+                        results[job.name] = future.result()
+                    except Exception as exc:
+                        results[job.name] = JobResult("failed", message=str(exc))
+                    result = results[job.name]
+                    self._emit(job.name, result.status + (f" ({result.message})" if result.message else ""))
+        return self._wait_for_staging(results)
+
+    def _wait_for_staging(self, results: Dict[str, JobResult]) -> Dict[str, JobResult]:
+        with self._lock:
+            staging = dict(self._staging)
+        for name, future in staging.items():
+            try:
+                report = future.result()
+            except Exception as exc:
+                errors = [str(exc)]
+            else:
+                errors = report.errors
+            if errors:
+                result = results[name]
+                note = f"staging failed for {len(errors)} file(s)"
+                results[name] = result._replace(message=f"{result.message}; {note}" if result.message else note)
+                self._emit(name, note)
+        return results
+
+
+def format_plan(jobs: List[BatchJob], workers: int, order: str = "longest") -> str:
+    ordered = order_jobs(jobs, order)
+    lines = [f"{len(ordered)} job(s), {workers} at a time, {order} first" if order != "listed"
+             else f"{len(ordered)} job(s), {workers} at a time, in listed order"]
+    for job in ordered:
+        detail = f" ({job.estimate.method})" if job.estimate is not None else ""
+        lines.append(f"  {job.name:<30} {format_duration(job.estimate.seconds if job.estimate else None)}{detail}")
+    if any(job.estimate is not None for job in ordered):
+        eta = simulate_makespan(predicted_seconds(ordered), workers)
+        lines.append(f"Predicted batch time: {format_duration(eta)}")
+    else:
+        lines.append("Predicted batch time: unknown (no successful runs logged yet)")
+    return "\n".join(lines)
+
+
+def format_results(jobs: List[BatchJob], results: Dict[str, JobResult]) -> str:
+    lines = []
+    for job in jobs:
+        result = results.get(job.name)
+        if result is None:
+            continue
+        predicted = format_duration(job.estimate.seconds) if job.estimate is not None else "unknown"
+        note = f" - {result.message}" if result.message else ""
+        lines.append(f"  {job.name:<30} {result.status} in {format_duration(result.seconds)} (predicted {predicted}){note}")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    from config_manager import (
+        load_adaptive_concurrency,
+        load_concurrency,
+        load_execution_policy,
+        load_parameter,
+        load_scratch_dir,
+        load_tool_path,
+    )
+
+    parser = argparse.ArgumentParser(description="Run solver inputs as a batch ordered by predicted runtime.")
+    parser.add_argument("inputs", nargs="+", help="Solver input JSON files.")
+    parser.add_argument("--solver", required=True, choices=sorted(SOLVER_CODES), help="Run solver for every input.")
+    parser.add_argument("--order", choices=ORDERS, default="longest", help="Which predicted jobs start first.")
+    parser.add_argument("--tool", help="MDXICAdvancedTool executable (default: the configured tool path).")
+    parser.add_argument("--param", help="--param string for every job (default: the configured one).")
+    parser.add_argument("--jobs", type=int, help="Jobs to run at once (default: the configured concurrency).")
+    parser.add_argument("--adaptive", action=argparse.BooleanOptionalAction, default=None,
+                        help="Adapt --jobs to CPU load and free memory (default: the adaptive_concurrency setting).")
+    parser.add_argument("--dry-run", action="store_true", help="Only print the order and predicted runtimes.")
+    args = parser.parse_args()
+
+    store = store_for_logs()
+    try:
+        jobs = make_jobs(args.solver, args.inputs, RuntimeModel.fit(snapshot_store=store))
+    except ValueError as exc:
+        parser.error(str(exc))
+    workers = args.jobs or load_concurrency()
+    print(format_plan(jobs, workers, args.order), flush=True)
+    if args.dry_run:
+        return
+
+    tool_path = args.tool or load_tool_path()
+    if not tool_path:
+        parser.error("No tool executable configured; pass --tool.")
+    adaptive = load_adaptive_concurrency()
+    if args.adaptive is not None:
+        adaptive = dict(adaptive or {}, enabled=args.adaptive)
+    controller = controller_from_config(adaptive, workers)
+    runner = BatchRunner(
+        jobs,
+        tool_path,
+        parameter=load_parameter() if args.param is None else args.param,
+        max_workers=workers,
+        order=args.order,
+        snapshot_store=store,
+        on_event=lambda name, message: print(f"[{name}] {message}", flush=True),
+        controller=controller,
+        execution_policy=load_execution_policy(),
+        scratch_dir=load_scratch_dir(),
+    )
+    results = runner.run()
+    print(format_results(runner.jobs, results))
+    if any(result.status == "failed" for result in results.values()):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
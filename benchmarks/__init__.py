@@ -0,0 +1 @@
+"""Performance benchmarks; run modules with ``python -m benchmarks.<name>`` from the repo root."""
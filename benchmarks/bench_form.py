@@ -0,0 +1,73 @@
+"""Form construction and value application in ``MainWindow`` under offscreen Qt."""
+
+import os
+from pathlib import Path
+
+from benchmarks.common import Case, SkipCase
+from synthetic_inputs import make_reliability_parameters
+
+_app = None
+_window = None
+
+
+def _main_window(workdir):
+    global _app, _window
+    if _window is not None:
+        return _window
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    try:
+        from PySide6 import QtWidgets
+    except ImportError as exc:
+        raise SkipCase(f"PySide6 is not available: {exc}")
+    import main_ui
+    from log_search import LogIndex
+
+    _app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    # The window must not compress, prune or index the user's run logs; snapshots follow the log folder.
+    _window = main_ui.MainWindow(maintain_logs=False)
+    _window.log_store.root = Path(workdir) / "run_logs"
+    _window.log_index = LogIndex(_window.log_store.root)
+    return _window
+
+
+def _setup_rebuild(solver_name, workdir):
+    window = _main_window(workdir)
+    if solver_name not in window.solvers:
+        raise SkipCase(f"unknown solver {solver_name}")
+
+    def rebuild():
+        window._rebuild_form(solver_name)
+        _app.processEvents()
+
+    return rebuild
+
+
+def _setup_apply(material_count, workdir):
+    from ui.serializers import decode_solver_payload, serialize_solver_payload
+
+    window = _main_window(workdir)
+    window._show_form("ReliabilityTools")
+    payload = serialize_solver_payload("ReliabilityTools", make_reliability_parameters(material_count))
+    sections = decode_solver_payload("ReliabilityTools", payload["ReliabilityTools"])
+
+    def apply():
+        with window.current_form.bulk_update():
+            window._apply_section_values(sections)
+        _app.processEvents()
+
+    return apply
+
+
+CASES = [
+    Case(
+        "form.rebuild",
+        _setup_rebuild,
+        sizes={"default": ["ReliabilityTools", "PressureOven", "MappingTool"]},
+    ),
+    Case(
+        "form.apply_section_values",
+        _setup_apply,
+        sizes={"quick": [10, 100], "default": [10, 100, 1000], "full": [10, 100, 1000, 5000]},
+        repeat=3,
+    ),
+]
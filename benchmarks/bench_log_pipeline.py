@@ -0,0 +1,37 @@
+"""The run log pipeline (``run_tool_process`` + ``append_log_line``) against the fake tool."""
+
+import sys
+from pathlib import Path
+
+from benchmarks.common import Case
+from run_logs import append_log_line
+from tool_runner import build_command, run_tool_process
+
+FAKE_TOOL = Path(__file__).resolve().parent.parent / "fake_icadv_tool.py"
+
+
+def _setup(line_count, workdir):
+    input_path = workdir / "log_pipeline_input.json"
+    input_path.write_text('{"MappingTool": {}}', encoding="utf-8")
+    command = [sys.executable] + build_command(
+        FAKE_TOOL, "mt", input_path, f"fake:lines={line_count},stderr_every=50,history_rows=0"
+    )
+    log_path = workdir / f"run_log_bench_{line_count}.log"
+
+    def run():
+        log_path.write_text("", encoding="utf-8")
+        result = run_tool_process(command, on_line=lambda label, line: append_log_line(log_path, label, line))
+        if result.return_code != 0:
+            raise RuntimeError(result.stderr)
+
+    return run
+
+
+CASES = [
+    Case(
+        "log_pipeline",
+        _setup,
+        sizes={"quick": [1000, 10000], "default": [1000, 10000, 100000], "full": [1000, 10000, 100000, 1000000]},
+        repeat=3,
+    ),
+]
@@ -0,0 +1,76 @@
+"""Compare the generic payload formatter with the compiled serializers.
+
+    python -m benchmarks.bench_payload [--sizes 100 1000 5000] [--repeat 5]
+"""
+
+import argparse
+import timeit
+
+from benchmarks.common import Case
+from synthetic_inputs import make_pressure_oven_parameters, make_reliability_parameters
+from ui.formatters import format_solver_payload
+from ui.serializers import serialize_solver_payload
+
+
+def _best_time(func, repeat):
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def run(sizes, repeat):
+    rows = []
+    for size in sizes:
+        cases = [
+            ("ReliabilityTools", make_reliability_parameters(size)),
+            ("PressureOven", make_pressure_oven_parameters(size)),
+        ]
+        for solver_name, parameters in cases:
+            generic = format_solver_payload(solver_name, parameters)
+            compiled = serialize_solver_payload(solver_name, parameters)
+            if generic != compiled:
+                raise AssertionError(f"Compiled serializer output differs for {solver_name} (n={size})")
+            generic_time = _best_time(lambda: format_solver_payload(solver_name, parameters), repeat)
+            compiled_time = _best_time(lambda: serialize_solver_payload(solver_name, parameters), repeat)
+            rows.append((solver_name, size, generic_time, compiled_time))
+    return rows
+
+
+def _payload_setup(serialize, solver_name, make_parameters):
+    def setup(size, _workdir):
+        parameters = make_parameters(size)
+        return lambda: serialize(solver_name, parameters)
+
+    return setup
+
+
+_PAYLOAD_SIZES = {"quick": [100, 1000], "default": [100, 1000, 10000], "full": [100, 1000, 10000, 50000]}
+CASES = [
+    Case(
+        f"payload.{label}.{solver_name}",
+        _payload_setup(serialize, solver_name, make_parameters),
+        _PAYLOAD_SIZES,
+    )
+    for label, serialize in (("generic", format_solver_payload), ("compiled", serialize_solver_payload))
+    for solver_name, make_parameters in (
+        ("ReliabilityTools", make_reliability_parameters),
+        ("PressureOven", make_pressure_oven_parameters),
+    )
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'solver':<18}{'size':>8}{'generic ms':>14}{'compiled ms':>14}{'speedup':>10}")
+    for solver_name, size, generic_time, compiled_time in run(args.sizes, args.repeat):
+        speedup = generic_time / compiled_time if compiled_time else float("inf")
+        print(
+            f"{solver_name:<18}{size:>8}{generic_time * 1000:>14.2f}"
+            f"{compiled_time * 1000:>14.2f}{speedup:>9.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""``load_columns`` and both plot renderers on growing pressure/radius histories."""
+
+import os
+
+# Headless rendering; must be set before matplotlib is first imported.
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+import plot_pressure_radius  # noqa: E402
+from benchmarks.common import Case, SkipCase  # noqa: E402
+from plot_pressure_radius import load_columns, plot_to_svg  # noqa: E402
+from synthetic_inputs import write_history_csv  # noqa: E402
+
+
+def _history(size, workdir):
+    path = workdir / f"history_{size}.csv"
+    if not path.exists():
+        write_history_csv(path, size)
+    return path
+
+
+def _setup_load_columns(size, workdir):
+    path = _history(size, workdir)
+    return lambda: load_columns(path)
+
+
+def _setup_svg(size, workdir):
+    columns = load_columns(_history(size, workdir))
+    # plot_to_svg appends the ".svg" suffix itself.
+    output = str(workdir / f"history_{size}")
+    return lambda: plot_to_svg(*columns, output)
+
+
+def _setup_matplotlib(size, workdir):
+    if plot_pressure_radius.plt is None:
+        raise SkipCase("matplotlib is not installed")
+    columns = load_columns(_history(size, workdir))
+    output = workdir / f"history_{size}.png"
+
+    def render():
+        plot_pressure_radius.plot_with_matplotlib(*columns, output)
+        plot_pressure_radius.plt.close("all")
+
+    return render
+
+
+_HISTORY_SIZES = {"quick": [1000, 10000], "default": [1000, 10000, 100000], "full": [1000, 10000, 100000, 1000000]}
+CASES = [
+    Case("plots.load_columns", _setup_load_columns, _HISTORY_SIZES),
+    Case("plots.svg", _setup_svg, _HISTORY_SIZES),
+    Case("plots.matplotlib", _setup_matplotlib, _HISTORY_SIZES, repeat=3),
+]
@@ -0,0 +1,29 @@
+"""``run_reader`` on synthetic .run files from kilobytes to gigabytes."""
+
+from benchmarks.common import Case, format_bytes
+from run_reader import run_reader
+from synthetic_inputs import write_run_file
+
+MATERIAL_COUNT = 200
+
+
+def _setup(size, workdir):
+    path = workdir / f"synthetic_{size}.run"
+    if not path.exists():
+        write_run_file(path, MATERIAL_COUNT, padding_bytes=size)
+    return lambda: run_reader(path)
+
+
+CASES = [
+    Case(
+        "run_reader",
+        _setup,
+        sizes={
+            "quick": [1 << 10, 1 << 20],
+            "default": [1 << 10, 1 << 20, 64 << 20],
+            "full": [1 << 10, 1 << 20, 64 << 20, 1 << 30],
+        },
+        repeat=5,
+        label=format_bytes,
+    ),
+]
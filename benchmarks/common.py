@@ -0,0 +1,23 @@
+"""Shared pieces of the benchmark cases; see ``benchmarks.suite``."""
+
+from typing import Any, Callable, Dict, List, NamedTuple
+
+
+class SkipCase(Exception):
+    """Raised by a case's setup when it cannot run in this environment."""
+
+
+class Case(NamedTuple):
+    name: str
+    setup: Callable[[Any, Any], Callable[[], Any]]
+    sizes: Dict[str, List[Any]]
+    repeat: int = 5
+    label: Callable[[Any], str] = str
+
+
+def format_bytes(size: int) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:g}{unit}"
+        size /= 1024
+    return f"{size:g}GB"
@@ -0,0 +1,162 @@
+"""Time every hot path over growing data sizes and compare against a baseline.
+
+    python -m benchmarks.suite [--profile quick|default|full] [--only run_reader payload ...]
+                               [--output results.json] [--baseline PATH] [--save-baseline]
+                               [--tolerance 0.25]
+
+Each ``benchmarks.bench_*`` module listed in ``CASE_MODULES`` exposes a
+``CASES`` list. A case's ``setup(size, workdir)`` prepares its input and
+returns the zero-argument callable that is timed; it raises ``SkipCase``
+when an optional dependency is missing. The process exits with status 1
+when a result is slower than the baseline by more than the tolerance.
+"""
+
+import argparse
+import importlib
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import json_io
+from benchmarks.common import Case, SkipCase
+
+CASE_MODULES = (
+    "benchmarks.bench_run_reader",
+    "benchmarks.bench_payload",
+    "benchmarks.bench_plots",
+    "benchmarks.bench_form",
+    "benchmarks.bench_log_pipeline",
+)
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+DEFAULT_TOLERANCE = 0.25
+# Stop repeating a measurement once it has used this much time.
+TIME_BUDGET_SECONDS = 10.0
+
+
+def load_cases(only=None, echo=print) -> List[Case]:
+    cases = []
+    for module_name in CASE_MODULES:
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError as exc:
+            echo(f"{module_name:<44} skipped: {exc}")
+            continue
+        for case in module.CASES:
+            if not only or any(case.name.startswith(prefix) for prefix in only):
+                cases.append(case)
+    return cases
+
+
+def measure(function: Callable[[], Any], repeat: int, budget: float = TIME_BUDGET_SECONDS) -> List[float]:
+    timings = []
+    spent = 0.0
+    while len(timings) < repeat and (not timings or spent < budget):
+        started = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - started
+        timings.append(elapsed)
+        spent += elapsed
+    return timings
+
+
+def run_suite(cases: List[Case], profile: str, workdir: Path, echo=print) -> Dict[str, Dict[str, Any]]:
+    results = {}
+    for case in cases:
+        for size in case.sizes.get(profile) or case.sizes["default"]:
+            key = f"{case.name}[{case.label(size)}]"
+            try:
+                function = case.setup(size, workdir)
+            except SkipCase as exc:
+                echo(f"{key:<44} skipped: {exc}")
+                continue
+            timings = measure(function, case.repeat)
+            results[key] = {
+                "case": case.name,
+                "size": size,
+                "min": min(timings),
+                "median": statistics.median(timings),
+                "runs": len(timings),
+            }
+            echo(f"{key:<44} {min(timings) * 1000:>12.3f} ms  (median {statistics.median(timings) * 1000:.3f}, n={len(timings)})")
+    return results
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "json_backend": json_io.BACKEND,
+    }
+
+
+def compare(results: Dict[str, Dict[str, Any]],
+            baseline: Dict[str, Dict[str, Any]],
+            tolerance: float = DEFAULT_TOLERANCE) -> List[str]:
+    """Return one message per result that is slower than its baseline beyond ``tolerance``."""
+    regressions = []
+    for key, result in results.items():
+        reference = baseline.get(key)
+        if not reference or not reference.get("min"):
+            continue
+        ratio = result["min"] / reference["min"]
+        if ratio > 1 + tolerance:
+            regressions.append(
+                f"{key}: {reference['min'] * 1000:.3f} ms -> {result['min'] * 1000:.3f} ms ({ratio:.2f}x)"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profile", choices=("quick", "default", "full"), default="default",
+                        help="Data sizes to use; 'full' includes the GB-sized inputs.")
+    parser.add_argument("--only", nargs="+", help="Run cases whose name starts with one of these.")
+    parser.add_argument("--output", help="Write results as JSON to this file.")
+    parser.add_argument("--baseline", default=os.fspath(DEFAULT_BASELINE), help="Baseline results to compare with.")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the new baseline.")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed slowdown before a result counts as a regression (0.25 = 25%%).")
+    parser.add_argument("--workdir", help="Folder for generated inputs (default: a temporary folder).")
+    args = parser.parse_args()
+
+    cases = load_cases(args.only)
+    if args.workdir:
+        workdir = Path(args.workdir)
+        workdir.mkdir(parents=True, exist_ok=True)
+        results = run_suite(cases, args.profile, workdir)
+    else:
+        with tempfile.TemporaryDirectory(prefix="icadv-bench-") as temp_dir:
+            results = run_suite(cases, args.profile, Path(temp_dir))
+
+    document = {"environment": environment(), "profile": args.profile, "results": results}
+    if args.output:
+        Path(args.output).write_text(json_io.dumps(document), encoding="utf-8")
+    if args.save_baseline:
+        Path(args.baseline).write_text(json_io.dumps(document), encoding="utf-8")
+        print(f"Baseline saved to {args.baseline}")
+        return
+
+    try:
+        baseline = json_io.load_path(args.baseline).get("results", {})
+    except (OSError, json_io.JSONDecodeError, AttributeError):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one.")
+        return
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) against {args.baseline}:")
+        for message in regressions:
+            print(f"  {message}")
+        sys.exit(1)
+    print(f"\nNo regressions against {args.baseline}.")
+
+
+if __name__ == "__main__":
+    main()
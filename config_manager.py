@@ -1,47 +1,274 @@
-import json
+"""Application settings with named profiles and user/project layering.
+
+Settings are read from ``~/.ICAdvConfig`` (user level) and then from the
+``.ICAdvConfig`` next to the application (project level), whose values
+win. Each file holds named profiles::
+
+    {"active_profile": "default",
+     "profiles": {"default": {"tool_path": "...", "parameter": "...", "concurrency": 2}}}
+
+A flat file with top-level ``tool_path``/``parameter`` keys (the original
+format) is read as the ``default`` profile. Changes are written to the
+project file only, atomically and debounced.
+"""
+
+from __future__ import annotations
+
+import atexit
+import threading
+import time
 from pathlib import Path
-from typing import Dict
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-_CONFIG_PATH = Path("./.ICAdvConfig")
+import json_io
+from json_store import atomic_write_text, file_signature
 
+PROJECT_CONFIG_PATH = Path(__file__).resolve().parent / ".ICAdvConfig"
+USER_CONFIG_PATH = Path.home() / ".ICAdvConfig"
+DEFAULT_PROFILE = "default"
+PROFILE_KEYS = ("tool_path", "parameter", "concurrency")
+# Reads re-stat the config files at most this often to notice external edits.
+REVALIDATE_INTERVAL = 1.0
+WRITE_DELAY = 0.5
 
-def _read_raw_config() -> Dict[str, str]:
-    if not _CONFIG_PATH.exists():
-        return {}
+
+def _read_config_file(path: Path) -> Dict[str, Any]:
     try:
-        with _CONFIG_PATH.open("r", encoding="utf-8") as handle:
-            data = json.load(handle)
-    except (OSError, json.JSONDecodeError):
+        data = json_io.load_path(path)
+    except (OSError, json_io.JSONDecodeError, UnicodeDecodeError):
+        return {}
+    if not isinstance(data, dict):
         return {}
-    if isinstance(data, dict):
-        return {str(key): value for key, value in data.items()}
-    return {}
 
+    profiles = {}
+    raw_profiles = data.get("profiles")
+    if isinstance(raw_profiles, dict):
+        for name, settings in raw_profiles.items():
+            if isinstance(settings, dict):
+                profiles[str(name)] = {str(key): value for key, value in settings.items()}
+    else:
+        legacy = {key: data[key] for key in PROFILE_KEYS if key in data}
+        if legacy:
+            profiles[DEFAULT_PROFILE] = legacy
 
-def _write_raw_config(data: Dict[str, str]) -> None:
-    try:
-        _CONFIG_PATH.parent.mkdir(parents=True, exist_ok=True)
-    except OSError:
-        return
-    try:
-        with _CONFIG_PATH.open("w", encoding="utf-8") as handle:
-            json.dump(data, handle, indent=4)
-    except OSError:
-        pass
+    active = data.get("active_profile")
+    return {
+        "active_profile": str(active) if isinstance(active, str) and active else None,
+        "profiles": profiles,
+    }
+
+
+def _encode_config(config: Dict[str, Any]) -> str:
+    active = config.get("active_profile")
+    profiles = config.get("profiles", {})
+    data: Dict[str, Any] = {}
+    # Mirror the active profile at the top level so older builds that only
+    # know the flat format keep finding the tool path.
+    for key in ("tool_path", "parameter"):
+        value = profiles.get(active or DEFAULT_PROFILE, {}).get(key)
+        if value not in (None, ""):
+            data[key] = value
+    if active:
+        data["active_profile"] = active
+    data["profiles"] = profiles
+    return json_io.dumps(data)
+
+
+class ConfigService:
+    """Loads the config layers once and serves reads from memory."""
+
+    def __init__(self,
+                 project_path=PROJECT_CONFIG_PATH,
+                 user_path: Optional[Path] = USER_CONFIG_PATH,
+                 write_delay: float = WRITE_DELAY,
+                 revalidate_interval: float = REVALIDATE_INTERVAL):
+        self.project_path = Path(project_path)
+        self.user_path = Path(user_path) if user_path is not None else None
+        self.write_delay = write_delay
+        self.revalidate_interval = revalidate_interval
+        self._lock = threading.RLock()
+        self._timer: Optional[threading.Timer] = None
+        self._pending: List[Callable[[Dict[str, Any]], None]] = []
+        self._signatures: Tuple[Any, Any] = (None, None)
+        self._checked_at = 0.0
+        self._user: Dict[str, Any] = {}
+        self._project: Dict[str, Any] = {}
+        self._merged: Dict[str, Any] = {}
+        self.reload()
+
+    def _current_signatures(self) -> Tuple[Any, Any]:
+        user_signature = file_signature(self.user_path) if self.user_path is not None else None
+        return user_signature, file_signature(self.project_path)
+
+    def reload(self) -> None:
+        """Re-read both layers; unsaved changes are reapplied on top."""
+        with self._lock:
+            self._signatures = self._current_signatures()
+            self._checked_at = time.monotonic()
+            self._user = _read_config_file(self.user_path) if self.user_path is not None else {}
+            self._project = _read_config_file(self.project_path)
+            self._project.setdefault("profiles", {})
+            for change in self._pending:
+                change(self._project)
+            self._merge()
+
+    def _merge(self) -> None:
+        profiles: Dict[str, Dict[str, Any]] = {}
+        active = None
+        for layer in (self._user, self._project):
+            for name, settings in layer.get("profiles", {}).items():
+                profiles.setdefault(name, {}).update(settings)
+            active = layer.get("active_profile") or active
+        self._merged = {"active_profile": active or DEFAULT_PROFILE, "profiles": profiles}
+
+    def _revalidate(self) -> None:
+        now = time.monotonic()
+        if now - self._checked_at < self.revalidate_interval:
+            return
+        self._checked_at = now
+        if self._current_signatures() != self._signatures:
+            self.reload()
+
+    def active_profile(self) -> str:
+        with self._lock:
+            self._revalidate()
+            return self._merged["active_profile"]
+
+    def profiles(self) -> List[str]:
+        with self._lock:
+            self._revalidate()
+            names = set(self._merged["profiles"])
+            names.add(self._merged["active_profile"])
+            return sorted(names)
+
+    def profile(self, name: Optional[str] = None) -> Dict[str, Any]:
+        with self._lock:
+            self._revalidate()
+            name = name or self._merged["active_profile"]
+            return dict(self._merged["profiles"].get(name, {}))
+
+    def get(self, key: str, default: Any = "", profile: Optional[str] = None) -> Any:
+        value = self.profile(profile).get(key)
+        return default if value is None else value
+
+    def set(self, key: str, value: Any, profile: Optional[str] = None) -> None:
+        """Set ``key`` in a profile (the active one by default); ``""``/``None`` removes it."""
+        with self._lock:
+            name = profile or self.active_profile()
+            if self.profile(name).get(key) == value or (value in ("", None) and key not in self.profile(name)):
+                return
+
+            def change(config):
+                settings = config["profiles"].setdefault(name, {})
+                if value in ("", None):
+                    settings.pop(key, None)
+                else:
+                    settings[key] = value
+
+            self._apply(change)
+
+    def set_active_profile(self, name: str, copy_from: Optional[str] = None) -> None:
+        """Switch profiles, creating ``name`` from ``copy_from`` if it does not exist yet."""
+        name = name.strip()
+        if not name:
+            return
+        with self._lock:
+            seed = None
+            if name not in self._merged["profiles"] and copy_from:
+                seed = self.profile(copy_from)
+
+            def change(config):
+                config["active_profile"] = name
+                if seed is not None:
+                    config["profiles"].setdefault(name, dict(seed))
+
+            self._apply(change)
+
+    def _apply(self, change: Callable[[Dict[str, Any]], None]) -> None:
+        change(self._project)
+        self._pending.append(change)
+        self._merge()
+        self._schedule_write()
+
+    def _schedule_write(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(self.write_delay, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def flush(self) -> None:
+        """Write pending changes now, merging them over any external edits."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._pending:
+                return
+            if self._current_signatures() != self._signatures:
+                self.reload()
+            try:
+                self.project_path.parent.mkdir(parents=True, exist_ok=True)
+                atomic_write_text(self.project_path, _encode_config(self._project))
+            except OSError:
+                return
+            self._pending.clear()
+            self._signatures = self._current_signatures()
+
+
+_service: Optional[ConfigService] = None
+_service_lock = threading.Lock()
+
+
+def get_config_service() -> ConfigService:
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = ConfigService()
+            atexit.register(_service.flush)
+        return _service
 
 
 def load_tool_path() -> str:
-    return _read_raw_config().get("tool_path", "")
+    return get_config_service().get("tool_path", "")
 
 def load_parameter() -> str:
-    return _read_raw_config().get("parameter", "")
+    return get_config_service().get("parameter", "")
+
+
+def load_concurrency(default: int = 1) -> int:
+    value = get_config_service().get("concurrency", default)
+    try:
+        return max(1, int(value))
+    except (TypeError, ValueError):
+        return default
+
+
+def load_adaptive_concurrency() -> Optional[Dict[str, Any]]:
+    """The ``adaptive_concurrency`` settings of the active profile, if any."""
+    value = get_config_service().get("adaptive_concurrency")
+    return value if isinstance(value, dict) else None
+
+
+def load_execution_policy() -> Optional[Dict[str, Any]]:
+    """The ``execution_policy`` settings of the active profile, if any."""
+    value = get_config_service().get("execution_policy")
+    return value if isinstance(value, dict) else None
+
+
+def load_scratch_dir() -> str:
+    return str(get_config_service().get("scratch_dir", "") or "")
+
+
+def load_log_dir() -> str:
+    return str(get_config_service().get("log_dir", "") or "")
+
+
+def load_log_retention() -> Optional[Dict[str, Any]]:
+    """The ``log_retention`` settings of the active profile, if any."""
+    value = get_config_service().get("log_retention")
+    return value if isinstance(value, dict) else None
 
 
 def save_tool_path(path: str) -> None:
-    data = _read_raw_config()
-    cleaned = path.strip()
-    if cleaned:
-        data["tool_path"] = cleaned
-    else:
-        data.pop("tool_path", None)
-    _write_raw_config(data)
+    get_config_service().set("tool_path", path.strip())
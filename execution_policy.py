@@ -0,0 +1,325 @@
+"""Where and how tool processes run: CPU pinning, NUMA placement, priority and environment.
+
+Policies come from the ``execution_policy`` setting of the active config
+profile, with one entry for single interactive runs and one for parallel
+batch and pipeline jobs::
+
+    "execution_policy": {
+      "interactive": {"nice": 0},
+      "batch": {"placement": "node", "nice": 10, "ionice": "idle",
+                "threads": "auto", "env": {"MKL_DYNAMIC": "FALSE"}}
+    }
+
+``placement`` decides the CPUs of each parallel slot:
+
+* ``"node"`` - slots take turns over the NUMA nodes and a job may use
+  every CPU of its node (the default for batches on multi-node machines);
+* ``"cores"`` - every slot gets its own share of CPUs, still within one
+  node where possible;
+* ``"none"`` - no pinning.
+
+``cpus`` (e.g. ``"0-15"``) limits the CPUs used at all. ``threads`` sets
+``OMP_NUM_THREADS`` and friends; ``"auto"`` uses the CPUs of the slot when
+several jobs run at once. Pinning and ``nice`` need Linux and use the
+``taskset`` and ``nice`` commands, else system calls on the started
+process; ``ionice`` uses psutil or the ``ionice`` command; ``numactl``,
+when installed, also makes a job prefer memory on its node.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+try:
+    import psutil  # type: ignore[import]
+except ImportError:  # pragma: no cover - optional dependency
+    psutil = None
+
+NODE_ROOT = Path("/sys/devices/system/node")
+PLACEMENTS = ("node", "cores", "none")
+THREAD_VARIABLES = (
+    "OMP_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+)
+IONICE_CLASSES = {"realtime": 1, "best-effort": 2, "idle": 3}
+_PSUTIL_IONICE_CLASSES = {"realtime": "IOPRIO_CLASS_RT", "best-effort": "IOPRIO_CLASS_BE", "idle": "IOPRIO_CLASS_IDLE"}
+DEFAULT_BATCH_SETTINGS = {"placement": "node", "nice": 10, "threads": "auto"}
+
+
+def parse_cpulist(text: str) -> List[int]:
+    """CPU numbers from a Linux cpulist such as ``"0-3,8,10-11"``."""
+    cpus: List[int] = []
+    for part in text.strip().split(","):
+        part = part.strip()
+        if not part:
+            continue
+        first, _, last = part.partition("-")
+        cpus.extend(range(int(first), int(last or first) + 1))
+    return cpus
+
+
+def available_cpus() -> List[int]:
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def numa_nodes(node_root: Path = NODE_ROOT) -> Dict[int, List[int]]:
+    """``{node: [cpu, ...]}`` restricted to the CPUs this process may use; one node if unknown."""
+    allowed = set(available_cpus())
+    nodes: Dict[int, List[int]] = {}
+    try:
+        entries = sorted(node_root.glob("node[0-9]*"), key=lambda path: int(path.name[4:]))
+        for entry in entries:
+            cpus = [cpu for cpu in parse_cpulist((entry / "cpulist").read_text()) if cpu in allowed]
+            if cpus:
+                nodes[int(entry.name[4:])] = cpus
+    except (OSError, ValueError):
+        nodes = {}
+    return nodes or {0: sorted(allowed)}
+
+
+class ExecutionPolicy(NamedTuple):
+    cpus: Optional[Tuple[int, ...]] = None
+    numa_node: Optional[int] = None
+    nice: Optional[int] = None
+    ionice: Optional[str] = None
+    ionice_level: Optional[int] = None
+    env: Tuple[Tuple[str, str], ...] = ()
+
+    def describe(self) -> str:
+        parts = []
+        if self.cpus:
+            parts.append(f"cpus {format_cpulist(self.cpus)}")
+        if self.numa_node is not None:
+            parts.append(f"node {self.numa_node}")
+        if self.nice:
+            parts.append(f"nice {self.nice}")
+        if self.ionice:
+            parts.append(f"ionice {self.ionice}" + (f"/{self.ionice_level}" if self.ionice_level is not None else ""))
+        parts.extend(f"{name}={value}" for name, value in self.env)
+        return ", ".join(parts) or "default"
+
+    def launch_options(self, command: List[str]) -> Tuple[List[str], Dict[str, Any], Optional[Callable[[int], None]]]:
+        """``(command, Popen keyword arguments, after_start(pid))`` that apply this policy."""
+        options: Dict[str, Any] = {}
+        if self.env:
+            environment = dict(os.environ)
+            environment.update(self.env)
+            options["env"] = environment
+
+        # Pinning and priority go through command prefixes, or system calls on the
+        # started process; a preexec_fn is not safe in a program with threads.
+        prefix: List[str] = []
+        after_start: List[Callable[[int], None]] = []
+        if self.cpus and os.name == "posix":
+            taskset = shutil.which("taskset")
+            if taskset:
+                prefix += [taskset, "-c", format_cpulist(self.cpus)]
+            elif hasattr(os, "sched_setaffinity"):
+                after_start.append(self._set_affinity)
+        if self.nice and os.name == "posix":
+            nice = shutil.which("nice")
+            if nice:
+                prefix += [nice, "-n", str(self.nice)]
+            elif hasattr(os, "setpriority"):
+                after_start.append(self._set_nice)
+        numactl = shutil.which("numactl") if self.numa_node is not None else None
+        if numactl:
+            # Only the memory policy: numactl must not widen the CPUs set above.
+            prefix += [numactl, f"--preferred={self.numa_node}"]
+
+        if self.ionice:
+            if psutil is not None:
+                after_start.append(self._set_ionice)
+            else:
+                ionice = shutil.which("ionice")
+                if ionice:
+                    prefix += [ionice, "-c", str(IONICE_CLASSES[self.ionice])]
+                    if self.ionice_level is not None and self.ionice != "idle":
+                        prefix += ["-n", str(self.ionice_level)]
+
+        return prefix + list(command), options, _run_all(after_start)
+
+    def _set_affinity(self, pid: int) -> None:
+        try:
+            os.sched_setaffinity(pid, self.cpus)
+        except OSError:
+            pass
+
+    def _set_nice(self, pid: int) -> None:
+        # Like ``nice -n``: relative to this process's own priority.
+        try:
+            os.setpriority(os.PRIO_PROCESS, pid, os.getpriority(os.PRIO_PROCESS, 0) + self.nice)
+        except OSError:
+            pass
+
+    def _set_ionice(self, pid: int) -> None:
+        try:
+            process = psutil.Process(pid)
+            io_class = getattr(psutil, _PSUTIL_IONICE_CLASSES[self.ionice])
+            if self.ionice_level is not None and self.ionice != "idle":
+                process.ionice(io_class, self.ionice_level)
+            else:
+                process.ionice(io_class)
+        except (psutil.Error, AttributeError, OSError, ValueError):
+            pass
+
+
+def _run_all(steps: List[Callable[[int], None]]) -> Optional[Callable[[int], None]]:
+    if not steps:
+        return None
+    if len(steps) == 1:
+        return steps[0]
+
+    def run(pid: int) -> None:
+        for step in steps:
+            step(pid)
+
+    return run
+
+
+def format_cpulist(cpus) -> str:
+    cpus = sorted(cpus)
+    ranges = []
+    start = previous = cpus[0] if cpus else None
+    for cpu in cpus[1:]:
+        if cpu != previous + 1:
+            ranges.append((start, previous))
+            start = cpu
+        previous = cpu
+    if start is not None:
+        ranges.append((start, previous))
+    return ",".join(f"{first}-{last}" if last != first else str(first) for first, last in ranges)
+
+
+def _int_setting(settings: Mapping[str, Any], key: str) -> Optional[int]:
+    try:
+        value = settings.get(key)
+        return None if value in (None, "") else int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class SlotPlanner:
+    """Hands out an ``ExecutionPolicy`` per parallel slot from one ``execution_policy`` entry."""
+
+    def __init__(self, settings: Optional[Mapping[str, Any]], slots: int = 1, nodes: Optional[Dict[int, List[int]]] = None):
+        settings = dict(settings or {})
+        self.slots = max(1, slots)
+        self.placement = settings.get("placement", "none")
+        if self.placement not in PLACEMENTS:
+            self.placement = "none"
+        nodes = nodes if nodes is not None else numa_nodes()
+        if settings.get("cpus"):
+            try:
+                allowed = set(parse_cpulist(str(settings["cpus"])))
+            except ValueError:
+                allowed = None
+            if allowed:
+                nodes = {node: [cpu for cpu in cpus if cpu in allowed] for node, cpus in nodes.items()}
+                nodes = {node: cpus for node, cpus in nodes.items() if cpus}
+        self.nodes = nodes
+        self.nice = _int_setting(settings, "nice")
+        ionice = settings.get("ionice")
+        self.ionice = ionice if ionice in IONICE_CLASSES else None
+        self.ionice_level = _int_setting(settings, "ionice_level")
+        self.threads = settings.get("threads")
+        self.env = {str(name): str(value) for name, value in (settings.get("env") or {}).items()}
+        self._slot_cpus = self._plan()
+
+    def _plan(self) -> List[Tuple[Optional[int], Optional[Tuple[int, ...]]]]:
+        """``(node, cpus)`` for every slot."""
+        node_ids = sorted(self.nodes)
+        if self.placement == "none" or not node_ids:
+            return [(None, None)] * self.slots
+        # Slots take turns over the nodes so a half-full batch still uses every socket.
+        slot_nodes = [node_ids[slot % len(node_ids)] for slot in range(self.slots)]
+        if self.placement == "node":
+            if len(node_ids) == 1:
+                return [(None, None)] * self.slots
+            return [(node, tuple(self.nodes[node])) for node in slot_nodes]
+
+        plan = []
+        for slot, node in enumerate(slot_nodes):
+            sharing = [other for other in range(self.slots) if slot_nodes[other] == node]
+            cpus = self.nodes[node]
+            share = max(1, len(cpus) // len(sharing))
+            start = (sharing.index(slot) * share) % len(cpus)
+            chunk = cpus[start:start + share]
+            plan.append((node if len(node_ids) > 1 else None, tuple(chunk)))
+        return plan
+
+    def policy_for(self, slot: int) -> ExecutionPolicy:
+        node, cpus = self._slot_cpus[slot % self.slots]
+        env = {}
+        threads = self.threads
+        if threads == "auto":
+            threads = len(cpus) if cpus and self.slots > 1 else None
+        if threads:
+            # Explicit values in the environment or the policy's env win.
+            env.update({name: str(threads) for name in THREAD_VARIABLES if name not in os.environ})
+        env.update(self.env)
+        return ExecutionPolicy(
+            cpus=cpus,
+            numa_node=node,
+            nice=self.nice,
+            ionice=self.ionice,
+            ionice_level=self.ionice_level,
+            env=tuple(sorted(env.items())),
+        )
+
+    def describe(self) -> str:
+        return "\n".join(f"slot {slot}: {self.policy_for(slot).describe()}" for slot in range(self.slots))
+
+
+def policy_settings(config: Optional[Mapping[str, Any]], kind: str) -> Dict[str, Any]:
+    """The ``kind`` (``"interactive"`` or ``"batch"``) entry of an ``execution_policy`` setting."""
+    entry = (config or {}).get(kind) if isinstance(config, Mapping) else None
+    if isinstance(entry, Mapping):
+        return dict(entry)
+    if kind == "batch":
+        return dict(DEFAULT_BATCH_SETTINGS)
+    return {}
+
+
+class SlotPool:
+    """Lowest-free-slot bookkeeping for runners that start jobs on several threads."""
+
+    def __init__(self, planner: SlotPlanner):
+        self.planner = planner
+        self._free = list(range(planner.slots))
+        self._lock = threading.Lock()
+
+    def acquire(self) -> Tuple[int, ExecutionPolicy]:
+        with self._lock:
+            slot = self._free.pop(0) if self._free else 0
+        return slot, self.planner.policy_for(slot)
+
+    def release(self, slot: int) -> None:
+        with self._lock:
+            if slot not in self._free:
+                self._free.append(slot)
+                self._free.sort()
+
+
+def main() -> None:
+    from config_manager import load_concurrency, load_execution_policy
+
+    config = load_execution_policy()
+    slots = load_concurrency()
+    print("NUMA nodes: " + "; ".join(f"{node}: {format_cpulist(cpus)}" for node, cpus in numa_nodes().items()))
+    print(f"interactive: {SlotPlanner(policy_settings(config, 'interactive')).policy_for(0).describe()}")
+    print(f"batch ({slots} slot(s)):")
+    print(SlotPlanner(policy_settings(config, "batch"), slots).describe())
+
+
+if __name__ == "__main__":
+    main()
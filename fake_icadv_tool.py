@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""Stand-in for MDXICAdvancedTool for load, throughput and failure testing.
+
+Accepts the real command line (``--solver <code> -i <input.json> [--param <text>]``),
+reads the input JSON and then behaves as configured. Settings come from
+``ICADV_FAKE_<NAME>`` environment variables, command-line flags, or
+``key=value`` pairs in the ``--param`` string prefixed with ``fake:``
+(``--param "fake:lines=5000,rate=1000,exit_code=3"``), in increasing order
+of precedence:
+
+    lines         output lines to print (default 100)
+    rate          lines per second, 0 for as fast as possible (default 0)
+    line_size     approximate characters per line (default 80)
+    stderr_every  also print every Nth line to stderr, 0 for never (default 0)
+    history_rows  rows of pressure_radius_history.csv to write; -1 writes
+                  1000 rows for PressureOven only (default -1)
+    work_seconds  CPU time to burn before printing (default 0)
+    memory_mb     memory to allocate and hold while running (default 0)
+    exit_code     status to exit with (default 0)
+    crash         "abort" or "exception" to die after ``crash_after`` lines
+    crash_after   line index at which to crash (default 0)
+    hang          seconds to hang after ``hang_after`` lines, -1 forever (default 0)
+    hang_after    line index at which to hang (default 0)
+    seed          seed for the generated numbers (default 0)
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+from synthetic_inputs import write_history_csv
+
+DEFAULTS = {
+    "lines": 100,
+    "rate": 0.0,
+    "line_size": 80,
+    "stderr_every": 0,
+    "history_rows": -1,
+    "work_seconds": 0.0,
+    "memory_mb": 0,
+    "exit_code": 0,
+    "crash": "",
+    "crash_after": 0,
+    "hang": 0.0,
+    "hang_after": 0,
+    "seed": 0,
+}
+ENV_PREFIX = "ICADV_FAKE_"
+PARAM_PREFIX = "fake:"
+HISTORY_FILE_NAME = "pressure_radius_history.csv"
+SOLVER_NAMES = {"mt": "MappingTool", "tc": "ThermalCycleCalc", "da": "DelamAlert", "po": "PressureOven"}
+
+
+def _coerce(name, raw):
+    default = DEFAULTS[name]
+    if isinstance(default, str):
+        return str(raw)
+    if isinstance(default, int):
+        return int(float(raw))
+    return float(raw)
+
+
+def parse_param(param):
+    settings = {}
+    if not param or not param.startswith(PARAM_PREFIX):
+        return settings
+    for item in param[len(PARAM_PREFIX):].replace(";", ",").split(","):
+        key, _, value = item.partition("=")
+        key = key.strip()
+        if key in DEFAULTS and value.strip():
+            settings[key] = _coerce(key, value.strip())
+    return settings
+
+
+def resolve_settings(args):
+    settings = dict(DEFAULTS)
+    for name in DEFAULTS:
+        value = os.environ.get(ENV_PREFIX + name.upper())
+        if value:
+            settings[name] = _coerce(name, value)
+    for name in DEFAULTS:
+        value = getattr(args, name, None)
+        if value is not None:
+            settings[name] = _coerce(name, value)
+    settings.update(parse_param(args.param))
+    return settings
+
+
+def load_input(path):
+    with open(path, "r", encoding="utf-8") as handle:
+        payload = json.load(handle)
+    if not isinstance(payload, dict):
+        raise ValueError("input JSON must be an object")
+    return payload
+
+
+def history_folder(payload, input_path):
+    solver_payload = payload.get("PressureOven")
+    if isinstance(solver_payload, dict) and solver_payload.get("OutputFolder"):
+        return Path(solver_payload["OutputFolder"]).expanduser()
+    return Path(input_path).resolve().parent
+
+
+def burn_cpu(seconds):
+    deadline = time.process_time() + seconds
+    value = 0
+    while time.process_time() < deadline:
+        for index in range(10000):
+            value ^= index * index
+    return value
+
+
+def misbehave(settings, index):
+    if settings["crash"] and index == settings["crash_after"]:
+        sys.stdout.flush()
+        if settings["crash"] == "abort":
+            os.abort()
+        raise RuntimeError(f"simulated crash at line {index}")
+    if settings["hang"] and index == settings["hang_after"]:
+        sys.stdout.flush()
+        if settings["hang"] < 0:
+            while True:
+                time.sleep(3600)
+        time.sleep(settings["hang"])
+
+
+def emit_lines(settings, solver_name):
+    rng = random.Random(settings["seed"])
+    interval = 1.0 / settings["rate"] if settings["rate"] > 0 else 0.0
+    started = time.perf_counter()
+    filler_width = max(0, settings["line_size"] - 60)
+    for index in range(settings["lines"]):
+        misbehave(settings, index)
+        residual = rng.uniform(1e-9, 1.0) / (index + 1)
+        line = f"[{solver_name}] iteration {index:>8}: residual={residual:.6e} dt=1.0e-03"
+        if filler_width:
+            line += " " + "." * filler_width
+        print(line)
+        if settings["stderr_every"] and index % settings["stderr_every"] == 0:
+            print(f"warning: slow convergence at iteration {index}", file=sys.stderr)
+        if interval:
+            delay = started + (index + 1) * interval - time.perf_counter()
+            if delay > 0:
+                sys.stdout.flush()
+                time.sleep(delay)
+    misbehave(settings, settings["lines"])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--solver", required=True, help="Solver code (mt, tc, da, po).")
+    parser.add_argument("-i", dest="input", required=True, help="Solver input JSON.")
+    parser.add_argument("--param", default="", help="Extra parameters; 'fake:key=value,...' configures this stand-in.")
+    for name, default in DEFAULTS.items():
+        parser.add_argument(f"--{name.replace('_', '-')}", dest=name, default=None, type=type(default))
+    args = parser.parse_args(argv)
+    settings = resolve_settings(args)
+
+    solver_name = SOLVER_NAMES.get(args.solver)
+    if solver_name is None:
+        print(f"error: unknown solver '{args.solver}'", file=sys.stderr)
+        return 2
+    try:
+        payload = load_input(args.input)
+    except (OSError, ValueError) as exc:
+        print(f"error: cannot read input {args.input}: {exc}", file=sys.stderr)
+        return 2
+
+    ballast = bytearray(settings["memory_mb"] * 1024 * 1024) if settings["memory_mb"] > 0 else None
+    if ballast is not None:
+        # Touch every page so the allocation shows up in RSS.
+        for offset in range(0, len(ballast), 4096):
+            ballast[offset] = 1
+    if settings["work_seconds"] > 0:
+        burn_cpu(settings["work_seconds"])
+
+    print(f"{solver_name}: read {args.input} ({len(json.dumps(payload))} bytes)")
+    emit_lines(settings, solver_name)
+
+    history_rows = settings["history_rows"]
+    if history_rows < 0:
+        history_rows = 1000 if solver_name == "PressureOven" else 0
+    if history_rows:
+        history_path = history_folder(payload, args.input) / HISTORY_FILE_NAME
+        history_path.parent.mkdir(parents=True, exist_ok=True)
+        write_history_csv(history_path, history_rows, settings["seed"])
+        print(f"wrote {history_rows} rows to {history_path}")
+
+    sys.stdout.flush()
+    return settings["exit_code"]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
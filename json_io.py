@@ -0,0 +1,145 @@
+"""JSON encoding with an optional fast backend and a streaming writer.
+
+``orjson`` or ``ujson`` is used when installed, otherwise the stdlib
+``json`` module. Set ``ICADV_JSON_BACKEND`` to ``orjson``, ``ujson`` or
+``json`` to force one. Every backend is driven so that it produces valid
+JSON with the same structure; only whitespace and float spelling may
+differ between backends.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import IO, Any, Iterable, Iterator
+
+try:
+    import orjson  # type: ignore[import]
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import ujson  # type: ignore[import]
+except ImportError:  # pragma: no cover - optional dependency
+    ujson = None
+
+PRETTY_INDENT = 4
+# Large arrays written one element at a time by ``iterencode``.
+STREAM_KEYS = frozenset({"Materials", "PressureRampProfile"})
+
+JSONDecodeError = json.JSONDecodeError
+
+
+def _select_backend() -> str:
+    available = {"orjson": orjson is not None, "ujson": ujson is not None, "json": True}
+    requested = os.environ.get("ICADV_JSON_BACKEND", "").strip().lower()
+    if requested in available and available[requested]:
+        return requested
+    for name in ("orjson", "ujson"):
+        if available[name]:
+            return name
+    return "json"
+
+
+BACKEND = _select_backend()
+
+
+def dumps(obj: Any, *, indent: int = PRETTY_INDENT, compact: bool = False, sort_keys: bool = False) -> str:
+    """Encode ``obj``; ``compact`` drops all optional whitespace (for machine-only files)."""
+    if compact:
+        indent = 0
+    if BACKEND == "orjson" and indent in (0, 2):
+        # orjson only indents by two spaces; other widths use the next backend.
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, option=option).decode("utf-8")
+    if BACKEND in ("orjson", "ujson") and ujson is not None:
+        return ujson.dumps(
+            obj,
+            indent=indent,
+            sort_keys=sort_keys,
+            ensure_ascii=False,
+            escape_forward_slashes=False,
+        )
+    if indent:
+        return json.dumps(obj, indent=indent, sort_keys=sort_keys)
+    return json.dumps(obj, separators=(",", ":"), sort_keys=sort_keys, ensure_ascii=False)
+
+
+def loads(data) -> Any:
+    try:
+        if BACKEND == "orjson":
+            return orjson.loads(data)
+        if BACKEND == "ujson":
+            return ujson.loads(data)
+    except JSONDecodeError:
+        raise
+    except ValueError as exc:
+        raise JSONDecodeError(str(exc), data if isinstance(data, str) else "", 0) from exc
+    if isinstance(data, (bytes, bytearray)):
+        data = data.decode("utf-8")
+    return json.loads(data)
+
+
+def load(handle: IO) -> Any:
+    return loads(handle.read())
+
+
+def load_path(path) -> Any:
+    with open(path, "rb") as handle:
+        return loads(handle.read())
+
+
+def iterencode(obj: Any,
+               indent: int = PRETTY_INDENT,
+               stream_keys: Iterable[str] = STREAM_KEYS,
+               _level: int = 0,
+               _streaming: bool = False) -> Iterator[str]:
+    """Yield pretty-printed JSON for ``obj`` in chunks.
+
+    Objects are walked key by key. Arrays under one of ``stream_keys``
+    (at any depth) are emitted one compact element per line, so the full
+    document never has to exist as a single string. Any other value is
+    encoded in one backend call.
+    """
+    stream_keys = stream_keys if isinstance(stream_keys, frozenset) else frozenset(stream_keys)
+    inner = "\n" + " " * (indent * (_level + 1))
+    outer = "\n" + " " * (indent * _level)
+
+    if isinstance(obj, dict) and obj:
+        yield "{"
+        first = True
+        for key, value in obj.items():
+            yield ("" if first else ",") + inner + dumps(str(key), compact=True) + ": "
+            first = False
+            yield from iterencode(
+                value,
+                indent,
+                stream_keys,
+                _level + 1,
+                _streaming or key in stream_keys,
+            )
+        yield outer + "}"
+        return
+
+    if _streaming and isinstance(obj, list) and obj:
+        yield "["
+        first = True
+        for item in obj:
+            yield ("" if first else ",") + inner + dumps(item, compact=True)
+            first = False
+        yield outer + "]"
+        return
+
+    encoded = dumps(obj, indent=indent)
+    if "\n" in encoded:
+        encoded = encoded.replace("\n", outer)
+    yield encoded
+
+
+def write_stream(handle: IO, obj: Any, indent: int = PRETTY_INDENT, stream_keys: Iterable[str] = STREAM_KEYS) -> None:
+    for chunk in iterencode(obj, indent, stream_keys):
+        handle.write(chunk)
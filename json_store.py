@@ -0,0 +1,146 @@
+"""Atomic JSON file writes with change detection and a parsed-content cache."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import stat
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import json_io
+
+_NEW_FILE_MODE = 0o644
+
+
+def file_signature(path) -> Optional[Tuple[int, int]]:
+    try:
+        stat_result = os.stat(path)
+    except OSError:
+        return None
+    return stat_result.st_size, stat_result.st_mtime_ns
+
+
+def canonical_digest(payload: Any) -> str:
+    canonical = json_io.dumps(payload, compact=True, sort_keys=True)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _fsync_directory(directory: Path) -> None:
+    if os.name == "nt":
+        return
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write_chunks(path, chunks: Iterable, encoding: Optional[str] = "utf-8") -> None:
+    """Write ``chunks`` to a temp file in the same folder, fsync it, then rename over ``path``.
+
+    Readers see either the old or the new file, never a partial one. Pass
+    ``encoding=None`` to write bytes chunks.
+    """
+    target = Path(path)
+    try:
+        mode = stat.S_IMODE(os.stat(target).st_mode)
+    except OSError:
+        mode = _NEW_FILE_MODE
+    fd, temp_name = tempfile.mkstemp(prefix=f".{target.name}.", suffix=".tmp", dir=target.parent)
+    try:
+        file_mode = "wb" if encoding is None else "w"
+        with os.fdopen(fd, file_mode, encoding=encoding) as handle:
+            for chunk in chunks:
+                handle.write(chunk)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.chmod(temp_name, mode)
+        os.replace(temp_name, target)
+    except BaseException:
+        try:
+            os.unlink(temp_name)
+        except OSError:
+            pass
+        raise
+    _fsync_directory(target.parent)
+
+
+def atomic_write_text(path, text: str, encoding: str = "utf-8") -> None:
+    atomic_write_chunks(path, (text,), encoding=encoding)
+
+
+def atomic_write_bytes(path, data: bytes) -> None:
+    atomic_write_chunks(path, (data,), encoding=None)
+
+
+class _CachedDocument:
+    __slots__ = ("signature", "payload", "digest")
+
+    def __init__(self, signature, payload, digest=None):
+        self.signature = signature
+        self.payload = payload
+        self.digest = digest
+
+
+class JsonFileStore:
+    """Reads and merges top-level JSON objects, re-parsing only files that changed on disk."""
+
+    def __init__(self):
+        self._documents: Dict[str, _CachedDocument] = {}
+
+    @staticmethod
+    def _key(path) -> str:
+        return os.path.abspath(os.fspath(path))
+
+    def load(self, path) -> Dict[str, Any]:
+        """Return the parsed top-level object of ``path`` (``{}`` if missing or invalid).
+
+        The returned dict is shared with the cache and must not be mutated.
+        """
+        key = self._key(path)
+        signature = file_signature(key)
+        if signature is None:
+            self._documents.pop(key, None)
+            return {}
+        cached = self._documents.get(key)
+        if cached is not None and cached.signature == signature:
+            return cached.payload
+        try:
+            payload = json_io.load_path(key) or {}
+        except (OSError, json_io.JSONDecodeError, UnicodeDecodeError):
+            payload = {}
+        if not isinstance(payload, dict):
+            payload = {}
+        self._documents[key] = _CachedDocument(signature, payload)
+        return payload
+
+    def save_merged(self, path, updates: Dict[str, Any], indent: int = json_io.PRETTY_INDENT) -> Tuple[Dict[str, Any], bool]:
+        """Merge ``updates`` over the file's top-level keys and write atomically.
+
+        Returns ``(merged_payload, written)``; the write is skipped when the
+        merged content is identical to what is already on disk.
+        """
+        key = self._key(path)
+        existing = self.load(key)
+        merged: Dict[str, Any] = {}
+        merged.update(existing)
+        merged.update(updates)
+
+        digest = canonical_digest(merged)
+        cached = self._documents.get(key)
+        if cached is not None:
+            if cached.digest is None:
+                cached.digest = canonical_digest(cached.payload)
+            if cached.digest == digest:
+                return cached.payload, False
+
+        atomic_write_chunks(key, json_io.iterencode(merged, indent=indent))
+        self._documents[key] = _CachedDocument(file_signature(key), merged, digest)
+        return merged, True
@@ -0,0 +1,403 @@
+"""Full-text search over the tool output recorded in run logs.
+
+``LogIndex`` keeps a SQLite FTS5 index (``log_index.sqlite3`` in the log
+folder) of every ``STDOUT``, ``STDERR`` and ``ERROR`` line of finished
+runs, together with each run's solver, start time and exit code. Updating
+is incremental: only logs that finished since the last update are read,
+logs that ``log_store`` compressed are just re-pointed, and logs removed
+by retention drop out of the index.
+
+Each indexed line's rowid is ``run id << 32 | line number``, so a run's
+lines form one rowid range that can be deleted or searched without a
+scan. Results come newest run first by start time: runs that started one
+after another are searched as one range, by descending rowid.
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date, timedelta
+from itertools import islice
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from run_logs import (
+    COMPRESSED_SUFFIX,
+    OUTPUT_MARKER,
+    default_log_dir,
+    iter_log_paths,
+    open_log,
+    read_log_header,
+    read_log_summary,
+)
+
+INDEX_NAME = "log_index.sqlite3"
+SCHEMA_VERSION = 1
+INDEXED_LABELS = ("STDOUT", "STDERR", "ERROR")
+LINE_BITS = 32
+INSERT_BATCH = 5000
+DEFAULT_LIMIT = 200
+# A log without a summary that has not changed for this long belongs to a run that died.
+STALE_SECONDS = 86400
+EXIT_FILTERS = ("any", "succeeded", "failed")
+# Marks placed around matched words in ``SearchHit.highlighted``.
+HIGHLIGHT = ("\x02", "\x03")
+_LINE_PATTERN = re.compile(r"^\[[^\]]*\] ([A-Z_]+): (.*)$")
+
+
+class LogIndexError(Exception):
+    """The index cannot be opened or the query is not valid."""
+
+
+class RunRecord(NamedTuple):
+    run_id: int
+    name: str
+    path: Path
+    started: str
+    solver: str
+    exit_code: Any
+
+
+class SearchHit(NamedTuple):
+    run: RunRecord
+    line_no: int
+    label: str
+    text: str
+    highlighted: str
+
+
+class UpdateReport(NamedTuple):
+    indexed: int
+    lines: int
+    moved: int
+    removed: int
+    seconds: float
+
+
+def log_key(log_path) -> str:
+    """A log's name without ``.gz``, so compression does not make it a new run."""
+    name = Path(log_path).name
+    return name[: -len(COMPRESSED_SUFFIX)] if name.endswith(COMPRESSED_SUFFIX) else name
+
+
+def iter_output_lines(log_path) -> Iterator[Tuple[int, str, str]]:
+    """``(line number, label, text)`` for every indexed tool output line of a log."""
+    with open_log(log_path) as handle:
+        in_output = False
+        for line_no, line in enumerate(handle, start=1):
+            if not in_output:
+                in_output = line.strip() == OUTPUT_MARKER
+                continue
+            match = _LINE_PATTERN.match(line.rstrip("\n"))
+            if match and match.group(1) in INDEXED_LABELS:
+                yield line_no, match.group(1), match.group(2)
+
+
+def match_query(text: str) -> str:
+    """An FTS5 query matching lines that contain every word of ``text``.
+
+    Words are matched as phrases, so punctuation such as ``ERR_CONV`` or
+    ``node.12`` needs no escaping. A word ending in ``*`` matches as a
+    prefix; those are much slower than whole words on a large index.
+    """
+    terms = []
+    for word in text.split():
+        prefix = word.endswith("*")
+        word = word.rstrip("*")
+        if word:
+            terms.append('"' + word.replace('"', '""') + '"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+def context_lines(log_path, line_no: int, radius: int = 5) -> List[Tuple[int, str]]:
+    """The lines around ``line_no`` of a plain or compressed log."""
+    first = max(1, line_no - radius)
+    with open_log(log_path) as handle:
+        selected = islice(handle, first - 1, line_no + radius)
+        return [(first + offset, line.rstrip("\n")) for offset, line in enumerate(selected)]
+
+
+class LogIndex:
+    """The search index of one log folder; every call opens its own connection."""
+
+    def __init__(self, root=None, index_path=None):
+        self.root = Path(root) if root is not None else default_log_dir()
+        self.index_path = Path(index_path) if index_path is not None else self.root / INDEX_NAME
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._closed = False
+        self._queued: Optional[Future] = None
+        self._queue_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.index_path, timeout=30)
+            # WAL lets searches read while an update is writing.
+            connection.execute("PRAGMA journal_mode=WAL")
+            if connection.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                self._create_schema(connection)
+        except sqlite3.Error as exc:
+            raise LogIndexError(f"cannot open the log index {self.index_path}: {exc}") from exc
+        return connection
+
+    @staticmethod
+    def _create_schema(connection: sqlite3.Connection) -> None:
+        with connection:
+            connection.execute("DROP TABLE IF EXISTS lines")
+            connection.execute("DROP TABLE IF EXISTS runs")
+            connection.execute(
+                "CREATE TABLE runs (id INTEGER PRIMARY KEY, name TEXT UNIQUE NOT NULL, path TEXT NOT NULL,"
+                " started TEXT, solver TEXT, exit_code)"
+            )
+            connection.execute("CREATE INDEX runs_started ON runs (started)")
+            connection.execute("CREATE VIRTUAL TABLE lines USING fts5(label UNINDEXED, text)")
+            connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def update(self, now: Optional[float] = None) -> UpdateReport:
+        """Index newly finished logs and forget removed ones."""
+        started = time.perf_counter()
+        now = time.time() if now is None else now
+        indexed = lines = moved = removed = 0
+        with self._lock:
+            connection = self._connect()
+            try:
+                known = {name: (run_id, path) for run_id, name, path in connection.execute("SELECT id, name, path FROM runs")}
+                seen = set()
+                for log_path in iter_log_paths(self.root):
+                    key = log_key(log_path)
+                    seen.add(key)
+                    if key in known:
+                        run_id, path = known[key]
+                        if path != str(log_path):
+                            with connection:
+                                connection.execute("UPDATE runs SET path = ? WHERE id = ?", (str(log_path), run_id))
+                            moved += 1
+                        continue
+                    summary = read_log_summary(log_path)
+                    if summary is None and not self._is_stale(log_path, now):
+                        continue  # still running; indexed once it finishes
+                    try:
+                        lines += self._index_log(connection, key, log_path, summary or {})
+                    except (OSError, EOFError):
+                        continue
+                    indexed += 1
+                for key, (run_id, _) in known.items():
+                    if key not in seen:
+                        self._drop_run(connection, run_id)
+                        removed += 1
+            except sqlite3.Error as exc:
+                raise LogIndexError(f"log index update failed: {exc}") from exc
+            finally:
+                connection.close()
+        return UpdateReport(indexed, lines, moved, removed, time.perf_counter() - started)
+
+    @staticmethod
+    def _is_stale(log_path: Path, now: float) -> bool:
+        try:
+            return now - log_path.stat().st_mtime > STALE_SECONDS
+        except OSError:
+            return False
+
+    @staticmethod
+    def _index_log(connection: sqlite3.Connection, key: str, log_path: Path, summary) -> int:
+        header = read_log_header(log_path) or {}
+        count = 0
+        # One transaction per log: a half-read log never shows up in results.
+        with connection:
+            cursor = connection.execute(
+                "INSERT INTO runs (name, path, started, solver, exit_code) VALUES (?, ?, ?, ?, ?)",
+                (
+                    key,
+                    str(log_path),
+                    str(header.get("timestamp", "")),
+                    str(header.get("run_solver") or header.get("ui_solver") or ""),
+                    summary.get("exit_code"),
+                ),
+            )
+            base = cursor.lastrowid << LINE_BITS
+            batch = []
+            for line_no, label, text in iter_output_lines(log_path):
+                batch.append((base | line_no, label, text))
+                if len(batch) >= INSERT_BATCH:
+                    connection.executemany("INSERT INTO lines (rowid, label, text) VALUES (?, ?, ?)", batch)
+                    count += len(batch)
+                    batch = []
+            if batch:
+                connection.executemany("INSERT INTO lines (rowid, label, text) VALUES (?, ?, ?)", batch)
+                count += len(batch)
+        return count
+
+    @staticmethod
+    def _drop_run(connection: sqlite3.Connection, run_id: int) -> None:
+        with connection:
+            connection.execute(
+                "DELETE FROM lines WHERE rowid BETWEEN ? AND ?",
+                (run_id << LINE_BITS, ((run_id + 1) << LINE_BITS) - 1),
+            )
+            connection.execute("DELETE FROM runs WHERE id = ?", (run_id,))
+
+    def search(self,
+               text: str,
+               solver: str = "",
+               since: Optional[date] = None,
+               until: Optional[date] = None,
+               exit_filter: Any = "any",
+               limit: int = DEFAULT_LIMIT) -> List[SearchHit]:
+        """Matching lines, newest run first.
+
+        ``exit_filter`` is ``"any"``, ``"succeeded"``, ``"failed"`` or an
+        exit code; ``since`` and ``until`` are inclusive days.
+        """
+        query = match_query(text)
+        if not query:
+            return []
+        run_conditions: List[str] = []
+        run_arguments: List[Any] = []
+        if solver:
+            run_conditions.append("runs.solver = ?")
+            run_arguments.append(solver)
+        if since is not None:
+            run_conditions.append("runs.started >= ?")
+            run_arguments.append(since.isoformat())
+        if until is not None:
+            run_conditions.append("runs.started < ?")
+            run_arguments.append((until + timedelta(days=1)).isoformat())
+        if exit_filter == "succeeded":
+            run_conditions.append("runs.exit_code = 0")
+        elif exit_filter == "failed":
+            run_conditions.append("runs.exit_code IS NOT 0")
+        elif exit_filter not in (None, "any"):
+            run_conditions.append("runs.exit_code = ?")
+            run_arguments.append(int(exit_filter))
+
+        limit = max(1, limit)
+        connection = self._connect()
+        try:
+            where = f" WHERE {' AND '.join(run_conditions)}" if run_conditions else ""
+            spans: List[List[int]] = []  # [first id, last id] of runs that started one after another
+            for (run_id,) in connection.execute(
+                f"SELECT id FROM runs{where} ORDER BY started DESC, id DESC", run_arguments
+            ):
+                if spans and spans[-1][0] == run_id + 1:
+                    spans[-1][0] = run_id
+                else:
+                    spans.append([run_id, run_id])
+            # Runs are usually indexed in the order they started, so this is one
+            # full-text query for most searches, and a few more for runs indexed late.
+            rows: List[Tuple[int, str, str, str]] = []
+            for first, last in spans:
+                rows += connection.execute(
+                    "SELECT rowid, label, text, highlight(lines, 1, ?, ?) FROM lines"
+                    " WHERE lines MATCH ? AND rowid BETWEEN ? AND ? ORDER BY rowid DESC LIMIT ?",
+                    (HIGHLIGHT[0], HIGHLIGHT[1], query, first << LINE_BITS, ((last + 1) << LINE_BITS) - 1,
+                     limit - len(rows)),
+                ).fetchall()
+                if len(rows) >= limit:
+                    break
+            run_ids = sorted({rowid >> LINE_BITS for rowid, *_ in rows})
+            runs = {
+                run_id: RunRecord(run_id, name, Path(path), started, run_solver, exit_code)
+                for run_id, name, path, started, run_solver, exit_code in connection.execute(
+                    "SELECT id, name, path, started, solver, exit_code FROM runs"
+                    f" WHERE id IN ({', '.join('?' * len(run_ids))})",
+                    run_ids,
+                )
+            }
+        except sqlite3.Error as exc:
+            raise LogIndexError(f"search failed: {exc}") from exc
+        finally:
+            connection.close()
+        line_mask = (1 << LINE_BITS) - 1
+        return [
+            SearchHit(runs[rowid >> LINE_BITS], rowid & line_mask, label, line_text, highlighted)
+            for rowid, label, line_text, highlighted in rows
+        ]
+
+    def solvers(self) -> List[str]:
+        connection = self._connect()
+        try:
+            return [row[0] for row in connection.execute("SELECT DISTINCT solver FROM runs WHERE solver != '' ORDER BY solver")]
+        finally:
+            connection.close()
+
+    def update_later(self) -> Optional["Future[UpdateReport]"]:
+        """Queue an update on the index's worker thread; ``None`` after ``shutdown``.
+
+        Requests made while an update is still waiting to start share it,
+        so a batch finishing many jobs at once scans the folder only once.
+        """
+        with self._queue_lock:
+            if self._closed:
+                return None
+            queued = self._queued
+            if queued is not None and not queued.running() and not queued.done():
+                return queued
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="log-index")
+            self._queued = self._executor.submit(self.update)
+            return self._queued
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._closed = True
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+
+
+def group_by_run(hits: Iterable[SearchHit]) -> List[Tuple[RunRecord, List[SearchHit]]]:
+    """Hits grouped per run, keeping the newest-first order."""
+    groups: List[Tuple[RunRecord, List[SearchHit]]] = []
+    for hit in hits:
+        if not groups or groups[-1][0].run_id != hit.run.run_id:
+            groups.append((hit.run, []))
+        groups[-1][1].append(hit)
+    return groups
+
+
+def _parse_exit_filter(value: str):
+    if value in EXIT_FILTERS:
+        return value
+    try:
+        return int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected {', '.join(EXIT_FILTERS)} or an exit code") from None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Search the tool output of past runs.")
+    parser.add_argument("query", help="Words that must all appear in a line; end a word with * to match a prefix.")
+    parser.add_argument("--logs", help="Log folder (default: the configured one).")
+    parser.add_argument("--solver", default="", help="Only runs of this solver.")
+    parser.add_argument("--since", type=date.fromisoformat, help="Only runs started on or after this day (YYYY-MM-DD).")
+    parser.add_argument("--until", type=date.fromisoformat, help="Only runs started on or before this day (YYYY-MM-DD).")
+    parser.add_argument("--exit", type=_parse_exit_filter, default="any", dest="exit_filter",
+                        help="any, succeeded, failed or an exit code.")
+    parser.add_argument("--limit", type=int, default=DEFAULT_LIMIT, help="Most lines to show.")
+    parser.add_argument("--no-update", action="store_true", help="Search the index as it is.")
+    args = parser.parse_args()
+
+    index = LogIndex(args.logs)
+    try:
+        if not args.no_update:
+            report = index.update()
+            if report.indexed:
+                print(f"Indexed {report.indexed} new run(s), {report.lines} line(s) in {report.seconds:.2f} s.")
+        started = time.perf_counter()
+        hits = index.search(args.query, args.solver, args.since, args.until, args.exit_filter, args.limit)
+    except LogIndexError as exc:
+        parser.exit(1, f"{exc}\n")
+    elapsed = time.perf_counter() - started
+    for run, run_hits in group_by_run(hits):
+        print(f"{run.name}  {run.solver}  {run.started[:19].replace('T', ' ')}  exit {run.exit_code}")
+        for hit in run_hits:
+            print(f"  {hit.line_no:>7} {hit.label}: {hit.text}")
+    print(f"{len(hits)} line(s) in {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,400 @@
+"""Managed run-log folder: background compression and retention limits.
+
+Finished run logs are gzipped in place (``run_log_*.log.gz``) once nothing
+has written to them for a while; ``run_logs`` reads either form, so the
+history and the runtime model do not care. Retention then removes the
+oldest logs until every limit holds, and unreferenced snapshots go with
+them. Limits come from the ``log_retention`` setting; ``0`` or ``null``
+switches a limit off::
+
+    "log_dir": "/data/icadv/logs",
+    "log_retention": {"max_age_days": 90, "max_count": 2000, "max_total_mb": 1024}
+
+Logs that earlier versions wrote next to the application are moved into
+the log folder once, the first time it is maintained, and the snapshots
+its logs reference are copied from the shared store those versions used.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import sys
+import threading
+import time
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Iterator, List, Mapping, NamedTuple, Optional
+
+from json_store import atomic_write_chunks, file_signature
+from run_logs import (
+    APP_DIR,
+    COMPRESSED_SUFFIX,
+    LOG_GLOB,
+    compressed_path,
+    default_log_dir,
+    iter_log_paths,
+    open_log,
+    read_log_header,
+    read_log_summary,
+    referenced_snapshots,
+    unused_log_path,
+)
+from scratch import in_flight_snapshots, scratch_root
+from snapshot_store import LEGACY_SNAPSHOT_DIR, SnapshotStore, store_for_logs
+
+LEGACY_LOG_DIR = APP_DIR
+# Written to the log folder once legacy logs have been moved in, so that is done only once.
+ADOPTED_MARKER = ".legacy_logs_adopted"
+SNAPSHOTS_ADOPTED_MARKER = ".legacy_snapshots_adopted"
+COMPRESS_LEVEL = 6
+COPY_CHUNK_BYTES = 1 << 20
+DEFAULT_MAX_AGE_DAYS = 90
+DEFAULT_MAX_COUNT = 2000
+DEFAULT_MAX_TOTAL_MB = 1024
+# A finished log is left alone this long so late lines (result staging) still land in it.
+COMPRESS_IDLE_SECONDS = 600
+# A log without a summary that has not changed for this long belongs to a run that died.
+STALE_SECONDS = 86400
+
+
+class RetentionSettings(NamedTuple):
+    max_age_days: Optional[float] = DEFAULT_MAX_AGE_DAYS
+    max_count: Optional[int] = DEFAULT_MAX_COUNT
+    max_total_bytes: Optional[int] = DEFAULT_MAX_TOTAL_MB << 20
+    compress_idle_seconds: float = COMPRESS_IDLE_SECONDS
+
+    @classmethod
+    def from_mapping(cls, values: Optional[Mapping[str, Any]]) -> "RetentionSettings":
+        """Settings from a config mapping; missing or invalid values keep their defaults."""
+        values = values or {}
+        defaults = cls()
+
+        def limit(key, default, kind=float):
+            if key not in values:
+                return default
+            try:
+                value = kind(values[key] or 0)
+            except (TypeError, ValueError):
+                return default
+            return value if value > 0 else None
+
+        total_mb = limit("max_total_mb", DEFAULT_MAX_TOTAL_MB)
+        idle = limit("compress_idle_seconds", defaults.compress_idle_seconds)
+        return cls(
+            limit("max_age_days", defaults.max_age_days),
+            limit("max_count", defaults.max_count, int),
+            int(total_mb * (1 << 20)) if total_mb else None,
+            idle if idle is not None else 0.0,
+        )
+
+
+class LogEntry(NamedTuple):
+    path: Path
+    size: int
+    mtime: float
+
+    @property
+    def compressed(self) -> bool:
+        return self.path.name.endswith(COMPRESSED_SUFFIX)
+
+
+class LogInfo(NamedTuple):
+    path: Path
+    started: str
+    solver: str
+    exit_code: Any  # int, a message such as "failed to launch", or None while running
+    wall_seconds: Optional[float]
+    size: int
+    compressed: bool
+
+
+class MaintenanceReport(NamedTuple):
+    adopted: int
+    compressed: int
+    removed: int
+    freed_bytes: int
+    kept: int
+    kept_bytes: int
+    snapshots_removed: int
+
+    def describe(self) -> str:
+        parts = [f"{self.kept} log(s), {format_size(self.kept_bytes)}"]
+        if self.adopted:
+            parts.append(f"{self.adopted} moved in")
+        if self.compressed:
+            parts.append(f"{self.compressed} compressed")
+        if self.removed:
+            parts.append(f"{self.removed} removed ({format_size(self.freed_bytes)})")
+        if self.snapshots_removed:
+            parts.append(f"{self.snapshots_removed} snapshot(s) removed")
+        return ", ".join(parts)
+
+
+def format_size(size: float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def _gzip_chunks(path: Path) -> Iterator[bytes]:
+    # wbits=31 writes a gzip container, so gzip.open reads the result.
+    compressor = zlib.compressobj(COMPRESS_LEVEL, zlib.DEFLATED, 31)
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(COPY_CHUNK_BYTES), b""):
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+    yield compressor.flush()
+
+
+def compress_log(log_path) -> Optional[Path]:
+    """Gzip ``log_path`` next to itself and remove the original; returns the new path.
+
+    Returns ``None`` and keeps the plain log if it cannot be compressed or
+    was written to meanwhile.
+    """
+    log_path = Path(log_path)
+    target = compressed_path(log_path)
+    before = file_signature(log_path)
+    if before is None:
+        return None
+    try:
+        atomic_write_chunks(target, _gzip_chunks(log_path), encoding=None)
+        shutil.copystat(log_path, target)
+        if file_signature(log_path) != before:
+            target.unlink()
+            return None
+        log_path.unlink()
+    except OSError:
+        return None
+    return target
+
+
+def describe_log(log_path) -> LogInfo:
+    """What the history shows for one run log."""
+    log_path = Path(log_path)
+    header = read_log_header(log_path) or {}
+    summary = read_log_summary(log_path) or {}
+    try:
+        size = log_path.stat().st_size
+    except OSError:
+        size = 0
+    return LogInfo(
+        log_path,
+        str(header.get("timestamp", "")),
+        str(header.get("run_solver") or header.get("ui_solver") or ""),
+        summary.get("exit_code"),
+        summary.get("wall_seconds"),
+        size,
+        log_path.name.endswith(COMPRESSED_SUFFIX),
+    )
+
+
+def read_log_text(log_path, max_chars: Optional[int] = None) -> str:
+    """The text of a plain or compressed log, cut to its last ``max_chars`` characters."""
+    with open_log(log_path) as handle:
+        if max_chars is None:
+            return handle.read()
+        tail = ""
+        for chunk in iter(lambda: handle.read(COPY_CHUNK_BYTES), ""):
+            tail = (tail + chunk)[-max_chars:]
+        return tail
+
+
+class LogStore:
+    """Compression and retention for one log folder; safe to use from several threads."""
+
+    def __init__(self, root=None, settings: Optional[RetentionSettings] = None, scratch_dir=None):
+        self.root = Path(root) if root is not None else default_log_dir()
+        self.settings = settings or RetentionSettings()
+        # Runs in progress keep their log in scratch; their snapshots must survive GC.
+        self.scratch_dir = Path(scratch_dir) if scratch_dir is not None else scratch_root()
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def snapshot_store(self) -> SnapshotStore:
+        """The snapshots the logs in this folder reference."""
+        return store_for_logs(self.root)
+
+    def entries(self) -> List[LogEntry]:
+        """Every log in the folder, oldest first."""
+        entries = []
+        for path in iter_log_paths(self.root):
+            try:
+                stat_result = path.stat()
+            except OSError:
+                continue
+            entries.append(LogEntry(path, stat_result.st_size, stat_result.st_mtime))
+        entries.sort(key=lambda entry: (entry.mtime, entry.path.name))
+        return entries
+
+    def is_finished(self, entry: LogEntry, now: Optional[float] = None) -> bool:
+        now = time.time() if now is None else now
+        if entry.compressed or now - entry.mtime > STALE_SECONDS:
+            return True
+        return read_log_summary(entry.path) is not None
+
+    def adopt_legacy_logs(self, legacy_dir=LEGACY_LOG_DIR) -> int:
+        """Move finished run logs from ``legacy_dir`` into the log folder, once per log folder."""
+        legacy_dir = Path(legacy_dir)
+        marker = self.root / ADOPTED_MARKER
+        try:
+            if marker.exists() or legacy_dir.resolve() == self.root.resolve():
+                return 0
+        except OSError:
+            return 0
+        moved = 0
+        for path in sorted(legacy_dir.glob(LOG_GLOB)):
+            if read_log_header(path) is None or read_log_summary(path) is None:
+                continue
+            try:
+                self.root.mkdir(parents=True, exist_ok=True)
+                target = unused_log_path(self.root, path.name)
+                shutil.move(os.fspath(path), os.fspath(target))
+            except OSError:
+                continue
+            moved += 1
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            marker.touch()
+        except OSError:
+            pass
+        return moved
+
+    def adopt_legacy_snapshots(self, legacy_dir=LEGACY_SNAPSHOT_DIR) -> int:
+        """Copy the snapshots this folder's logs reference out of ``legacy_dir``, once per log folder."""
+        marker = self.root / SNAPSHOTS_ADOPTED_MARKER
+        if marker.exists() or not Path(legacy_dir).is_dir():
+            return 0
+        # Copied, not moved: logs in other folders may reference the same snapshots.
+        copied = self.snapshot_store.copy_from(SnapshotStore(legacy_dir), referenced_snapshots(self.root))
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            marker.touch()
+        except OSError:
+            pass
+        return copied
+
+    def compress_finished(self, now: Optional[float] = None) -> List[Path]:
+        """Gzip every finished log that has been idle long enough."""
+        now = time.time() if now is None else now
+        compressed = []
+        for entry in self.entries():
+            if entry.compressed or now - entry.mtime < self.settings.compress_idle_seconds:
+                continue
+            if self.is_finished(entry, now):
+                target = compress_log(entry.path)
+                if target is not None:
+                    compressed.append(target)
+        return compressed
+
+    def expired(self, now: Optional[float] = None) -> List[LogEntry]:
+        """Logs to delete, oldest first, so that every retention limit holds."""
+        settings = self.settings
+        now = time.time() if now is None else now
+        # Runs still writing their log are never removed.
+        entries = [entry for entry in self.entries() if self.is_finished(entry, now)]
+        doomed = []
+        if settings.max_age_days is not None:
+            cutoff = now - settings.max_age_days * 86400
+            doomed = [entry for entry in entries if entry.mtime < cutoff]
+            entries = entries[len(doomed):]
+        if settings.max_count is not None and len(entries) > settings.max_count:
+            excess = len(entries) - settings.max_count
+            doomed += entries[:excess]
+            entries = entries[excess:]
+        if settings.max_total_bytes is not None:
+            total = sum(entry.size for entry in entries)
+            while entries and total > settings.max_total_bytes:
+                entry = entries.pop(0)
+                doomed.append(entry)
+                total -= entry.size
+        return doomed
+
+    def maintain(self, collect_snapshots: bool = True, now: Optional[float] = None) -> MaintenanceReport:
+        """Adopt legacy logs, compress finished ones, apply retention and drop unreferenced snapshots."""
+        with self._lock:
+            adopted = self.adopt_legacy_logs()
+            compressed = self.compress_finished(now)
+            removed = freed = 0
+            for entry in self.expired(now):
+                try:
+                    entry.path.unlink()
+                except OSError:
+                    continue
+                removed += 1
+                freed += entry.size
+            snapshots_removed = 0
+            if collect_snapshots:
+                try:
+                    self.adopt_legacy_snapshots()
+                    referenced = referenced_snapshots(self.root) | in_flight_snapshots(self.scratch_dir)
+                    snapshots_removed = len(self.snapshot_store.collect_garbage(referenced))
+                except OSError:
+                    pass
+            kept = self.entries()
+        return MaintenanceReport(
+            adopted,
+            len(compressed),
+            removed,
+            freed,
+            len(kept),
+            sum(entry.size for entry in kept),
+            snapshots_removed,
+        )
+
+    def _background(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            # One worker: compressions and sweeps never race each other.
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="log-store")
+        return self._executor
+
+    def maintain_later(self, collect_snapshots: bool = True) -> "Future[MaintenanceReport]":
+        return self._background().submit(self.maintain, collect_snapshots)
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+
+
+def store_from_config() -> LogStore:
+    """A ``LogStore`` for the log folder and retention settings of the active profile."""
+    from config_manager import load_log_retention, load_scratch_dir
+
+    return LogStore(
+        settings=RetentionSettings.from_mapping(load_log_retention()),
+        scratch_dir=scratch_root(load_scratch_dir()),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="List, compress and prune run logs.")
+    parser.add_argument("--logs", help="Log folder (default: the configured one).")
+    parser.add_argument("--maintain", action="store_true", help="Compress finished logs and apply retention.")
+    parser.add_argument("--show", metavar="LOG", help="Print one log, compressed or not.")
+    args = parser.parse_args()
+
+    store = store_from_config()
+    if args.logs:
+        store.root = Path(args.logs)
+    if args.show:
+        path = Path(args.show)
+        sys.stdout.write(read_log_text(path if path.exists() else store.root / args.show))
+        return
+    if args.maintain:
+        print(store.maintain().describe())
+        return
+    for entry in store.entries():
+        info = describe_log(entry.path)
+        status = "running" if info.exit_code is None else f"exit {info.exit_code}"
+        print(f"{entry.path.name:40} {info.solver:16} {status:12} {format_size(entry.size):>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,50 +1,72 @@
-import copy
-import json
 import os
-import shlex
-import subprocess
-import threading
-from datetime import datetime
+import time
 from pathlib import Path
 
-from PySide6 import QtWidgets
-
-from config_manager import load_tool_path, save_tool_path, load_parameter
-from run_reader import run_reader
-from ui.constants import SECTION_EMOJIS, STRUCTURE_DEFINITION
-from ui.field_widgets import MaterialsTableWidget, PathFieldWidget, create_field_widget
-from ui.formatters import format_solver_payload
-
-
-def load_structure(structure):
-    parameters_section = structure.get("parameters")
-    if parameters_section is None:
-        parameters_section = structure.get("Parameters", [])
-    solver_defs = {}
-    for entry in parameters_section:
-        for solver_name, groups in entry.items():
-            sections = {}
-            for group in groups:
-                for section_name, fields in group.items():
-                    sections[section_name] = copy.deepcopy(fields)
-            solver_defs[solver_name] = sections
-    solvers = structure.get("solver")
-    if solvers is None:
-        solvers = structure.get("Solver", [])
-    return list(solvers or []), solver_defs
+from PySide6 import QtCore, QtWidgets
+
+import json_io
+from config_manager import (
+    get_config_service,
+    load_adaptive_concurrency,
+    load_concurrency,
+    load_execution_policy,
+    load_tool_path,
+    save_tool_path,
+    load_parameter,
+    load_log_retention,
+    load_scratch_dir,
+)
+from execution_policy import ExecutionPolicy, SlotPlanner, policy_settings
+from json_store import JsonFileStore, atomic_write_text
+from log_search import LogIndex
+from log_store import RetentionSettings, store_from_config
+from pipeline import Pipeline, PipelineError, PipelineRunner, format_results
+from run_logs import append_log_line, append_log_summary, default_log_dir, format_command, write_run_log
+from scratch import ResultStager, ScratchJob, scratch_root
+from tool_registry import ToolRegistry, benchmark_tools, format_report
+from tool_runner import SOLVER_CODES, build_command, run_tool_process
+from tracing import span, tracer
+from ui.background import BackgroundTask
+from ui.batch_dialog import BatchDialog
+from ui.constants import STRUCTURE_DEFINITION
+from ui.field_widgets import PathFieldWidget
+from ui.log_history import RunHistoryDialog
+from ui.log_search_dialog import LogSearchDialog
+from ui.run_file_watcher import RunMaterialsWatcher
+from ui.schema import load_structure
+from ui.serializers import decode_solver_payload, select_solver_payload, serialize_solver_payload
+from ui.solver_form import SolverForm
+from ui.timing_panel import TimingPanel
 
 
 class MainWindow(QtWidgets.QMainWindow):
-    def __init__(self, parent=None):
+    # Finished runs' logs are swept for compression and retention this often.
+    LOG_MAINTENANCE_INTERVAL_MS = 60 * 60 * 1000
+
+    # Staging finishes on a worker thread; the signal queues the outcome to the UI thread.
+    _stagingFinished = QtCore.Signal(str)
+
+    def __init__(self, parent=None, maintain_logs=True):
         super().__init__(parent)
         self.setWindowTitle("🛠️ IC Advanced Tool UI")
 
         self.root_dir = Path(__file__).parent
         self.solvers, self.solver_definitions = load_structure(STRUCTURE_DEFINITION)
-        self.parameter_widgets = {}
-        self.run_file_widget = None
-        self.materials_widget = None
+        self.current_form = None
+        # Every solver's form is kept once built: switching back is instant and keeps its values.
+        self._form_cache = {}
+        self.json_store = JsonFileStore()
+        self.tool_registry = ToolRegistry()
+        self.result_stager = ResultStager()
+        self.log_store = store_from_config()
+        self.log_index = LogIndex(self.log_store.root)
+        self._stagingFinished.connect(self._show_staging_result)
+        self._benchmark_task = None
+        self._pipeline_task = None
         self._last_run_reader_error = None
+        self.run_file_watcher = RunMaterialsWatcher(parent=self)
+        self.run_file_watcher.materialsLoaded.connect(self._apply_run_materials)
+        self.run_file_watcher.loadFailed.connect(self._report_run_reader_error)
 
         central = QtWidgets.QWidget(self)
         self.setCentralWidget(central)
@@ -88,23 +110,34 @@ class MainWindow(QtWidgets.QMainWindow):
         tool_layout.addWidget(self.run_button)
         main_layout.addLayout(tool_layout)
 
+        profile_layout = QtWidgets.QHBoxLayout()
+        profile_layout.addWidget(QtWidgets.QLabel("👤 Profile:", central))
+        self.profile_combo = QtWidgets.QComboBox(central)
+        self._refresh_profiles()
+        self.profile_combo.currentTextChanged.connect(self._switch_profile)
+        profile_layout.addWidget(self.profile_combo, 1)
+        new_profile_btn = QtWidgets.QPushButton("➕ New Profile", central)
+        new_profile_btn.clicked.connect(self._create_profile)
+        profile_layout.addWidget(new_profile_btn)
+        register_tool_btn = QtWidgets.QPushButton("🏷️ Register Tool", central)
+        register_tool_btn.clicked.connect(self._register_tool)
+        profile_layout.addWidget(register_tool_btn)
+        self.benchmark_button = QtWidgets.QPushButton("⏱ Benchmark Tools", central)
+        self.benchmark_button.clicked.connect(self._benchmark_tools)
+        profile_layout.addWidget(self.benchmark_button)
+        main_layout.addLayout(profile_layout)
+
         solver_layout = QtWidgets.QHBoxLayout()
         solver_label = QtWidgets.QLabel("🧠 Solver:", central)
         self.solver_combo = QtWidgets.QComboBox(central)
         self.solver_combo.addItems(self.solvers)
-        self.solver_combo.currentTextChanged.connect(self._rebuild_form)
+        self.solver_combo.currentTextChanged.connect(self._show_form)
         solver_layout.addWidget(solver_label)
         solver_layout.addWidget(self.solver_combo, 1)
         main_layout.addLayout(solver_layout)
 
-        self.scroll_area = QtWidgets.QScrollArea(central)
-        self.scroll_area.setWidgetResizable(True)
-        self.form_container = QtWidgets.QWidget()
-        self.form_layout = QtWidgets.QVBoxLayout(self.form_container)
-        self.form_layout.setContentsMargins(0, 0, 0, 0)
-        self.form_layout.setSpacing(10)
-        self.scroll_area.setWidget(self.form_container)
-        main_layout.addWidget(self.scroll_area, 1)
+        self.form_stack = QtWidgets.QStackedWidget(central)
+        main_layout.addWidget(self.form_stack, 1)
 
         footer_layout = QtWidgets.QHBoxLayout()
         footer_layout.addWidget(QtWidgets.QLabel("💾 Output File:", central))
@@ -131,16 +164,180 @@ class MainWindow(QtWidgets.QMainWindow):
         footer_layout.addWidget(load_btn)
         main_layout.addLayout(footer_layout)
 
+        self._build_pipeline_menu()
+        self._build_trace_menu()
+
         if self.solvers:
-            self._rebuild_form(self.solvers[0])
+            self._show_form(self.solvers[0])
+        self._log_timer = QtCore.QTimer(self)
+        self._log_timer.timeout.connect(self._maintain_logs)
+        if maintain_logs:
+            self._maintain_logs()
+            self._log_timer.start(self.LOG_MAINTENANCE_INTERVAL_MS)
+
+    @property
+    def snapshot_store(self):
+        # Follows the log folder, which changes with the profile.
+        return self.log_store.snapshot_store
+
+    def _build_pipeline_menu(self):
+        menu = self.menuBar().addMenu("Runs")
+        menu.addAction("Run Batch…", self._run_batch)
+        self.run_pipeline_action = menu.addAction("Run Pipeline…", self._run_pipeline)
+        menu.addAction("Run History…", self._show_run_history)
+        menu.addAction("Search Logs…", self._search_logs).setShortcut("Ctrl+Shift+F")
+        menu.addAction("Export Form Parameters…", self._export_form_parameters)
+
+    def _show_run_history(self):
+        dialog = RunHistoryDialog(self.log_store, parent=self)
+        dialog.setAttribute(QtCore.Qt.WA_DeleteOnClose)
+        dialog.show()
+
+    def _search_logs(self):
+        dialog = LogSearchDialog(self.log_index, parent=self)
+        dialog.setAttribute(QtCore.Qt.WA_DeleteOnClose)
+        dialog.show()
+
+    def _export_form_parameters(self):
+        solver_data = self._collect_current_parameters()
+        if solver_data is None:
+            return
+        solver_name, parameters = solver_data
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self,
+            "Export Form Parameters",
+            os.fspath(self.root_dir / f"{solver_name}_parameters.json"),
+            "JSON Files (*.json);;All Files (*)",
+        )
+        if not path:
+            return
+        try:
+            atomic_write_text(path, json_io.dumps(parameters))
+        except OSError as exc:
+            QtWidgets.QMessageBox.critical(self, "File Error", f"Could not write to {path}:\n{exc}")
+            return
+        self.statusBar().showMessage(f"Parameters written to {path}; use it as a stage's parameters_file.", 5000)
+
+    def _run_batch(self):
+        tool_path = self._resolve_tool_path()
+        if tool_path is None:
+            return
+        dialog = BatchDialog(
+            tool_path,
+            load_parameter(),
+            load_concurrency(),
+            self.snapshot_store,
+            solver=self.run_solver_combo.currentText(),
+            start_dir=self.root_dir,
+            adaptive_settings=load_adaptive_concurrency(),
+            execution_policy=load_execution_policy(),
+            scratch_dir=load_scratch_dir(),
+            on_log_finished=self._index_finished_log,
+            base_dir=self.root_dir,
+            parent=self,
+        )
+        dialog.setAttribute(QtCore.Qt.WA_DeleteOnClose)
+        dialog.show()
+
+    def _run_pipeline(self):
+        if self._pipeline_task is not None and self._pipeline_task.is_running():
+            return
+        path, _ = QtWidgets.QFileDialog.getOpenFileName(
+            self,
+            "Run Pipeline",
+            os.fspath(self.root_dir),
+            "Pipeline Files (*.json);;All Files (*)",
+        )
+        if not path:
+            return
+        try:
+            pipeline = Pipeline.load(path)
+        except PipelineError as exc:
+            QtWidgets.QMessageBox.critical(self, "Run Pipeline", str(exc))
+            return
+        tool_path = self._resolve_tool_path()
+        if tool_path is None:
+            return
+
+        force = (
+            QtWidgets.QMessageBox.question(
+                self,
+                "Run Pipeline",
+                "Re-run stages that are already up to date?",
+                QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No,
+                QtWidgets.QMessageBox.No,
+            )
+            == QtWidgets.QMessageBox.Yes
+        )
 
-    def _clear_form(self):
-        while self.form_layout.count():
-            item = self.form_layout.takeAt(0)
-            widget = item.widget()
-            if widget:
-                widget.setParent(None)
-                widget.deleteLater()
+        def work(report):
+            runner = PipelineRunner(
+                pipeline,
+                tool_path,
+                parameter=load_parameter(),
+                max_workers=load_concurrency(),
+                snapshot_store=self.snapshot_store,
+                on_event=lambda name, message: report(f"Pipeline {pipeline.name}: {name} {message}"),
+                execution_policy=load_execution_policy(),
+                scratch_dir=load_scratch_dir(),
+                on_log_finished=self._index_finished_log,
+            )
+            with span("pipeline", name=pipeline.name):
+                results = runner.run(force=force)
+            return format_results(pipeline, results)
+
+        task = BackgroundTask(work, parent=self)
+        task.progress.connect(lambda message: self.statusBar().showMessage(message))
+        task.finished.connect(lambda report: self._show_text_report("Pipeline Results", report))
+        task.failed.connect(
+            lambda message: QtWidgets.QMessageBox.critical(self, "Run Pipeline", f"Pipeline failed:\n{message}")
+        )
+        task.finished.connect(lambda _: self.run_pipeline_action.setEnabled(True))
+        task.failed.connect(lambda _: self.run_pipeline_action.setEnabled(True))
+        self.run_pipeline_action.setEnabled(False)
+        self._pipeline_task = task
+        task.start()
+
+    def _build_trace_menu(self):
+        self.timing_panel = TimingPanel(self)
+        self.addDockWidget(QtCore.Qt.RightDockWidgetArea, self.timing_panel)
+        self.timing_panel.setVisible(tracer.enabled)
+
+        menu = self.menuBar().addMenu("Trace")
+        enable_action = menu.addAction("Enable Tracing")
+        enable_action.setCheckable(True)
+        enable_action.setChecked(tracer.enabled)
+        enable_action.toggled.connect(self._set_tracing_enabled)
+        menu.addAction(self.timing_panel.toggleViewAction())
+        menu.addSeparator()
+        menu.addAction("Export Chrome Trace…", self._export_trace)
+        menu.addAction("Clear Trace", self._clear_trace)
+
+    def _set_tracing_enabled(self, enabled):
+        tracer.set_enabled(enabled)
+        if enabled:
+            self.timing_panel.show()
+        self.statusBar().showMessage("Tracing enabled." if enabled else "Tracing disabled.", 3000)
+
+    def _clear_trace(self):
+        tracer.clear()
+        self.timing_panel.clear()
+
+    def _export_trace(self):
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self,
+            "Export Chrome Trace",
+            os.fspath(self.root_dir / "icadv_trace.json"),
+            "Trace Files (*.json);;All Files (*)",
+        )
+        if not path:
+            return
+        try:
+            count = tracer.export_chrome_trace(path)
+        except OSError as exc:
+            QtWidgets.QMessageBox.critical(self, "Export Trace", f"Could not write {path}:\n{exc}")
+            return
+        self.statusBar().showMessage(f"Wrote {count} trace events to {path}.", 5000)
 
     def _persist_tool_path(self, path_str):
         cleaned = (path_str or "").strip()
@@ -151,45 +348,107 @@ class MainWindow(QtWidgets.QMainWindow):
                 pass
         save_tool_path(cleaned)
 
+    def _refresh_profiles(self):
+        config = get_config_service()
+        self.profile_combo.blockSignals(True)
+        self.profile_combo.clear()
+        self.profile_combo.addItems(config.profiles())
+        self.profile_combo.setCurrentText(config.active_profile())
+        self.profile_combo.blockSignals(False)
+
+    def _switch_profile(self, name, copy_from=None):
+        if not name:
+            return
+        get_config_service().set_active_profile(name, copy_from=copy_from)
+        self.tool_path_widget.set_path(load_tool_path(), emit_change=False)
+        self.log_store.root = default_log_dir()
+        self.log_store.settings = RetentionSettings.from_mapping(load_log_retention())
+        self.log_store.scratch_dir = scratch_root(load_scratch_dir())
+        if self.log_index.root != self.log_store.root:
+            self.log_index.shutdown(wait=False)
+            self.log_index = LogIndex(self.log_store.root)
+        self.statusBar().showMessage(f"Using profile '{name}'.", 3000)
+
+    def _create_profile(self):
+        name, accepted = QtWidgets.QInputDialog.getText(self, "New Profile", "Profile name:")
+        name = name.strip()
+        if not accepted or not name:
+            return
+        current = get_config_service().active_profile()
+        self._switch_profile(name, copy_from=current)
+        self._refresh_profiles()
+
+    def _show_form(self, solver_name):
+        form = self._form_cache.get(solver_name)
+        if form is None:
+            self._rebuild_form(solver_name)
+            return
+        self._activate_form(form)
+        if self.run_file_widget and self.run_file_widget.value().strip():
+            self._handle_run_file_changed(self.run_file_widget.value())
+
     def _rebuild_form(self, solver_name):
-        self._clear_form()
-        self.parameter_widgets = {}
-        self.run_file_widget = None
-        self.materials_widget = None
-
-        sections = self.solver_definitions.get(solver_name, {})
-        for section_name, fields in sections.items():
-            emoji = SECTION_EMOJIS.get(section_name.lower(), "📦")
-            title = f"{emoji} {section_name.capitalize()}"
-            group_box = QtWidgets.QGroupBox(title, self.form_container)
-            group_layout = QtWidgets.QFormLayout(group_box)
-            group_layout.setContentsMargins(10, 10, 10, 10)
-            group_layout.setSpacing(8)
-            self.parameter_widgets[section_name] = {}
-
-            for field in fields:
-                field_name = field["Name"]
-                widget = create_field_widget(field, parent=group_box)
-                self.parameter_widgets[section_name][field_name] = widget
-                group_layout.addRow(field_name, widget)
-                if section_name.lower() == "source":
-                    if field_name == "RunFile" and isinstance(widget, PathFieldWidget):
-                        self.run_file_widget = widget
-                        widget.pathChanged.connect(self._handle_run_file_changed)
-                    if field_name == "Materials" and isinstance(widget, MaterialsTableWidget):
-                        self.materials_widget = widget
-
-            self.form_layout.addWidget(group_box)
-
-        self.form_layout.addStretch(1)
+        with span("rebuild_form", solver=solver_name):
+            with span("discard_form"):
+                self._discard_form(solver_name)
+            with span("build_form"):
+                form = SolverForm(solver_name, self.solver_definitions.get(solver_name, {}))
+                form.runFileChanged.connect(self._handle_run_file_changed)
+                page = QtWidgets.QScrollArea(self.form_stack)
+                page.setWidgetResizable(True)
+                page.setWidget(form)
+                self.form_stack.addWidget(page)
+                self._form_cache[solver_name] = form
+
+            with span("activate_form"):
+                self._activate_form(form)
         if self.run_file_widget and self.run_file_widget.value().strip():
             self._handle_run_file_changed(self.run_file_widget.value())
 
+    def _activate_form(self, form):
+        if self.current_form is not None and self.current_form is not form:
+            watched_path = self.run_file_watcher.path()
+            self.current_form.watched_run = (
+                (watched_path, self.run_file_watcher.signature()) if watched_path else None
+            )
+        self.run_file_watcher.stop()
+        self.current_form = form
+        self.form_stack.setCurrentWidget(self._form_page(form))
+
+    @property
+    def parameter_widgets(self):
+        return self.current_form.parameter_widgets if self.current_form else {}
+
+    @property
+    def run_file_widget(self):
+        return self.current_form.run_file_widget if self.current_form else None
+
+    @property
+    def materials_widget(self):
+        return self.current_form.materials_widget if self.current_form else None
+
+    def _discard_form(self, solver_name):
+        form = self._form_cache.pop(solver_name, None)
+        if form is None:
+            return
+        if form is self.current_form:
+            self.current_form = None
+        page = self._form_page(form)
+        self.form_stack.removeWidget(page)
+        page.setParent(None)
+        page.deleteLater()
+
+    @staticmethod
+    def _form_page(form):
+        # Forms live in a QScrollArea page: form -> viewport -> scroll area.
+        return form.parentWidget().parentWidget()
+
     def _handle_run_file_changed(self, path_str):
         if not self.materials_widget:
             return
         run_path_value = (path_str or "").strip()
         if not run_path_value:
+            self.run_file_watcher.stop()
             return
         try:
             candidate_path = Path(run_path_value).expanduser()
@@ -197,25 +456,29 @@ class MainWindow(QtWidgets.QMainWindow):
             return
         if not candidate_path.exists():
             return
-        run_input = str(candidate_path)
-        try:
-            material_names = run_reader(run_input)
-        except FileNotFoundError:
-            return
-        except Exception as exc:
-            error_signature = (run_input, str(exc))
-            if self._last_run_reader_error != error_signature:
-                self._last_run_reader_error = error_signature
-                QtWidgets.QMessageBox.warning(
-                    self,
-                    "Run File Error",
-                    f"Unable to read materials from '{run_input}':\n{exc}",
-                )
-            return
+        known_signature = None
+        watched_run = self.current_form.watched_run if self.current_form else None
+        if watched_run and watched_run[0] == os.fspath(candidate_path):
+            known_signature = watched_run[1]
+        self.run_file_watcher.watch(candidate_path, known_signature=known_signature)
 
+    def _apply_run_materials(self, run_input, material_names):
+        if not self.materials_widget:
+            return
         self._last_run_reader_error = None
         self.materials_widget.populate_from_names(material_names)
 
+    def _report_run_reader_error(self, run_input, message):
+        error_signature = (run_input, message)
+        if self._last_run_reader_error == error_signature:
+            return
+        self._last_run_reader_error = error_signature
+        QtWidgets.QMessageBox.warning(
+            self,
+            "Run File Error",
+            f"Unable to read materials from '{run_input}':\n{message}",
+        )
+
     def _collect_current_parameters(self):
         solver_name = self.solver_combo.currentText()
         if not solver_name:
@@ -258,6 +521,19 @@ class MainWindow(QtWidgets.QMainWindow):
         return output_path
 
     def _save_to_json(self, show_message=True, solver_data=None, selected_solver=None):
+        saved = self._write_solver_input(solver_data, selected_solver)
+        if saved is None:
+            return None
+        output_path, _, written = saved
+
+        if not written:
+            self.statusBar().showMessage(f"{output_path} is already up to date; nothing written.", 5000)
+        if show_message:
+            QtWidgets.QMessageBox.information(self, "Success", f"Configuration saved to {output_path}")
+        return output_path
+
+    def _write_solver_input(self, solver_data=None, selected_solver=None):
+        """Serialize and save the solver input; returns ``(path, payload, written)``."""
         if solver_data is None:
             solver_data = self._collect_current_parameters()
         if solver_data is None:
@@ -266,7 +542,8 @@ class MainWindow(QtWidgets.QMainWindow):
 
         try:
             target_solver = selected_solver or solver_name
-            formatted_payload = format_solver_payload(target_solver, collected_parameters)
+            with span("serialize_payload", solver=target_solver):
+                formatted_payload = serialize_solver_payload(target_solver, collected_parameters)
         except Exception as exc:
             QtWidgets.QMessageBox.critical(
                 self,
@@ -289,53 +566,15 @@ class MainWindow(QtWidgets.QMainWindow):
             )
             return None
 
-        existing_payload = {}
-        if output_path.exists():
-            try:
-                with open(output_path, "r", encoding="utf-8") as fh:
-                    existing_payload = json.load(fh) or {}
-                if not isinstance(existing_payload, dict):
-                    existing_payload = {}
-            except (OSError, json.JSONDecodeError):
-                existing_payload = {}
-
-        final_payload = {}
-        final_payload.update(existing_payload)
-        final_payload.update(formatted_payload)
-
         try:
-            with open(output_path, "w", encoding="utf-8") as fh:
-                json.dump(final_payload, fh, indent=4)
+            with span("save_json", path=output_path):
+                merged_payload, written = self.json_store.save_merged(output_path, formatted_payload)
         except OSError as exc:
             QtWidgets.QMessageBox.critical(self, "File Error", f"Could not write to {output_path}:\n{exc}")
             return None
+        return output_path, merged_payload, written
 
-        if show_message:
-            QtWidgets.QMessageBox.information(self, "Success", f"Configuration saved to {output_path}")
-        return output_path
-
-    def _run_tool(self):
-        solver_data = self._collect_current_parameters()
-        if solver_data is None:
-            return
-        solver_name, collected_parameters = solver_data
-
-        selected_solver = self.run_solver_combo.currentText() if hasattr(self, "run_solver_combo") else ""
-        solver_mapping = {
-            "MappingTool": "mt",
-            "ThermalCycleCalc": "tc",
-            "DelamAlert": "da",
-            "PressureOven": "po",
-        }
-        solver_code = solver_mapping.get(selected_solver)
-        if not solver_code:
-            QtWidgets.QMessageBox.warning(
-                self,
-                "Missing Solver Selection",
-                "Please choose which solver to run.",
-            )
-            return
-
+    def _resolve_tool_path(self):
         tool_path_text = self.tool_path_widget.value().strip() if hasattr(self, "tool_path_widget") else ""
         if not tool_path_text:
             QtWidgets.QMessageBox.warning(
@@ -343,7 +582,7 @@ class MainWindow(QtWidgets.QMainWindow):
                 "Missing Executable",
                 "Please choose the MDXICAdvancedTool executable before running.",
             )
-            return
+            return None
 
         tool_path = Path(tool_path_text).expanduser()
         if not tool_path.is_absolute():
@@ -354,59 +593,102 @@ class MainWindow(QtWidgets.QMainWindow):
                 "Executable Not Found",
                 f"No executable found at '{tool_path}'.",
             )
-            return
+            return None
         if tool_path.is_dir():
             QtWidgets.QMessageBox.warning(
                 self,
                 "Invalid Executable",
                 f"'{tool_path}' is a directory. Please select the MDXICAdvancedTool executable file.",
             )
-            return
+            return None
+        return tool_path
 
-        output_path = self._save_to_json(
-            show_message=False,
-            solver_data=solver_data,
-            selected_solver=selected_solver,
-        )
-        if output_path is None:
-            return
+    def _run_tool(self):
+        with span("run_tool", solver=self.run_solver_combo.currentText()):
+            success_message = self._run_tool_phases()
+        if success_message:
+            QtWidgets.QMessageBox.information(
+                self,
+                "Tool Execution Finished",
+                success_message,
+            )
 
-        command = [
-            os.fspath(tool_path),
-            "--solver",
-            solver_code,
-            "-i",
-            os.fspath(output_path),
-        ]
+    def _run_tool_phases(self):
+        """Run the selected solver; returns the success message, or ``None`` after reporting a failure."""
+        with span("collect_parameters"):
+            solver_data = self._collect_current_parameters()
+        if solver_data is None:
+            return None
+        solver_name, collected_parameters = solver_data
 
-        config_param = load_parameter()
-        if len(config_param) > 0:
-            command.append('--param')
-            command.append(config_param)
+        selected_solver = self.run_solver_combo.currentText() if hasattr(self, "run_solver_combo") else ""
+        solver_code = SOLVER_CODES.get(selected_solver)
+        if not solver_code:
+            QtWidgets.QMessageBox.warning(
+                self,
+                "Missing Solver Selection",
+                "Please choose which solver to run.",
+            )
+            return None
 
-        log_path = self._write_run_log(
-            solver_name,
-            selected_solver,
-            tool_path,
-            output_path,
-            command,
-            collected_parameters,
-        )
+        tool_path = self._resolve_tool_path()
+        if tool_path is None:
+            return None
+
+        saved = self._write_solver_input(solver_data, selected_solver)
+        if saved is None:
+            return None
+        output_path, solver_input, _ = saved
 
         try:
-            return_code, stdout_text, stderr_text = self._execute_command_with_logging(command, log_path)
+            scratch = ScratchJob(scratch_root(load_scratch_dir()), selected_solver)
+            _, staged_outputs = scratch.prepare_input(solver_input, base_dir=self.root_dir)
+        except (OSError, TypeError, ValueError) as exc:
+            QtWidgets.QMessageBox.critical(self, "Scratch Error", f"Could not prepare a scratch directory:\n{exc}")
+            return None
+
+        command = build_command(tool_path, solver_code, scratch.input_path, load_parameter())
+
+        with span("write_run_log"):
+            log_path = self._write_run_log(
+                solver_name,
+                selected_solver,
+                tool_path,
+                output_path,
+                command,
+                collected_parameters,
+                solver_input,
+                log_dir=scratch.path,
+            )
+
+        try:
+            with span("tool_process", command=self._format_command(command)):
+                return_code, stdout_text, stderr_text, wall_seconds = self._execute_command_with_logging(
+                    command, log_path, cwd=scratch.path
+                )
         except OSError as exc:
             self._append_log_line(log_path, "ERROR", f"Failed to start MDXICAdvancedTool: {exc}")
             self._append_log_summary(log_path, "failed to launch")
+            log_path = scratch.move_log(log_path, self.log_store.root)
+            scratch.cleanup()
             QtWidgets.QMessageBox.critical(
                 self,
                 "Execution Error",
                 f"Failed to start MDXICAdvancedTool:\n{exc}"
                 + (f"\n\nLog written to: {log_path}" if log_path else ""),
             )
-            return
+            return None
 
-        self._append_log_summary(log_path, return_code)
+        self._append_log_summary(log_path, return_code, wall_seconds)
+
+        plot_path = plot_warning = None
+        if return_code == 0:
+            with span("plot"):
+                plot_path, plot_warning = self._maybe_generate_pressure_oven_plot(
+                    selected_solver, collected_parameters, staged_outputs
+                )
+        log_path = scratch.move_log(log_path, self.log_store.root)
+        self._stage_results(scratch, staged_outputs, log_path)
 
         if return_code != 0:
             details = stderr_text.strip() or stdout_text.strip()
@@ -419,35 +701,155 @@ class MainWindow(QtWidgets.QMainWindow):
                 "Tool Execution Failed",
                 f"{self._format_command(command)}\n\n{details}",
             )
-            return
+            return None
 
         success_message = stdout_text.strip() or "MDXICAdvancedTool finished successfully."
         if stderr_text.strip():
             success_message += f"\n\nWarnings:\n{stderr_text.strip()}"
 
-        plot_path, plot_warning = self._maybe_generate_pressure_oven_plot(selected_solver, collected_parameters)
         if plot_warning:
             success_message += f"\n\nPlot warning: {plot_warning}"
         elif plot_path:
             success_message += f"\n\nPressure/radius plot saved to: {plot_path}"
+        if staged_outputs:
+            folders = ", ".join(os.fspath(folder) for folder in staged_outputs.values())
+            success_message += f"\n\nResults are being copied to: {folders}"
 
         if log_path:
             success_message += f"\n\nLog written to: {log_path}"
-        QtWidgets.QMessageBox.information(
+        return success_message
+
+    def _stage_results(self, scratch, staged_outputs, log_path):
+        def report(staging):
+            if staging.errors:
+                message = f"Staging failed for {len(staging.errors)} file(s); results kept in {staging.scratch_path}"
+            else:
+                message = f"Staged {staging.files} result file(s) in {staging.seconds:.1f} s."
+            self._stagingFinished.emit(message)
+            # Nothing writes to the log after staging, so it can be indexed now. It keeps the
+            # path the run dialogs reported until the idle pass of log maintenance compresses it.
+            if log_path:
+                self.log_index.update_later()
+
+        self.result_stager.submit(scratch, staged_outputs, log_path, on_done=report)
+
+    def _show_staging_result(self, message):
+        if message.startswith("Staging failed"):
+            QtWidgets.QMessageBox.warning(self, "Result Staging", message)
+        else:
+            self.statusBar().showMessage(message, 5000)
+
+    def _register_tool(self):
+        tool_path = self._resolve_tool_path()
+        if tool_path is None:
+            return
+        name, accepted = QtWidgets.QInputDialog.getText(
             self,
-            "Tool Execution Finished",
-            success_message,
+            "Register Tool",
+            f"Name for {tool_path}:",
+            text=tool_path.parent.name,
+        )
+        name = name.strip()
+        if not accepted or not name:
+            return
+        try:
+            entry = self.tool_registry.register(name, tool_path)
+        except OSError as exc:
+            QtWidgets.QMessageBox.critical(self, "Register Tool", f"Could not read {tool_path}:\n{exc}")
+            return
+        self.statusBar().showMessage(f"Registered '{name}' ({entry['sha256'][:12]}).", 5000)
+
+    def _benchmark_tools(self):
+        if self._benchmark_task is not None and self._benchmark_task.is_running():
+            return
+        names = self.tool_registry.names()
+        if len(names) < 2:
+            QtWidgets.QMessageBox.information(
+                self,
+                "Benchmark Tools",
+                "Register at least two tool builds to compare them.",
+            )
+            return
+        changed = self.tool_registry.changed_tools(names)
+        if changed:
+            details = "\n".join(f"{name}: {reason}" for name, reason in changed.items())
+            QtWidgets.QMessageBox.warning(self, "Benchmark Tools", f"Re-register these builds first:\n{details}")
+            return
+
+        selected_solver = self.run_solver_combo.currentText()
+        baseline, accepted = QtWidgets.QInputDialog.getItem(
+            self, "Benchmark Tools", "Baseline build:", names, 0, False
+        )
+        if not accepted:
+            return
+        repeat, accepted = QtWidgets.QInputDialog.getInt(
+            self, "Benchmark Tools", "Runs per build:", 3, 1, 100
+        )
+        if not accepted:
+            return
+        saved = self._write_solver_input(None, selected_solver)
+        if saved is None:
+            return
+        output_path = saved[0]
+        parameter = load_parameter()
+        registry = self.tool_registry
+
+        def work(report):
+            def progress(name, index, run):
+                label = "warm-up" if index < 0 else f"run {index + 1}/{repeat}"
+                report(f"Benchmarking {name}: {label} took {run.wall_seconds:.2f} s")
+
+            results = benchmark_tools(
+                registry, names, selected_solver, output_path, parameter, repeat=repeat, on_progress=progress
+            )
+            return format_report(selected_solver, results, baseline)
+
+        task = BackgroundTask(work, parent=self)
+        task.progress.connect(lambda message: self.statusBar().showMessage(message))
+        task.finished.connect(lambda report: self._show_text_report("Tool Benchmark", report))
+        task.failed.connect(
+            lambda message: QtWidgets.QMessageBox.critical(self, "Benchmark Tools", f"Benchmark failed:\n{message}")
         )
-        
+        task.finished.connect(lambda _: self.benchmark_button.setEnabled(True))
+        task.failed.connect(lambda _: self.benchmark_button.setEnabled(True))
+        self.benchmark_button.setEnabled(False)
+        self._benchmark_task = task
+        task.start()
+
+    def _show_text_report(self, title, report):
+        self.statusBar().clearMessage()
+        dialog = QtWidgets.QDialog(self)
+        dialog.setWindowTitle(title)
+        layout = QtWidgets.QVBoxLayout(dialog)
+        text = QtWidgets.QPlainTextEdit(report, dialog)
+        text.setReadOnly(True)
+        text.setLineWrapMode(QtWidgets.QPlainTextEdit.NoWrap)
+        font = text.font()
+        font.setFamily("monospace")
+        font.setStyleHint(font.StyleHint.Monospace)
+        text.setFont(font)
+        layout.addWidget(text)
+        buttons = QtWidgets.QDialogButtonBox(QtWidgets.QDialogButtonBox.Close, dialog)
+        buttons.rejected.connect(dialog.reject)
+        layout.addWidget(buttons)
+        dialog.resize(720, 320)
+        dialog.show()
+
     @staticmethod
     def _format_command(command_parts):
-        if os.name == "nt":
-            return subprocess.list2cmdline(command_parts)
-        if hasattr(shlex, "join"):
-            return shlex.join(command_parts)
-        return " ".join(shlex.quote(part) for part in command_parts)
+        return format_command(command_parts)
 
     def _load_from_json(self):
+        with span("load_json"):
+            loaded_path = self._load_from_json_phases()
+        if loaded_path is not None:
+            QtWidgets.QMessageBox.information(
+                self,
+                "Configuration Loaded",
+                f"Parameters updated from '{loaded_path}'.",
+            )
+
+    def _load_from_json_phases(self):
         output_path_text = self.output_path_widget.value().strip() if hasattr(self, "output_path_widget") else ""
         if not output_path_text:
             QtWidgets.QMessageBox.warning(
@@ -455,7 +857,7 @@ class MainWindow(QtWidgets.QMainWindow):
                 "Missing JSON Path",
                 "Please choose a JSON file to load.",
             )
-            return
+            return None
 
         candidate_path = Path(output_path_text).expanduser()
         if not candidate_path.is_absolute():
@@ -466,29 +868,32 @@ class MainWindow(QtWidgets.QMainWindow):
                 "File Not Found",
                 f"No JSON file found at '{candidate_path}'.",
             )
-            return
+            return None
 
+        load_started = time.perf_counter()
         try:
-            with open(candidate_path, "r", encoding="utf-8") as handle:
-                raw_payload = json.load(handle)
-        except (OSError, json.JSONDecodeError) as exc:
+            with span("read_json", path=candidate_path):
+                raw_payload = json_io.load_path(candidate_path)
+        except (OSError, json_io.JSONDecodeError) as exc:
             QtWidgets.QMessageBox.critical(
                 self,
                 "Load Error",
                 f"Failed to read configuration:\n{exc}",
             )
-            return
+            return None
 
-        solver_name, solver_payload = self._select_solver_from_payload(raw_payload)
+        with span("select_solver"):
+            solver_name, solver_payload = self._select_solver_from_payload(raw_payload)
         if not solver_name or not isinstance(solver_payload, dict):
             QtWidgets.QMessageBox.warning(
                 self,
                 "Unsupported Configuration",
                 "The selected JSON does not contain data for the available solvers.",
             )
-            return
+            return None
 
-        sections = self._prepare_section_values(solver_name, solver_payload)
+        with span("decode_payload", solver=solver_name):
+            sections = decode_solver_payload(solver_name, solver_payload)
 
         self.solver_combo.blockSignals(True)
         solver_index = self.solver_combo.findText(solver_name)
@@ -496,117 +901,45 @@ class MainWindow(QtWidgets.QMainWindow):
             self.solver_combo.setCurrentIndex(solver_index)
         self.solver_combo.blockSignals(False)
         self._rebuild_form(solver_name)
-        self._apply_section_values(sections)
-
-        QtWidgets.QMessageBox.information(
-            self,
-            "Configuration Loaded",
-            f"Parameters updated from '{candidate_path}'.",
-        )
-
-    SOLVER_KEY_ALIASES = {
-        "MappingTool": ["MappingTool", "Maptools"],
-        "ReliabilityTools": ["ReliabilityTools"],
-        "PressureOven": ["PressureOven"],
-    }
+        with span("apply_values"), self.current_form.bulk_update():
+            self._apply_section_values(sections)
+        with span("watch_run_file"):
+            self._watch_loaded_run_file()
+        elapsed_ms = (time.perf_counter() - load_started) * 1000
+        self.statusBar().showMessage(f"Loaded {solver_name} from '{candidate_path}' in {elapsed_ms:.1f} ms")
+        return candidate_path
+
+    def _watch_loaded_run_file(self):
+        if not self.run_file_widget or not self.materials_widget:
+            return
+        run_path_value = self.run_file_widget.value().strip()
+        if not run_path_value:
+            return
+        try:
+            candidate_path = Path(run_path_value).expanduser()
+        except (OSError, RuntimeError, ValueError):
+            return
+        if candidate_path.exists():
+            # Materials come from the JSON; only refresh once the .run changes.
+            self.run_file_watcher.watch(candidate_path, load_now=False)
 
     def _select_solver_from_payload(self, payload):
-        if not isinstance(payload, dict):
-            return None, None
-
         current_solver = self.solver_combo.currentText()
-        solver_candidates = [solver for solver in [current_solver] + list(self.solvers) if solver]
-        seen = set()
-        ordered_candidates = []
-        for solver in solver_candidates:
-            if solver not in seen:
-                ordered_candidates.append(solver)
-                seen.add(solver)
-
-        for solver in ordered_candidates:
-            for alias in self.SOLVER_KEY_ALIASES.get(solver, []):
-                solver_payload = self._case_insensitive_get(payload, alias)
-                if isinstance(solver_payload, dict):
-                    return solver, solver_payload
-
-        dict_entries = [(str(key), value) for key, value in payload.items() if isinstance(value, dict)]
-        if len(dict_entries) == 1:
-            key, value = dict_entries[0]
-            inferred_solver = self._infer_solver_from_key(key) or current_solver
-            return inferred_solver, value
-
-        return None, None
-
-    def _infer_solver_from_key(self, key):
-        lowered = str(key).lower()
-        for solver, aliases in self.SOLVER_KEY_ALIASES.items():
-            for alias in aliases:
-                if lowered == alias.lower():
-                    return solver
-        return None
-
-    def _prepare_section_values(self, solver_name, solver_payload):
-        if solver_name == "PressureOven":
-            return self._prepare_pressure_oven_sections(solver_payload)
-
-        sections = {}
-        solver_sections = self.solver_definitions.get(solver_name, {})
-        for section_name in solver_sections:
-            section_payload = self._case_insensitive_get(solver_payload, section_name)
-            if isinstance(section_payload, dict):
-                sections[section_name] = section_payload
-        return sections
-
-    def _prepare_pressure_oven_sections(self, solver_payload):
-        if not isinstance(solver_payload, dict):
-            return {}
-
-        ramp_rows = []
-        ramp_payload = solver_payload.get("PressureRampProfile") or {}
-        if isinstance(ramp_payload, dict):
-            increments = ramp_payload.get("Pressure increment (Pa)") or []
-            time_marks = ramp_payload.get("Time mark (s)") or []
-            for increment, time_mark in zip(increments, time_marks):
-                ramp_rows.append(
-                    {
-                        "Pressure increment (Pa)": increment,
-                        "Time mark (s)": time_mark,
-                    }
-                )
-
-        return {
-            "general": {
-                "OutputFolder": solver_payload.get("OutputFolder", ""),
-                "Void shape (Cylindrical/Spherical)": solver_payload.get("Void shape (Cylindrical/Spherical)", ""),
-            },
-            "material properties": solver_payload.get("MaterialProperties", {}),
-            "process conditions": solver_payload.get("ProcessConditions", {}),
-            "pressure ramp profile": {
-                "Pressure Ramp Profile": ramp_rows,
-            },
-        }
+        candidates = list(dict.fromkeys(solver for solver in [current_solver] + list(self.solvers) if solver))
+        return select_solver_payload(payload, candidates, fallback_solver=current_solver)
 
     def _apply_section_values(self, sections):
+        # Sections come from decode_solver_payload, keyed by canonical field names.
         for section_name, fields in self.parameter_widgets.items():
             section_payload = sections.get(section_name) if sections else None
             if not isinstance(section_payload, dict):
                 continue
             for field_name, widget in fields.items():
-                value = self._case_insensitive_get(section_payload, field_name)
+                value = section_payload.get(field_name)
                 if value is None:
                     continue
                 self._set_widget_value(widget, value)
 
-    @staticmethod
-    def _case_insensitive_get(container, key):
-        if not isinstance(container, dict):
-            return None
-        target = str(key).lower()
-        for candidate, value in container.items():
-            if str(candidate).lower() == target:
-                return value
-        return None
-
     def _set_widget_value(self, widget, value):
         setter = getattr(widget, "set_value", None)
         if callable(setter):
@@ -626,116 +959,54 @@ class MainWindow(QtWidgets.QMainWindow):
         output_path,
         command,
         parameters,
+        solver_input=None,
+        log_dir=None,
     ):
-        now = datetime.now()
-        timestamp = now.strftime("%Y%m%d_%H%M%S")
-        log_dir = Path(".")
-        suffix = ""
-        counter = 1
-        while True:
-            log_name = f"run_log_{timestamp}{suffix}.log"
-            log_path = log_dir / log_name
-            if not log_path.exists():
-                break
-            counter += 1
-            suffix = f"_{counter}"
-
-        output_path = Path(output_path)
-        serialized_payload = None
-        try:
-            with output_path.open("r", encoding="utf-8") as handle:
-                serialized_payload = json.load(handle)
-        except (OSError, json.JSONDecodeError):
-            try:
-                with output_path.open("r", encoding="utf-8") as handle:
-                    serialized_payload = handle.read()
-            except OSError:
-                serialized_payload = None
-
-        log_payload = {
-            "timestamp": now.isoformat(),
-            "ui_solver": solver_name,
-            "run_solver": selected_solver,
-            "tool_path": os.fspath(tool_path),
-            "output_path": os.fspath(output_path),
-            "command": command,
-            "command_line": self._format_command(command),
-            "parameters": parameters,
-        }
-        if serialized_payload is not None:
-            log_payload["solver_input"] = serialized_payload
-
-        try:
-            with open(log_path, "w", encoding="utf-8") as handle:
-                json.dump(log_payload, handle, indent=4)
-                handle.write("\n\n=== Command Output ===\n")
-        except OSError:
-            return None
-        return log_path
-
-    def _execute_command_with_logging(self, command, log_path):
-        stdout_lines = []
-        stderr_lines = []
-
-        process = subprocess.Popen(
+        return write_run_log(
+            solver_name,
+            selected_solver,
+            tool_path,
+            output_path,
             command,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            bufsize=1,
+            parameters,
+            solver_input=solver_input,
+            snapshot_store=self.snapshot_store,
+            log_dir=log_dir,
         )
 
-        def reader(stream, label, collector):
-            try:
-                for line in iter(stream.readline, ""):
-                    collector.append(line)
-                    self._append_log_line(log_path, label, line.rstrip("\n"))
-            finally:
-                stream.close()
-
-        threads = []
-        if process.stdout:
-            t_out = threading.Thread(target=reader, args=(process.stdout, "STDOUT", stdout_lines), daemon=True)
-            t_out.start()
-            threads.append(t_out)
-        if process.stderr:
-            t_err = threading.Thread(target=reader, args=(process.stderr, "STDERR", stderr_lines), daemon=True)
-            t_err.start()
-            threads.append(t_err)
-
-        for thread in threads:
-            thread.join()
-
-        return_code = process.wait()
-        stdout_text = "".join(stdout_lines)
-        stderr_text = "".join(stderr_lines)
-        return return_code, stdout_text, stderr_text
+    def _index_finished_log(self, log_path):
+        # Called from batch and pipeline worker threads; the index queues its own update.
+        self.log_index.update_later()
+
+    def _shutdown_log_index(self):
+        # A profile switch may have replaced the index, so resolve it at exit.
+        self.log_index.shutdown()
+
+    def _maintain_logs(self):
+        """Compress finished logs, apply retention and drop snapshots no log needs, off the UI thread."""
+        maintenance = self.log_store.maintain_later()
+        # Logs removed by retention leave the search index; compressed ones are re-pointed.
+        maintenance.add_done_callback(lambda _: self.log_index.update_later())
+
+    def _execute_command_with_logging(self, command, log_path, cwd=None):
+        policy = SlotPlanner(policy_settings(load_execution_policy(), "interactive")).policy_for(0)
+        if policy != ExecutionPolicy():
+            self._append_log_line(log_path, "POLICY", policy.describe())
+        result = run_tool_process(
+            command,
+            on_line=lambda label, line: self._append_log_line(log_path, label, line),
+            policy=policy,
+            cwd=cwd,
+        )
+        return result.return_code, result.stdout, result.stderr, result.wall_seconds
 
     def _append_log_line(self, log_path, label, message):
-        if not log_path:
-            return
-        timestamp = datetime.now().isoformat()
-        try:
-            with open(log_path, "a", encoding="utf-8") as handle:
-                handle.write(f"[{timestamp}] {label}: {message}\n")
-        except OSError:
-            pass
-
-    def _append_log_summary(self, log_path, return_code):
-        if not log_path:
-            return
-        summary_lines = [
-            "\n=== Summary ===",
-            f"Completed at: {datetime.now().isoformat()}",
-            f"Exit code: {return_code}",
-        ]
-        try:
-            with open(log_path, "a", encoding="utf-8") as handle:
-                handle.write("\n".join(summary_lines) + "\n")
-        except OSError:
-            pass
+        append_log_line(log_path, label, message)
+
+    def _append_log_summary(self, log_path, return_code, wall_seconds=None):
+        append_log_summary(log_path, return_code, wall_seconds)
 
-    def _maybe_generate_pressure_oven_plot(self, selected_solver, collected_parameters):
+    def _maybe_generate_pressure_oven_plot(self, selected_solver, collected_parameters, staged_outputs=None):
         if selected_solver != "PressureOven":
             return None, None
 
@@ -750,7 +1021,10 @@ class MainWindow(QtWidgets.QMainWindow):
             return None, f"Invalid OutputFolder path: {exc}"
         if not folder_path.is_absolute():
             folder_path = self.root_dir / folder_path
-        csv_path = folder_path / "pressure_radius_history.csv"
+        # Before staging, the results are still in the run's scratch folder.
+        scratch_folders = {final: scratch for scratch, final in (staged_outputs or {}).items()}
+        read_folder = scratch_folders.get(folder_path, folder_path)
+        csv_path = read_folder / "pressure_radius_history.csv"
 
         if not csv_path.exists():
             return None, f"CSV not found at {csv_path}"
@@ -761,22 +1035,27 @@ class MainWindow(QtWidgets.QMainWindow):
             return None, f"Unable to import plotting helper: {exc}"
 
         try:
-            time, radius, pressure = load_columns(csv_path)
+            times, radius, pressure = load_columns(csv_path)
         except Exception as exc:
             return None, f"Failed to read CSV data: {exc}"
 
         output_png = csv_path.with_suffix(".png")
         try:
-            plot_with_matplotlib(time, radius, pressure, output_png)
+            plot_with_matplotlib(times, radius, pressure, output_png)
         except Exception as exc:
             return None, f"Matplotlib rendering failed: {exc}"
 
-        return output_png, None
+        return folder_path / output_png.name, None
 
 
 def main():
     app = QtWidgets.QApplication([])
     window = MainWindow()
+    app.aboutToQuit.connect(window.run_file_watcher.shutdown)
+    app.aboutToQuit.connect(get_config_service().flush)
+    app.aboutToQuit.connect(window.result_stager.shutdown)
+    app.aboutToQuit.connect(window.log_store.shutdown)
+    app.aboutToQuit.connect(window._shutdown_log_index)
     window.resize(800, 600)
     window.show()
     app.exec()
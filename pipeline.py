@@ -0,0 +1,409 @@
+"""Multi-solver pipelines: stages with dependencies, run concurrently, skipped when up to date.
+
+A pipeline file is JSON::
+
+    {
+      "name": "reliability-chain",
+      "workdir": "pipeline_runs/reliability-chain",
+      "stages": [
+        {"name": "mapping", "solver": "MappingTool", "parameters": {"general": {...}},
+         "outputs": ["out/mapping/*.csv"]},
+        {"name": "thermal", "solver": "ThermalCycleCalc", "input": "thermal_input.json",
+         "depends_on": ["mapping"]},
+        {"name": "delam", "solver": "DelamAlert", "parameters_file": "delam_params.json",
+         "depends_on": ["thermal"]}
+      ]
+    }
+
+A stage's solver input comes from ``parameters`` (widget-shaped sections,
+as collected from the form) or ``parameters_file`` and is generated with
+``serialize_solver_payload``; alternatively ``input`` names an existing
+solver JSON that is used as is. Relative paths resolve against the
+pipeline file.
+
+Every stage gets a fingerprint over its solver input, the tool build, the
+``--param`` string and the fingerprints and declared ``outputs`` of the
+stages it depends on. A stage whose fingerprint matches its stamp from the
+last successful run, and whose outputs still exist unchanged, is skipped.
+Stages run in their own scratch directories (see ``scratch``); results are
+staged back to their ``OutputFolder`` before dependent stages start.
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+import json_io
+from execution_policy import SlotPlanner, SlotPool, policy_settings
+from json_store import atomic_write_text, canonical_digest, file_signature
+from run_logs import append_log_line, append_log_summary, default_log_dir, write_run_log
+from scratch import ScratchJob, scratch_root, stage_outputs
+from snapshot_store import SnapshotStore, store_for_logs
+from tool_runner import SOLVER_CODES, build_command, run_tool_process
+from tracing import span
+
+STAMP_SUFFIX = ".stamp"
+
+
+class PipelineError(ValueError):
+    """The pipeline definition is invalid."""
+
+
+class Stage(NamedTuple):
+    name: str
+    solver: str
+    depends_on: List[str]
+    parameters: Optional[Dict[str, Any]]
+    input_path: Optional[Path]
+    outputs: List[str]
+
+
+class StageResult(NamedTuple):
+    status: str  # "ran", "skipped", "failed" or "blocked"
+    return_code: Optional[int] = None
+    seconds: float = 0.0
+    log_path: Optional[Path] = None
+    message: str = ""
+
+
+class Pipeline:
+    def __init__(self, name: str, stages: List[Stage], base_dir: Path, workdir: Path):
+        self.name = name
+        self.stages = {stage.name: stage for stage in stages}
+        self.base_dir = base_dir
+        self.workdir = workdir
+        self.order = self._topological_order()
+
+    @classmethod
+    def load(cls, path) -> "Pipeline":
+        path = Path(path).expanduser().resolve()
+        try:
+            data = json_io.load_path(path)
+        except (OSError, json_io.JSONDecodeError) as exc:
+            raise PipelineError(f"Cannot read pipeline {path}: {exc}") from exc
+        if not isinstance(data, dict) or not isinstance(data.get("stages"), list):
+            raise PipelineError(f"{path} has no 'stages' list.")
+
+        base_dir = path.parent
+        name = str(data.get("name") or path.stem)
+        stages = []
+        for entry in data["stages"]:
+            if not isinstance(entry, dict) or not entry.get("name") or not entry.get("solver"):
+                raise PipelineError(f"Every stage needs a 'name' and a 'solver': {entry!r}")
+            solver = str(entry["solver"])
+            if solver not in SOLVER_CODES:
+                raise PipelineError(f"Stage '{entry['name']}': unknown solver '{solver}'.")
+            parameters = entry.get("parameters")
+            if entry.get("parameters_file"):
+                try:
+                    parameters = json_io.load_path(base_dir / entry["parameters_file"])
+                except (OSError, json_io.JSONDecodeError) as exc:
+                    raise PipelineError(f"Stage '{entry['name']}': {exc}") from exc
+            input_path = base_dir / entry["input"] if entry.get("input") else None
+            if parameters is None and input_path is None:
+                raise PipelineError(f"Stage '{entry['name']}' needs 'parameters', 'parameters_file' or 'input'.")
+            stages.append(Stage(
+                str(entry["name"]),
+                solver,
+                [str(dependency) for dependency in entry.get("depends_on") or []],
+                parameters,
+                input_path,
+                [str(pattern) for pattern in entry.get("outputs") or []],
+            ))
+
+        workdir = base_dir / (data.get("workdir") or f"pipeline_runs/{name}")
+        return cls(name, stages, base_dir, workdir)
+
+    def _topological_order(self) -> List[str]:
+        order: List[str] = []
+        state: Dict[str, str] = {}
+
+        def visit(name, trail):
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                raise PipelineError("Dependency cycle: " + " -> ".join(trail + [name]))
+            if name not in self.stages:
+                raise PipelineError(f"Stage '{trail[-1]}' depends on unknown stage '{name}'.")
+            state[name] = "visiting"
+            for dependency in self.stages[name].depends_on:
+                visit(dependency, trail + [name])
+            state[name] = "done"
+            order.append(name)
+
+        for name in self.stages:
+            visit(name, [])
+        return order
+
+    def stage_input(self, stage: Stage) -> Any:
+        if stage.input_path is not None:
+            return json_io.load_path(stage.input_path)
+        from ui.serializers import serialize_solver_payload
+
+        return serialize_solver_payload(stage.solver, stage.parameters)
+
+    def output_signatures(self, stage: Stage) -> Dict[str, Any]:
+        signatures = {}
+        for pattern in stage.outputs:
+            for path in sorted(glob.glob(os.fspath(self.base_dir / pattern), recursive=True)):
+                signatures[path] = file_signature(path)
+        return signatures
+
+    def stamp_path(self, stage: Stage) -> Path:
+        return self.workdir / f"{stage.name}{STAMP_SUFFIX}"
+
+    def read_stamp(self, stage: Stage) -> Dict[str, Any]:
+        try:
+            stamp = json_io.load_path(self.stamp_path(stage))
+        except (OSError, json_io.JSONDecodeError):
+            return {}
+        return stamp if isinstance(stamp, dict) else {}
+
+
+def _tool_identity(tool_path) -> List[Any]:
+    signature = file_signature(tool_path)
+    return [os.fspath(tool_path), list(signature) if signature else None]
+
+
+class PipelineRunner:
+    """Runs a ``Pipeline``, starting each stage as soon as its dependencies succeed."""
+
+    def __init__(self,
+                 pipeline: Pipeline,
+                 tool_path,
+                 parameter: str = "",
+                 max_workers: int = 1,
+                 snapshot_store: Optional[SnapshotStore] = None,
+                 on_event: Optional[Callable[[str, str], None]] = None,
+                 execution_policy: Optional[Dict[str, Any]] = None,
+                 scratch_dir: str = "",
+                 on_log_finished: Optional[Callable[[Path], None]] = None,
+                 log_dir=None):
+        self.pipeline = pipeline
+        self.tool_path = Path(tool_path).expanduser().absolute()
+        self.parameter = parameter
+        self.max_workers = max(1, max_workers)
+        self.snapshot_store = snapshot_store
+        self.on_event = on_event
+        self.slots = SlotPool(SlotPlanner(policy_settings(execution_policy, "batch"), self.max_workers))
+        self.scratch_root = scratch_root(scratch_dir)
+        self.log_dir = Path(log_dir) if log_dir is not None else default_log_dir()
+        self.on_log_finished = on_log_finished
+        self._fingerprints: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def _log_finished(self, log_path) -> None:
+        if log_path and self.on_log_finished is not None:
+            self.on_log_finished(log_path)
+
+    def _emit(self, stage_name: str, message: str) -> None:
+        if self.on_event is not None:
+            self.on_event(stage_name, message)
+
+    def fingerprint(self, stage: Stage, solver_input: Any) -> str:
+        upstream = {
+            name: [self._fingerprints.get(name), self.pipeline.output_signatures(self.pipeline.stages[name])]
+            for name in stage.depends_on
+        }
+        return canonical_digest({
+            "solver": stage.solver,
+            "input": solver_input,
+            "tool": _tool_identity(self.tool_path),
+            "parameter": self.parameter,
+            "upstream": upstream,
+        })
+
+    def is_up_to_date(self, stage: Stage, fingerprint: str) -> bool:
+        stamp = self.pipeline.read_stamp(stage)
+        if stamp.get("fingerprint") != fingerprint:
+            return False
+        outputs = self.pipeline.output_signatures(stage)
+        if stage.outputs and not outputs:
+            return False
+        recorded = {path: signature for path, signature in (stamp.get("outputs") or {}).items()}
+        return {path: list(signature) if signature else None for path, signature in outputs.items()} == recorded
+
+    def _run_stage(self, stage: Stage, force: bool) -> StageResult:
+        with span("pipeline.stage", stage=stage.name, solver=stage.solver):
+            try:
+                solver_input = self.pipeline.stage_input(stage)
+            except (OSError, json_io.JSONDecodeError, ValueError) as exc:
+                return StageResult("failed", message=f"Cannot build input: {exc}")
+
+            with self._lock:
+                fingerprint = self.fingerprint(stage, solver_input)
+            if not force and self.is_up_to_date(stage, fingerprint):
+                with self._lock:
+                    self._fingerprints[stage.name] = fingerprint
+                return StageResult("skipped", message="up to date")
+
+            workdir = self.pipeline.workdir
+            workdir.mkdir(parents=True, exist_ok=True)
+            # A stage that starts is out of date until it succeeds again.
+            try:
+                self.pipeline.stamp_path(stage).unlink()
+            except OSError:
+                pass
+            try:
+                scratch = ScratchJob(self.scratch_root, f"{self.pipeline.name}-{stage.name}")
+                _, scratch_outputs = scratch.prepare_input(solver_input, base_dir=self.pipeline.base_dir)
+            except (OSError, TypeError, ValueError) as exc:
+                return StageResult("failed", message=f"Cannot prepare scratch directory: {exc}")
+
+            command = build_command(self.tool_path, SOLVER_CODES[stage.solver], scratch.input_path, self.parameter)
+            log_path = write_run_log(
+                f"pipeline:{self.pipeline.name}/{stage.name}",
+                stage.solver,
+                self.tool_path,
+                stage.input_path or scratch.input_path,
+                command,
+                stage.parameters,
+                solver_input=solver_input,
+                snapshot_store=self.snapshot_store,
+                log_dir=scratch.path,
+            )
+            slot, policy = self.slots.acquire()
+            append_log_line(log_path, "POLICY", policy.describe())
+            started = time.perf_counter()
+            try:
+                result = run_tool_process(
+                    command,
+                    on_line=lambda label, line: append_log_line(log_path, label, line),
+                    capture=False,
+                    policy=policy,
+                    cwd=scratch.path,
+                )
+            except OSError as exc:
+                append_log_summary(log_path, "failed to launch")
+                log_path = scratch.move_log(log_path, self.log_dir)
+                self._log_finished(log_path)
+                scratch.cleanup()
+                return StageResult("failed", log_path=log_path, message=f"Failed to start tool: {exc}")
+            finally:
+                self.slots.release(slot)
+            elapsed = time.perf_counter() - started
+            append_log_summary(log_path, result.return_code, elapsed)
+            log_path = scratch.move_log(log_path, self.log_dir)
+            self._log_finished(log_path)
+            # Downstream stages read these results, so they are staged before the stage counts as done.
+            report = stage_outputs(scratch, scratch_outputs, log_path)
+            if result.return_code != 0:
+                return StageResult("failed", result.return_code, elapsed, log_path, f"exit code {result.return_code}")
+            if report.errors:
+                return StageResult("failed", result.return_code, elapsed, log_path,
+                                   f"staging failed for {len(report.errors)} file(s); results kept in {scratch.path}")
+
+            outputs = self.pipeline.output_signatures(stage)
+            stamp = {
+                "fingerprint": fingerprint,
+                "outputs": {path: list(signature) if signature else None for path, signature in outputs.items()},
+                "finished": time.time(),
+                "seconds": elapsed,
+            }
+            try:
+                atomic_write_text(self.pipeline.stamp_path(stage), json_io.dumps(stamp))
+            except OSError:
+                pass
+            with self._lock:
+                self._fingerprints[stage.name] = fingerprint
+            return StageResult("ran", result.return_code, elapsed, log_path)
+
+    def run(self, force: bool = False) -> Dict[str, StageResult]:
+        pipeline = self.pipeline
+        results: Dict[str, StageResult] = {}
+        remaining = list(pipeline.order)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            running = {}
+            while remaining or running:
+                for name in list(remaining):
+                    stage = pipeline.stages[name]
+                    dependency_results = [results.get(dependency) for dependency in stage.depends_on]
+                    if any(result is None for result in dependency_results):
+                        continue
+                    remaining.remove(name)
+                    failed = [dep for dep, result in zip(stage.depends_on, dependency_results)
+                              if result.status in ("failed", "blocked")]
+                    if failed:
+                        results[name] = StageResult("blocked", message=f"waiting on failed {', '.join(failed)}")
+                        self._emit(name, results[name].message)
+                        continue
+                    self._emit(name, "started")
+                    running[executor.submit(self._run_stage, stage, force)] = name
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        results[name] = future.result()
+                    except Exception as exc:
+                        results[name] = StageResult("failed", message=str(exc))
+                    result = results[name]
+                    self._emit(name, f"{result.status}" + (f" ({result.message})" if result.message else ""))
+        return results
+
+
+def format_results(pipeline: Pipeline, results: Dict[str, StageResult]) -> str:
+    lines = [f"Pipeline {pipeline.name}"]
+    for name in pipeline.order:
+        result = results.get(name)
+        if result is None:
+            continue
+        timing = f" in {result.seconds:.1f} s" if result.status == "ran" else ""
+        note = f" - {result.message}" if result.message else ""
+        lines.append(f"  {name:<20} {result.status}{timing}{note}")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    from config_manager import load_concurrency, load_execution_policy, load_parameter, load_scratch_dir, load_tool_path
+
+    parser = argparse.ArgumentParser(description="Run a multi-solver pipeline, skipping up-to-date stages.")
+    parser.add_argument("pipeline", help="Pipeline definition JSON.")
+    parser.add_argument("--tool", help="MDXICAdvancedTool executable (default: the configured tool path).")
+    parser.add_argument("--param", help="--param string for every stage (default: the configured one).")
+    parser.add_argument("--jobs", type=int, help="Stages to run at once (default: the configured concurrency).")
+    parser.add_argument("--force", action="store_true", help="Run every stage even if it is up to date.")
+    parser.add_argument("--dry-run", action="store_true", help="Only print the stage order.")
+    args = parser.parse_args()
+
+    try:
+        pipeline = Pipeline.load(args.pipeline)
+    except PipelineError as exc:
+        parser.error(str(exc))
+    if args.dry_run:
+        for name in pipeline.order:
+            stage = pipeline.stages[name]
+            after = f" (after {', '.join(stage.depends_on)})" if stage.depends_on else ""
+            print(f"{name}: {stage.solver}{after}")
+        return
+
+    tool_path = args.tool or load_tool_path()
+    if not tool_path:
+        parser.error("No tool executable configured; pass --tool.")
+    runner = PipelineRunner(
+        pipeline,
+        tool_path,
+        parameter=load_parameter() if args.param is None else args.param,
+        max_workers=args.jobs or load_concurrency(),
+        snapshot_store=store_for_logs(),
+        on_event=lambda name, message: print(f"[{name}] {message}", flush=True),
+        execution_policy=load_execution_policy(),
+        scratch_dir=load_scratch_dir(),
+    )
+    results = runner.run(force=args.force)
+    print(format_results(pipeline, results))
+    if any(result.status in ("failed", "blocked") for result in results.values()):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
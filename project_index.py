@@ -0,0 +1,190 @@
+"""Project-wide .run discovery and material catalog."""
+
+from __future__ import annotations
+
+import argparse
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import json_io
+from json_store import atomic_write_text
+from run_reader import run_reader
+
+INDEX_FILE_NAME = ".ICAdvRunIndex"
+INDEX_VERSION = 1
+
+
+def find_analysis_root(project_root) -> Path:
+    root = Path(project_root).expanduser()
+    try:
+        with os.scandir(root) as entries:
+            for entry in entries:
+                if entry.name.lower() == "analysis" and entry.is_dir():
+                    return Path(entry.path)
+    except OSError:
+        pass
+    return root
+
+
+def _scan_directory(directory: str) -> Tuple[List[str], List[str]]:
+    run_files: List[str] = []
+    subdirectories: List[str] = []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirectories.append(entry.path)
+                    elif entry.name.lower().endswith(".run") and entry.is_file():
+                        run_files.append(entry.path)
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return run_files, subdirectories
+
+
+def discover_run_files(root, max_workers: Optional[int] = None) -> List[str]:
+    """Walk ``root`` with one scan task per directory and return every .run path."""
+    found: List[str] = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {executor.submit(_scan_directory, os.fspath(root))}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                run_files, subdirectories = future.result()
+                found.extend(run_files)
+                for directory in subdirectories:
+                    pending.add(executor.submit(_scan_directory, directory))
+    return sorted(found)
+
+
+def _file_signature(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _parse_run(path: str) -> Dict[str, object]:
+    try:
+        return {"materials": run_reader(path)}
+    except Exception as exc:
+        return {"materials": [], "error": str(exc)}
+
+
+class MaterialIndex:
+    """Persistent run -> materials catalog with a derived material -> runs lookup."""
+
+    def __init__(self, runs: Optional[Dict[str, Dict[str, object]]] = None):
+        self.runs: Dict[str, Dict[str, object]] = dict(runs or {})
+        self._by_material: Dict[str, List[str]] = {}
+        self._rebuild_material_lookup()
+
+    def _rebuild_material_lookup(self) -> None:
+        lookup: Dict[str, List[str]] = {}
+        for run_path in sorted(self.runs):
+            for material in self.runs[run_path].get("materials", []):
+                runs = lookup.setdefault(material, [])
+                if not runs or runs[-1] != run_path:
+                    runs.append(run_path)
+        self._by_material = lookup
+
+    @classmethod
+    def load(cls, index_path) -> "MaterialIndex":
+        try:
+            data = json_io.load_path(index_path)
+        except (OSError, json_io.JSONDecodeError):
+            return cls()
+        if not isinstance(data, dict) or data.get("version") != INDEX_VERSION:
+            return cls()
+        runs = data.get("runs")
+        return cls(runs if isinstance(runs, dict) else {})
+
+    def save(self, index_path) -> None:
+        payload = {"version": INDEX_VERSION, "runs": self.runs}
+        try:
+            atomic_write_text(index_path, json_io.dumps(payload, compact=True))
+        except OSError:
+            pass
+
+    def update(self, run_paths: Iterable[str], max_workers: Optional[int] = None) -> List[str]:
+        """Re-parse new or modified runs concurrently and drop vanished ones.
+
+        Returns the run paths that were (re)parsed.
+        """
+        signatures = {}
+        for path in run_paths:
+            signature = _file_signature(path)
+            if signature is not None:
+                signatures[path] = signature
+
+        stale = []
+        for path, (size, mtime_ns) in signatures.items():
+            entry = self.runs.get(path)
+            if not entry or entry.get("size") != size or entry.get("mtime_ns") != mtime_ns:
+                stale.append(path)
+
+        for path in list(self.runs):
+            if path not in signatures:
+                del self.runs[path]
+
+        if stale:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for path, parsed in zip(stale, executor.map(_parse_run, stale)):
+                    size, mtime_ns = signatures[path]
+                    parsed.update({"size": size, "mtime_ns": mtime_ns})
+                    self.runs[path] = parsed
+
+        self._rebuild_material_lookup()
+        return stale
+
+    def materials_for(self, run_path) -> List[str]:
+        entry = self.runs.get(os.fspath(run_path)) or {}
+        return list(entry.get("materials", []))
+
+    def runs_using(self, material_name: str) -> List[str]:
+        return list(self._by_material.get(material_name, []))
+
+    def material_names(self) -> List[str]:
+        return sorted(self._by_material)
+
+    def errors(self) -> Dict[str, str]:
+        return {path: entry["error"] for path, entry in self.runs.items() if entry.get("error")}
+
+
+def scan_project(project_root,
+                 index_path=None,
+                 max_workers: Optional[int] = None) -> MaterialIndex:
+    root = Path(project_root).expanduser()
+    if index_path is None:
+        index_path = root / INDEX_FILE_NAME
+    index = MaterialIndex.load(index_path)
+    run_paths = discover_run_files(find_analysis_root(root), max_workers=max_workers)
+    index.update(run_paths, max_workers=max_workers)
+    index.save(index_path)
+    return index
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Index the materials used by every .run in a project.")
+    parser.add_argument("project_root", help="Project folder (the one containing Analysis/).")
+    parser.add_argument("--material", help="List the runs that use this material.")
+    parser.add_argument("--workers", type=int, default=None, help="Thread count for scanning and parsing.")
+    args = parser.parse_args()
+
+    index = scan_project(args.project_root, max_workers=args.workers)
+    if args.material:
+        for run_path in index.runs_using(args.material):
+            print(run_path)
+        return
+    print(f"Indexed {len(index.runs)} run files, {len(index.material_names())} distinct materials.")
+    for run_path, error in sorted(index.errors().items()):
+        print(f"  ! {run_path}: {error}")
+
+
+if __name__ == "__main__":
+    main()
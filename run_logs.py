@@ -0,0 +1,265 @@
+"""Run log files: a compact JSON header followed by timestamped tool output.
+
+Headers reference the solver input and UI parameters by snapshot digest
+(see ``snapshot_store``) instead of embedding full copies. Logs live in the
+log folder (the ``log_dir`` setting, else ``$ICADV_LOG_DIR``, else
+``run_logs`` next to the application, like the project config file);
+``log_store`` gzips finished ones, and every reader here
+accepts ``run_log_*.log.gz`` as well.
+"""
+
+from __future__ import annotations
+
+import gzip
+import os
+import shlex
+import subprocess
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+import json_io
+from snapshot_store import SnapshotStore
+
+APP_DIR = Path(__file__).resolve().parent
+DEFAULT_LOG_DIR = APP_DIR / "run_logs"
+LOG_DIR_ENV = "ICADV_LOG_DIR"
+LOG_GLOB = "run_log_*.log"
+COMPRESSED_SUFFIX = ".gz"
+OUTPUT_MARKER = "=== Command Output ==="
+SUMMARY_MARKER = "\n=== Summary ==="
+SUMMARY_TAIL_BYTES = 4096
+SNAPSHOT_KEYS = ("parameters_sha256", "solver_input_sha256")
+
+
+def format_command(command_parts: List[str]) -> str:
+    if os.name == "nt":
+        return subprocess.list2cmdline(command_parts)
+    if hasattr(shlex, "join"):
+        return shlex.join(command_parts)
+    return " ".join(shlex.quote(part) for part in command_parts)
+
+
+def log_root(configured: str = "") -> Path:
+    """The configured log folder, ``$ICADV_LOG_DIR``, or ``run_logs`` next to the application.
+
+    A relative ``log_dir`` setting is taken relative to the application folder.
+    """
+    configured = configured.strip()
+    if configured:
+        path = Path(configured).expanduser()
+        return path if path.is_absolute() else APP_DIR / path
+    text = os.environ.get(LOG_DIR_ENV, "").strip()
+    return Path(text).expanduser() if text else DEFAULT_LOG_DIR
+
+
+def default_log_dir() -> Path:
+    """The log folder of the active config profile."""
+    from config_manager import load_log_dir
+
+    return log_root(load_log_dir())
+
+
+def compressed_path(log_path) -> Path:
+    log_path = Path(log_path)
+    return log_path.with_name(log_path.name + COMPRESSED_SUFFIX)
+
+
+def log_exists(log_path) -> bool:
+    """Whether ``log_path`` exists, plain or compressed."""
+    return Path(log_path).exists() or compressed_path(log_path).exists()
+
+
+def unused_log_path(log_dir, name: str) -> Path:
+    """``log_dir / name``, or a numbered variant if a log of that name exists."""
+    log_dir = Path(log_dir)
+    target = log_dir / name
+    stem, dot, suffix = name.partition(".")
+    counter = 1
+    while log_exists(target):
+        counter += 1
+        target = log_dir / f"{stem}_{counter}{dot}{suffix}"
+    return target
+
+
+def open_log(log_path):
+    """Open a run log for reading as text, whether or not it is gzipped."""
+    if str(log_path).endswith(COMPRESSED_SUFFIX):
+        return gzip.open(log_path, "rt", encoding="utf-8", errors="replace")
+    return open(log_path, "r", encoding="utf-8", errors="replace")
+
+
+def _new_log_path(log_dir: Path, now: datetime) -> Path:
+    return unused_log_path(log_dir, f"run_log_{now.strftime('%Y%m%d_%H%M%S')}.log")
+
+
+def _store_snapshot(header: Dict[str, Any], key: str, inline_key: str, payload: Any, store: Optional[SnapshotStore]) -> None:
+    if payload is None:
+        return
+    if store is not None:
+        try:
+            header[key] = store.put(payload)
+            return
+        except OSError:
+            pass
+    # Without a usable store the log stays self-contained.
+    header[inline_key] = payload
+
+
+def write_run_log(solver_name: str,
+                  selected_solver: str,
+                  tool_path,
+                  output_path,
+                  command: List[str],
+                  parameters: Any,
+                  solver_input: Any = None,
+                  snapshot_store: Optional[SnapshotStore] = None,
+                  log_dir=None) -> Optional[Path]:
+    """Create a new run log and write its header; returns ``None`` if it cannot be written."""
+    now = datetime.now()
+    log_dir = Path(log_dir) if log_dir is not None else default_log_dir()
+    try:
+        log_dir.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        return None
+    log_path = _new_log_path(log_dir, now)
+
+    header: Dict[str, Any] = {
+        "timestamp": now.isoformat(),
+        "ui_solver": solver_name,
+        "run_solver": selected_solver,
+        "tool_path": os.fspath(tool_path),
+        "output_path": os.fspath(output_path),
+        "command": command,
+        "command_line": format_command(command),
+    }
+    _store_snapshot(header, "parameters_sha256", "parameters", parameters, snapshot_store)
+    _store_snapshot(header, "solver_input_sha256", "solver_input", solver_input, snapshot_store)
+
+    try:
+        with open(log_path, "w", encoding="utf-8") as handle:
+            handle.write(json_io.dumps(header, compact=True))
+            handle.write(f"\n\n{OUTPUT_MARKER}\n")
+    except OSError:
+        return None
+    return log_path
+
+
+def append_log_line(log_path, label: str, message: str) -> None:
+    if not log_path:
+        return
+    timestamp = datetime.now().isoformat()
+    try:
+        with open(log_path, "a", encoding="utf-8") as handle:
+            handle.write(f"[{timestamp}] {label}: {message}\n")
+    except OSError:
+        pass
+
+
+def append_log_summary(log_path, return_code, wall_seconds: Optional[float] = None) -> None:
+    if not log_path:
+        return
+    summary_lines = [
+        SUMMARY_MARKER,
+        f"Completed at: {datetime.now().isoformat()}",
+        f"Exit code: {return_code}",
+    ]
+    if wall_seconds is not None:
+        summary_lines.append(f"Wall time: {wall_seconds:.3f} s")
+    try:
+        with open(log_path, "a", encoding="utf-8") as handle:
+            handle.write("\n".join(summary_lines) + "\n")
+    except OSError:
+        pass
+
+
+def read_log_header(log_path) -> Optional[Dict[str, Any]]:
+    """Parse the JSON header of a run log without reading the tool output."""
+    lines = []
+    try:
+        with open_log(log_path) as handle:
+            for line in handle:
+                if line.strip() == OUTPUT_MARKER:
+                    break
+                lines.append(line)
+    except (OSError, EOFError):
+        return None
+    try:
+        header = json_io.loads("".join(lines).strip() or "null")
+    except json_io.JSONDecodeError:
+        return None
+    return header if isinstance(header, dict) else None
+
+
+def read_log_summary(log_path) -> Optional[Dict[str, Any]]:
+    """Parse the summary at the end of a run log; ``None`` if the run never finished."""
+    try:
+        tail = _read_tail(log_path)
+    except (OSError, EOFError):
+        return None
+    _, found, summary_text = tail.rpartition(SUMMARY_MARKER.strip())
+    if not found:
+        return None
+    summary: Dict[str, Any] = {}
+    for line in summary_text.splitlines():
+        label, _, value = line.partition(": ")
+        value = value.strip()
+        if label == "Completed at":
+            summary["completed"] = value
+        elif label == "Exit code":
+            summary["exit_code"] = int(value) if value.lstrip("-").isdigit() else value
+        elif label == "Wall time":
+            try:
+                summary["wall_seconds"] = float(value.split()[0])
+            except (IndexError, ValueError):
+                pass
+    return summary
+
+
+def _read_tail(log_path) -> str:
+    if str(log_path).endswith(COMPRESSED_SUFFIX):
+        # gzip cannot seek from the end; decompress and keep the last block.
+        tail = b""
+        with gzip.open(log_path, "rb") as handle:
+            for chunk in iter(lambda: handle.read(1 << 20), b""):
+                tail = (tail + chunk)[-SUMMARY_TAIL_BYTES:]
+    else:
+        with open(log_path, "rb") as handle:
+            handle.seek(0, os.SEEK_END)
+            handle.seek(max(0, handle.tell() - SUMMARY_TAIL_BYTES))
+            tail = handle.read()
+    return tail.decode("utf-8", errors="replace")
+
+
+def iter_log_paths(log_dir=None) -> Iterator[Path]:
+    """Run logs in ``log_dir``, oldest name first; a compressed log counts once."""
+    log_dir = Path(log_dir) if log_dir is not None else default_log_dir()
+    plain = set(log_dir.glob(LOG_GLOB))
+    # A .gz beside its plain log is a compression that did not finish.
+    compressed = {path for path in log_dir.glob(LOG_GLOB + COMPRESSED_SUFFIX)
+                  if path.with_name(path.name[: -len(COMPRESSED_SUFFIX)]) not in plain}
+    return iter(sorted(plain | compressed))
+
+
+def referenced_snapshots(log_dir=None) -> Set[str]:
+    referenced: Set[str] = set()
+    for log_path in iter_log_paths(log_dir):
+        header = read_log_header(log_path) or {}
+        for key in SNAPSHOT_KEYS:
+            digest = header.get(key)
+            if isinstance(digest, str):
+                referenced.add(digest)
+    return referenced
+
+
+def load_log_inputs(log_path, snapshot_store: SnapshotStore) -> Dict[str, Any]:
+    """Return the log header with ``parameters``/``solver_input`` resolved from the store."""
+    header = dict(read_log_header(log_path) or {})
+    for key, inline_key in zip(SNAPSHOT_KEYS, ("parameters", "solver_input")):
+        digest = header.get(key)
+        if inline_key not in header and isinstance(digest, str):
+            try:
+                header[inline_key] = snapshot_store.get(digest)
+            except (OSError, EOFError, json_io.JSONDecodeError):
+                pass
+    return header
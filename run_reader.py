@@ -1,12 +1,25 @@
+def _normalize(line):
+    return line.strip().replace(' ', '').replace('\t', '')
+
+
 def run_reader(run_file_dir):
     material_names = []
     with open(run_file_dir, 'r', encoding='utf-8') as f:
-        lines = [line.strip().replace(' ','').replace('\t', '') for line in f.readlines()]
+        # Stream up to the [MATERIAL] block instead of loading the whole file:
+        # .run files can carry large unrelated sections before it.
+        for line in f:
+            if _normalize(line) == "[MATERIAL]":
+                break
+        else:
+            raise ValueError("'[MATERIAL]' section not found in run file")
+
+        count_line = _normalize(next(f, ''))
+        material_count = int(count_line.split('=')[1])
 
-        material_index = lines.index("[MATERIAL]")
-        material_count = int(lines[material_index+1].split('=')[1])
-        
-        for i in range(material_index+2, material_index+2+material_count):
-            material_names.append(lines[i].split('=')[1])
+        for _ in range(material_count):
+            line = next(f, None)
+            if line is None:
+                raise IndexError("run file ended before all materials were listed")
+            material_names.append(_normalize(line).split('=')[1])
 
     return material_names
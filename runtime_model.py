@@ -0,0 +1,269 @@
+"""Predict MDXICAdvancedTool runtimes from the run logs of earlier runs.
+
+Every successful run log contributes one sample: the run solver, the wall
+time and a few size features taken from its solver input (see
+``extract_features``). ``RuntimeModel.fit`` fits a small ridge regression
+per solver on those features; with too few samples it falls back to the
+median runtime of the solver, and then of all solvers.
+
+    python -m runtime_model [--logs DIR] [--store DIR] [input.json ...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import json_io
+from run_logs import iter_log_paths, load_log_inputs, read_log_summary
+from snapshot_store import SnapshotStore, store_for_logs
+
+FEATURES = ("materials", "process_time", "ramp_length")
+RIDGE = 1e-3
+MAX_SAMPLES_PER_SOLVER = 500
+
+
+class Sample(NamedTuple):
+    solver: str
+    features: Dict[str, float]
+    seconds: float
+
+
+class Estimate(NamedTuple):
+    seconds: float
+    method: str  # "regression", "median" or "overall median"
+    samples: int
+
+
+def _number(value: Any) -> Optional[float]:
+    try:
+        return float(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+
+
+def _collect_features(node: Any, features: Dict[str, float]) -> None:
+    if isinstance(node, list):
+        for item in node:
+            _collect_features(item, features)
+        return
+    if not isinstance(node, dict):
+        return
+    for key, value in node.items():
+        folded = str(key).lower().replace(" ", "")
+        if folded == "materials" and isinstance(value, list):
+            features["materials"] += len(value)
+        elif folded.startswith("processtime("):
+            number = _number(value)
+            if number is not None:
+                features["process_time"] = max(features["process_time"], number)
+        elif folded == "pressurerampprofile":
+            # Solver JSON keeps one list per column; widget parameters keep a list of rows.
+            if isinstance(value, dict):
+                lengths = [len(column) for column in value.values() if isinstance(column, list)]
+                features["ramp_length"] = max(lengths or [0])
+            elif isinstance(value, list):
+                features["ramp_length"] = len(value)
+            continue
+        _collect_features(value, features)
+
+
+def extract_features(solver_input: Any, parameters: Any = None) -> Dict[str, float]:
+    """Size features of a run: material count, process time (s) and pressure ramp length."""
+    features = dict.fromkeys(FEATURES, 0.0)
+    _collect_features(solver_input if solver_input is not None else parameters, features)
+    return features
+
+
+def _log_seconds(header: Dict[str, Any], summary: Dict[str, Any]) -> Optional[float]:
+    if isinstance(summary.get("wall_seconds"), float):
+        return summary["wall_seconds"]
+    # Logs written before wall times were recorded.
+    try:
+        started = datetime.fromisoformat(header["timestamp"])
+        completed = datetime.fromisoformat(summary["completed"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    return (completed - started).total_seconds()
+
+
+def iter_samples(log_dir=None, snapshot_store: Optional[SnapshotStore] = None) -> Iterator[Sample]:
+    """Samples from successful runs, newest first."""
+    store = snapshot_store or store_for_logs(log_dir)
+    features_by_digest: Dict[str, Dict[str, float]] = {}
+    for log_path in reversed(list(iter_log_paths(log_dir))):
+        summary = read_log_summary(log_path)
+        if not summary or summary.get("exit_code") != 0:
+            continue
+        header = load_log_inputs(log_path, store)
+        solver = header.get("run_solver")
+        seconds = _log_seconds(header, summary)
+        if not solver or seconds is None or seconds < 0:
+            continue
+        digest = header.get("solver_input_sha256")
+        features = features_by_digest.get(digest) if isinstance(digest, str) else None
+        if features is None:
+            features = extract_features(header.get("solver_input"), header.get("parameters"))
+            if isinstance(digest, str):
+                features_by_digest[digest] = features
+        yield Sample(solver, features, seconds)
+
+
+def _solve(matrix: List[List[float]], vector: List[float]) -> Optional[List[float]]:
+    # Gaussian elimination with partial pivoting; the systems here are at most 4x4.
+    size = len(vector)
+    rows = [row[:] + [value] for row, value in zip(matrix, vector)]
+    for column in range(size):
+        pivot = max(range(column, size), key=lambda index: abs(rows[index][column]))
+        if abs(rows[pivot][column]) < 1e-12:
+            return None
+        rows[column], rows[pivot] = rows[pivot], rows[column]
+        for index in range(column + 1, size):
+            factor = rows[index][column] / rows[column][column]
+            for position in range(column, size + 1):
+                rows[index][position] -= factor * rows[column][position]
+    solution = [0.0] * size
+    for index in reversed(range(size)):
+        total = rows[index][size] - sum(rows[index][position] * solution[position] for position in range(index + 1, size))
+        solution[index] = total / rows[index][index]
+    return solution
+
+
+class _SolverFit:
+    """Ridge regression on standardized features, plus the median as a fallback."""
+
+    def __init__(self, samples: List[Sample]):
+        self.samples = len(samples)
+        self.median = statistics.median(sample.seconds for sample in samples)
+        self.features: List[str] = []
+        self.scales: List[Tuple[float, float]] = []
+        self.coefficients: Optional[List[float]] = None
+
+        for name in FEATURES:
+            values = [sample.features.get(name, 0.0) for sample in samples]
+            if len(set(values)) > 1:
+                self.features.append(name)
+                self.scales.append((statistics.fmean(values), statistics.pstdev(values)))
+        if not self.features or self.samples < len(self.features) + 2:
+            return
+
+        rows = [[1.0] + self._scaled(sample.features) for sample in samples]
+        targets = [sample.seconds for sample in samples]
+        width = len(rows[0])
+        normal = [[sum(row[i] * row[j] for row in rows) for j in range(width)] for i in range(width)]
+        for index in range(1, width):
+            normal[index][index] += RIDGE * self.samples
+        moments = [sum(row[i] * target for row, target in zip(rows, targets)) for i in range(width)]
+        self.coefficients = _solve(normal, moments)
+
+    def _scaled(self, features: Dict[str, float]) -> List[float]:
+        return [
+            (features.get(name, 0.0) - mean) / deviation
+            for name, (mean, deviation) in zip(self.features, self.scales)
+        ]
+
+    def predict(self, features: Dict[str, float]) -> Estimate:
+        if self.coefficients is not None:
+            terms = [1.0] + self._scaled(features)
+            seconds = sum(weight * term for weight, term in zip(self.coefficients, terms))
+            if seconds > 0:
+                return Estimate(seconds, "regression", self.samples)
+        return Estimate(self.median, "median", self.samples)
+
+
+class RuntimeModel:
+    def __init__(self, samples: Optional[List[Sample]] = None):
+        self._fits: Dict[str, _SolverFit] = {}
+        self._overall: Optional[float] = None
+        if samples:
+            self._build(samples)
+
+    @classmethod
+    def fit(cls,
+            log_dir=None,
+            snapshot_store: Optional[SnapshotStore] = None,
+            max_samples_per_solver: int = MAX_SAMPLES_PER_SOLVER) -> "RuntimeModel":
+        """Fit on the most recent successful runs in ``log_dir``."""
+        samples: List[Sample] = []
+        counts: Dict[str, int] = {}
+        for sample in iter_samples(log_dir, snapshot_store):
+            if counts.get(sample.solver, 0) < max_samples_per_solver:
+                counts[sample.solver] = counts.get(sample.solver, 0) + 1
+                samples.append(sample)
+        return cls(samples)
+
+    def _build(self, samples: List[Sample]) -> None:
+        by_solver: Dict[str, List[Sample]] = {}
+        for sample in samples:
+            by_solver.setdefault(sample.solver, []).append(sample)
+        self._fits = {solver: _SolverFit(group) for solver, group in by_solver.items()}
+        self._overall = statistics.median(sample.seconds for sample in samples)
+
+    def solvers(self) -> List[str]:
+        return sorted(self._fits)
+
+    def predict(self, solver: str, features: Dict[str, float]) -> Optional[Estimate]:
+        """Predicted wall time for a run; ``None`` when no run has been logged yet."""
+        fit = self._fits.get(solver)
+        if fit is not None:
+            return fit.predict(features)
+        if self._overall is not None:
+            return Estimate(self._overall, "overall median", 0)
+        return None
+
+    def predict_input(self, solver: str, solver_input: Any) -> Optional[Estimate]:
+        return self.predict(solver, extract_features(solver_input))
+
+    def describe(self) -> str:
+        if not self._fits:
+            return "No successful runs logged yet."
+        lines = []
+        for solver in self.solvers():
+            fit = self._fits[solver]
+            if fit.coefficients is not None:
+                detail = "regression on " + ", ".join(fit.features)
+            else:
+                detail = "median only"
+            lines.append(f"{solver:<18} {fit.samples:>5} runs, median {format_duration(fit.median)}, {detail}")
+        return "\n".join(lines)
+
+
+def format_duration(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "unknown"
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds} s"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes}m {seconds:02d}s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes:02d}m"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fit runtime estimates from the run logs.")
+    parser.add_argument("inputs", nargs="*", help="Solver input JSON files to predict.")
+    parser.add_argument("--solver", help="Run solver for the inputs (MappingTool, PressureOven, ...).")
+    parser.add_argument("--logs", help="Folder containing the run logs (default: the configured one).")
+    args = parser.parse_args()
+
+    model = RuntimeModel.fit(args.logs, store_for_logs(args.logs))
+    print(model.describe())
+    if args.inputs and not args.solver:
+        parser.error("--solver is required to predict inputs.")
+    for path in args.inputs:
+        try:
+            solver_input = json_io.load_path(path)
+        except (OSError, json_io.JSONDecodeError) as exc:
+            print(f"{path}: cannot read ({exc})")
+            continue
+        estimate = model.predict_input(args.solver, solver_input)
+        detail = f" ({estimate.method})" if estimate else ""
+        print(f"{path}: {format_duration(estimate.seconds if estimate else None)}{detail}")
+
+
+if __name__ == "__main__":
+    main()
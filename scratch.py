@@ -0,0 +1,251 @@
+"""Per-job scratch directories on fast local storage, with results staged back afterwards.
+
+Every run gets its own directory under the scratch root (the ``scratch_dir``
+setting, else ``$ICADV_SCRATCH``, else ``<tmp>/icadv-scratch``; point it at
+tmpfs or local NVMe). The solver input and run log are written there and
+the tool runs with it as working directory. ``OutputFolder`` entries in the
+solver input are redirected into the scratch directory; ``ResultStager``
+later copies those results to the real folders on a background thread,
+verifying each copy by SHA-256, and removes the scratch directory once
+everything has arrived.
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+
+import json_io
+from json_store import atomic_write_text
+from run_logs import append_log_line, referenced_snapshots, unused_log_path
+
+SCRATCH_ENV = "ICADV_SCRATCH"
+INPUT_NAME = "input.json"
+OUTPUTS_DIR = "outputs"
+COPY_CHUNK_BYTES = 1 << 20
+STAGING_WORKERS = 2
+STAGING_ATTEMPTS = 2
+
+
+def scratch_root(configured: str = "") -> Path:
+    """The configured scratch root, ``$ICADV_SCRATCH``, or a folder in the system temp dir."""
+    text = (configured or os.environ.get(SCRATCH_ENV, "")).strip()
+    if text:
+        return Path(text).expanduser()
+    return Path(tempfile.gettempdir()) / "icadv-scratch"
+
+
+def in_flight_snapshots(root) -> Set[str]:
+    """Snapshot digests referenced by the logs of runs still in their scratch directories."""
+    referenced: Set[str] = set()
+    try:
+        job_dirs = [path for path in Path(root).iterdir() if path.is_dir()]
+    except OSError:
+        return referenced
+    for job_dir in job_dirs:
+        referenced |= referenced_snapshots(job_dir)
+    return referenced
+
+
+def _is_output_folder_key(key: Any) -> bool:
+    return str(key).replace(" ", "").lower() == "outputfolder"
+
+
+class ScratchJob:
+    """An isolated working directory for one tool run."""
+
+    def __init__(self, root, name: str):
+        root = Path(root)
+        root.mkdir(parents=True, exist_ok=True)
+        prefix = re.sub(r"[^A-Za-z0-9_.-]+", "_", name).strip("_") or "job"
+        self.path = Path(tempfile.mkdtemp(prefix=f"{prefix}-", dir=root))
+        self.input_path = self.path / INPUT_NAME
+
+    def prepare_input(self, solver_input: Any, base_dir=None) -> Tuple[Any, Dict[Path, Path]]:
+        """Write ``solver_input`` with every ``OutputFolder`` moved into scratch.
+
+        Returns the written payload and ``{scratch folder: final folder}``.
+        Relative output folders resolve against ``base_dir`` (default: the
+        current directory).
+        """
+        base_dir = Path(base_dir) if base_dir is not None else Path.cwd()
+        payload = copy.deepcopy(solver_input)
+        outputs: Dict[Path, Path] = {}
+        redirected: Dict[Path, Path] = {}
+
+        def redirect(node):
+            if isinstance(node, list):
+                for item in node:
+                    redirect(item)
+            elif isinstance(node, dict):
+                for key, value in node.items():
+                    if _is_output_folder_key(key) and isinstance(value, str) and value.strip():
+                        final = Path(value.strip()).expanduser()
+                        if not final.is_absolute():
+                            final = base_dir / final
+                        scratch_folder = redirected.get(final)
+                        if scratch_folder is None:
+                            scratch_folder = self.path / OUTPUTS_DIR / str(len(redirected))
+                            scratch_folder.mkdir(parents=True, exist_ok=True)
+                            redirected[final] = scratch_folder
+                            outputs[scratch_folder] = final
+                        node[key] = os.fspath(scratch_folder)
+                    else:
+                        redirect(value)
+
+        redirect(payload)
+        atomic_write_text(self.input_path, json_io.dumps(payload))
+        return payload, outputs
+
+    def move_log(self, log_path, log_dir) -> Optional[Path]:
+        """Move a run log out of scratch into ``log_dir`` without overwriting another log."""
+        if not log_path:
+            return None
+        log_path = Path(log_path)
+        target = unused_log_path(log_dir, log_path.name)
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.move(os.fspath(log_path), os.fspath(target))
+        except OSError:
+            return log_path
+        return target
+
+    def cleanup(self) -> None:
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+class StagingReport(NamedTuple):
+    files: int
+    bytes: int
+    seconds: float
+    checksums: Dict[str, str]  # final path -> sha256
+    errors: List[str]
+    scratch_path: Path
+
+
+def _copy_hashing(source: Path, destination: Path) -> str:
+    digest = hashlib.sha256()
+    with open(source, "rb") as reader, open(destination, "wb") as writer:
+        while True:
+            chunk = reader.read(COPY_CHUNK_BYTES)
+            if not chunk:
+                break
+            digest.update(chunk)
+            writer.write(chunk)
+        writer.flush()
+        os.fsync(writer.fileno())
+    return digest.hexdigest()
+
+
+def _hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(COPY_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def stage_file(source: Path, destination: Path, attempts: int = STAGING_ATTEMPTS) -> str:
+    """Copy ``source`` over ``destination`` atomically and verify it; returns the SHA-256.
+
+    Raises ``OSError`` if the copy cannot be made or never matches.
+    """
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    partial = destination.with_name(f".{destination.name}.staging")
+    for _ in range(attempts):
+        try:
+            expected = _copy_hashing(source, partial)
+            if _hash_file(partial) == expected:
+                try:
+                    shutil.copystat(source, partial)
+                except OSError:
+                    pass
+                os.replace(partial, destination)
+                return expected
+        finally:
+            if partial.exists():
+                try:
+                    partial.unlink()
+                except OSError:
+                    pass
+    raise OSError(f"checksum mismatch copying {source} to {destination}")
+
+
+def stage_outputs(job: ScratchJob, outputs: Dict[Path, Path], log_path=None, cleanup: bool = True) -> StagingReport:
+    """Copy every file under the scratch output folders to their final folders."""
+    started = time.perf_counter()
+    checksums: Dict[str, str] = {}
+    errors: List[str] = []
+    total_bytes = 0
+    for scratch_folder, final_folder in outputs.items():
+        for directory, _, names in os.walk(scratch_folder):
+            for name in sorted(names):
+                source = Path(directory) / name
+                destination = final_folder / source.relative_to(scratch_folder)
+                try:
+                    checksum = stage_file(source, destination)
+                except OSError as exc:
+                    errors.append(f"{destination}: {exc}")
+                    append_log_line(log_path, "STAGING", f"failed {destination}: {exc}")
+                    continue
+                checksums[os.fspath(destination)] = checksum
+                total_bytes += source.stat().st_size
+                append_log_line(log_path, "STAGED", f"{destination} sha256={checksum}")
+
+    seconds = time.perf_counter() - started
+    if errors:
+        append_log_line(log_path, "STAGING", f"{len(errors)} file(s) failed; results kept in {job.path}")
+    else:
+        append_log_line(log_path, "STAGING", f"{len(checksums)} file(s), {total_bytes} bytes in {seconds:.2f} s")
+        if cleanup:
+            job.cleanup()
+    return StagingReport(len(checksums), total_bytes, seconds, checksums, errors, job.path)
+
+
+def _staging_outcome(future: "Future[StagingReport]", job: ScratchJob, log_path) -> StagingReport:
+    """The report of a finished staging, or one carrying the error that stopped it."""
+    exc = future.exception()
+    if exc is None:
+        return future.result()
+    if log_path is not None:
+        append_log_line(log_path, "STAGING", f"failed: {exc}; results kept in {job.path}")
+    return StagingReport(0, 0, 0.0, {}, [f"staging failed: {exc}"], job.path)
+
+
+class ResultStager:
+    """Stages finished jobs' results in the background."""
+
+    def __init__(self, max_workers: int = STAGING_WORKERS):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="staging")
+        self._pending: List[Future] = []
+        self._lock = threading.Lock()
+
+    def submit(self,
+               job: ScratchJob,
+               outputs: Dict[Path, Path],
+               log_path=None,
+               on_done: Optional[Callable[[StagingReport], None]] = None) -> "Future[StagingReport]":
+        future = self._executor.submit(stage_outputs, job, outputs, log_path)
+        with self._lock:
+            self._pending = [pending for pending in self._pending if not pending.done()]
+            self._pending.append(future)
+        if on_done is not None:
+            future.add_done_callback(lambda done: on_done(_staging_outcome(done, job, log_path)))
+        return future
+
+    def pending(self) -> int:
+        with self._lock:
+            return sum(1 for future in self._pending if not future.done())
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Finish (or with ``wait=False`` abandon) outstanding staging."""
+        self._executor.shutdown(wait=wait)
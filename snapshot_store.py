@@ -0,0 +1,136 @@
+"""Content-addressed, gzip-compressed store for solver inputs and parameter sets.
+
+Snapshots are addressed by the SHA-256 of their canonical JSON (sorted
+keys, compact), so identical payloads are stored once no matter how many
+run logs reference them. Every log folder keeps its own store in a
+``snapshots`` subfolder, so collecting the garbage of one profile's logs
+never removes what another profile's logs reference.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import os
+import time
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List
+
+import json_io
+from json_store import atomic_write_bytes, canonical_digest
+
+SNAPSHOT_DIR_NAME = "snapshots"
+# The single store that earlier versions shared between every log folder.
+LEGACY_SNAPSHOT_DIR = Path(__file__).resolve().parent / "run_snapshots"
+SNAPSHOT_SUFFIX = ".json.gz"
+# Snapshots younger than this are never collected: a run may have stored
+# its input but not yet written the log that references it.
+GC_GRACE_SECONDS = 3600
+
+
+class SnapshotStore:
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def path_for(self, digest: str) -> Path:
+        return self.root / digest[:2] / f"{digest}{SNAPSHOT_SUFFIX}"
+
+    def put(self, payload: Any) -> str:
+        digest = canonical_digest(payload)
+        target = self.path_for(digest)
+        if target.exists():
+            # A new reference restarts the GC grace period of a deduplicated snapshot.
+            try:
+                os.utime(target)
+                return digest
+            except OSError:
+                pass
+        target.parent.mkdir(parents=True, exist_ok=True)
+        encoded = json_io.dumps(payload, compact=True).encode("utf-8")
+        atomic_write_bytes(target, gzip.compress(encoded, compresslevel=6))
+        return digest
+
+    def get(self, digest: str) -> Any:
+        with gzip.open(self.path_for(digest), "rb") as handle:
+            return json_io.loads(handle.read())
+
+    def contains(self, digest: str) -> bool:
+        return self.path_for(digest).exists()
+
+    def copy_from(self, other: "SnapshotStore", digests: Iterable[str]) -> int:
+        """Copy the ``digests`` that ``other`` has and this store lacks; returns how many."""
+        copied = 0
+        for digest in digests:
+            source, target = other.path_for(digest), self.path_for(digest)
+            if target.exists() or not source.exists():
+                continue
+            try:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                atomic_write_bytes(target, source.read_bytes())
+            except OSError:
+                continue
+            copied += 1
+        return copied
+
+    def digests(self) -> Iterator[str]:
+        if not self.root.is_dir():
+            return
+        for bucket in self.root.iterdir():
+            if not bucket.is_dir():
+                continue
+            for entry in bucket.iterdir():
+                if entry.name.endswith(SNAPSHOT_SUFFIX):
+                    yield entry.name[: -len(SNAPSHOT_SUFFIX)]
+
+    def collect_garbage(self, referenced: Iterable[str], grace_seconds: float = GC_GRACE_SECONDS) -> List[str]:
+        """Delete snapshots not in ``referenced``; returns the removed digests."""
+        keep = set(referenced)
+        cutoff = time.time() - grace_seconds
+        removed = []
+        for digest in list(self.digests()):
+            if digest in keep:
+                continue
+            path = self.path_for(digest)
+            try:
+                if path.stat().st_mtime > cutoff:
+                    continue
+                path.unlink()
+            except OSError:
+                continue
+            removed.append(digest)
+            try:
+                path.parent.rmdir()
+            except OSError:
+                pass
+        return removed
+
+
+def store_for_logs(log_dir=None) -> SnapshotStore:
+    """The store of the run logs in ``log_dir`` (default: the configured log folder)."""
+    from run_logs import default_log_dir
+
+    root = Path(log_dir) if log_dir is not None else default_log_dir()
+    return SnapshotStore(root / SNAPSHOT_DIR_NAME)
+
+
+def main() -> None:
+    from config_manager import load_scratch_dir
+    from run_logs import default_log_dir, referenced_snapshots
+    from scratch import in_flight_snapshots, scratch_root
+
+    parser = argparse.ArgumentParser(description="Remove snapshots no run log references.")
+    parser.add_argument("--logs", help="Log folder whose snapshots to clean up (default: the configured one).")
+    parser.add_argument("--scratch", help="Scratch root of runs in progress (default: the configured one).")
+    parser.add_argument("--grace", type=float, default=GC_GRACE_SECONDS, help="Keep snapshots newer than this (s).")
+    args = parser.parse_args()
+
+    # Only the log folder's own store: other folders' logs reference theirs.
+    log_dir = Path(args.logs) if args.logs else default_log_dir()
+    store = store_for_logs(log_dir)
+    referenced = referenced_snapshots(log_dir) | in_flight_snapshots(scratch_root(args.scratch or load_scratch_dir()))
+    removed = store.collect_garbage(referenced, grace_seconds=args.grace)
+    print(f"Removed {len(removed)} unreferenced snapshot(s).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+"""Deterministic generators for large test inputs.
+
+Everything here is seeded, so the same arguments always produce the same
+bytes, and the file writers stream in bounded chunks so multi-GB fixtures
+need only a few MB of memory:
+
+* ``write_run_file`` - .run files as read by ``run_reader``, with large
+  unrelated sections before ``[MATERIAL]``;
+* ``make_reliability_parameters`` / ``write_reliability_payload`` -
+  widget-shaped ReliabilityTools parameters and the solver JSON that
+  ``format_materials`` produces from them;
+* ``make_pressure_oven_parameters`` / ``write_history_csv`` - PressureOven
+  inputs and pressure/radius histories as read by ``load_columns``.
+
+    python -m synthetic_inputs run big.run --materials 10000 --padding-mb 2048
+    python -m synthetic_inputs history history.csv --rows 10000000
+    python -m synthetic_inputs payload payload.json --materials 10000 --all-models
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import random
+from typing import Any, Dict, Iterator, List, Optional
+
+import json_io
+
+CHUNK_BYTES = 1 << 20
+HISTORY_HEADER = "time_seconds,R_microns,P_Pa\n"
+DEFAULT_RUN_FILE = "/projects/demo/Analysis/Run12/demo_project12.run"
+
+
+def _write_chunked(path, lines: Iterator[str], chunk_bytes: int = CHUNK_BYTES) -> int:
+    written = 0
+    with open(path, "w", encoding="utf-8", newline="") as handle:
+        buffer: List[str] = []
+        buffered = 0
+        for line in lines:
+            buffer.append(line)
+            buffered += len(line)
+            if buffered >= chunk_bytes:
+                handle.write("".join(buffer))
+                written += buffered
+                buffer.clear()
+                buffered = 0
+        if buffer:
+            handle.write("".join(buffer))
+            written += buffered
+    return written
+
+
+def material_name(index: int) -> str:
+    return f"Material_{index:05d}"
+
+
+def iter_run_file_lines(material_count: int, padding_bytes: int = 0, seed: int = 0) -> Iterator[str]:
+    """Lines of a .run file whose ``[MATERIAL]`` block follows ``padding_bytes`` of mesh data."""
+    rng = random.Random(seed)
+    yield "[GENERAL]\n"
+    yield "Version = 12\n"
+    yield f"Seed = {seed}\n\n"
+
+    produced = 0
+    sections = ("[NODES]\n", "[ELEMENTS]\n")
+    section = 0
+    node = 0
+    while produced < padding_bytes:
+        header = sections[section % len(sections)]
+        section += 1
+        yield header
+        produced += len(header)
+        # Alternate sections roughly every 64 MB so the file looks like a real mesh dump.
+        section_end = min(padding_bytes, produced + (64 << 20))
+        while produced < section_end:
+            node += 1
+            if header == "[NODES]\n":
+                line = f"{node} = {rng.uniform(-1, 1):.6f}, {rng.uniform(-1, 1):.6f}, {rng.uniform(-1, 1):.6f}\n"
+            else:
+                line = f"{node} = {rng.randint(1, node)}, {rng.randint(1, node)}, {rng.randint(1, node)}, {rng.randint(1, node)}\n"
+            yield line
+            produced += len(line)
+        yield "\n"
+
+    yield "[MATERIAL]\n"
+    yield f"Count = {material_count}\n"
+    for index in range(material_count):
+        yield f"Material{index + 1} = {material_name(index)}\n"
+    yield "\n[RESULTS]\n"
+    yield "Steps = 10\n"
+
+
+def write_run_file(path, material_count: int = 10000, padding_bytes: int = 0, seed: int = 0) -> int:
+    """Write a .run file; returns the number of characters written."""
+    return _write_chunked(path, iter_run_file_lines(material_count, padding_bytes, seed))
+
+
+def model_parameter_fields() -> Dict[str, List[str]]:
+    """``{model name: [parameter names]}`` from the ReliabilityTools Materials schema."""
+    from ui.constants import STRUCTURE_DEFINITION
+    from ui.schema import load_structure
+
+    _, solver_defs = load_structure(STRUCTURE_DEFINITION)
+    materials = next(
+        field for field in solver_defs["ReliabilityTools"]["source"] if field["Name"] == "Materials"
+    )
+    parameters = next(col for col in materials["columns"] if col["Name"] == "Parameters")
+    return {group["Name"]: [field["Name"] for field in group["fields"]] for group in parameters["fields"]}
+
+
+def _material_row(index: int, rng: random.Random, models: Dict[str, List[str]], all_models: bool) -> Dict[str, Any]:
+    model_names = sorted(models)
+    chosen = model_names if all_models else rng.sample(model_names, rng.randint(1, min(2, len(model_names))))
+    entries = [
+        {
+            "Model": {
+                "Name": model_name,
+                "Parameters": [
+                    {name: rng.choice([rng.randint(1, 500000), rng.uniform(0.01, 1e4)])}
+                    for name in models[model_name]
+                ],
+            }
+        }
+        for model_name in chosen
+    ]
+    row: Dict[str, Any] = {"Name": material_name(index)}
+    if len(entries) == 1:
+        row["Model"] = entries[0]["Model"]
+    else:
+        row["Models"] = entries
+    return row
+
+
+def iter_material_rows(material_count: int, seed: int = 0, all_models: bool = False) -> Iterator[Dict[str, Any]]:
+    """Widget-shaped Materials rows; ``all_models`` populates every model on every material."""
+    rng = random.Random(seed)
+    models = model_parameter_fields()
+    for index in range(material_count):
+        yield _material_row(index, rng, models, all_models)
+
+
+def make_reliability_parameters(material_count: int,
+                                seed: int = 0,
+                                all_models: bool = False,
+                                run_file: str = DEFAULT_RUN_FILE) -> Dict[str, Any]:
+    """Widget-shaped ReliabilityTools parameters with ``material_count`` materials."""
+    return {
+        "source": {
+            "RunFile": run_file,
+            "Materials": list(iter_material_rows(material_count, seed, all_models)),
+        }
+    }
+
+
+def write_reliability_payload(path,
+                              material_count: int = 10000,
+                              seed: int = 0,
+                              all_models: bool = False,
+                              run_file: str = DEFAULT_RUN_FILE) -> int:
+    """Write compact ReliabilityTools solver JSON one material at a time."""
+    from ui.formatters import format_materials
+    from ui.serializers import serialize_solver_payload
+
+    marker = "\u0000materials\u0000"
+    head = serialize_solver_payload("ReliabilityTools", {"source": {"RunFile": run_file, "Materials": []}})
+    head["ReliabilityTools"]["Source"]["Materials"] = marker
+    prefix, suffix = json_io.dumps(head, compact=True).split(json_io.dumps(marker, compact=True))
+
+    def lines():
+        yield prefix + "["
+        separator = ""
+        for row in iter_material_rows(material_count, seed, all_models):
+            for material in format_materials([row]):
+                yield separator + json_io.dumps(material, compact=True)
+                separator = ","
+        yield "]" + suffix + "\n"
+
+    return _write_chunked(path, lines())
+
+
+def make_pressure_oven_parameters(ramp_rows: int, seed: int = 0, output_folder: str = "/tmp/po_output") -> Dict[str, Any]:
+    rng = random.Random(seed)
+    return {
+        "general": {"OutputFolder": output_folder, "Void shape (Cylindrical/Spherical)": "Spherical"},
+        "material properties": {"Henry's coef. (mol N^-1 m^-1)": 1.2e-5, "Surface tension coef. (N m^-1)": 0.03},
+        "process conditions": {"Working temperature (K)": 423, "Process time (s)": 3600},
+        "pressure ramp profile": {
+            "Pressure Ramp Profile": [
+                {"Pressure increment (Pa)": rng.randint(100, 5000), "Time mark (s)": float(row * 10)}
+                for row in range(ramp_rows)
+            ]
+        },
+    }
+
+
+def iter_history_lines(rows: int, seed: int = 0, time_step: float = 0.5) -> Iterator[str]:
+    rng = random.Random(seed)
+    yield HISTORY_HEADER
+    for row in range(rows):
+        t = row * time_step
+        radius = 50.0 * math.exp(-t / 3600.0) + rng.uniform(-0.01, 0.01)
+        pressure = 101325.0 + 2.0e5 * (1 - math.exp(-t / 600.0))
+        yield f"{t:.3f},{radius:.6f},{pressure:.3f}\n"
+
+
+def write_history_csv(path, rows: int, seed: int = 0) -> int:
+    return _write_chunked(path, iter_history_lines(rows, seed))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Write deterministic large test inputs.")
+    subparsers = parser.add_subparsers(dest="kind", required=True)
+
+    run = subparsers.add_parser("run", help=".run file for run_reader")
+    run.add_argument("path")
+    run.add_argument("--materials", type=int, default=10000)
+    run.add_argument("--padding-mb", type=float, default=0, help="Size of the sections before [MATERIAL].")
+
+    history = subparsers.add_parser("history", help="pressure_radius_history.csv for load_columns")
+    history.add_argument("path")
+    history.add_argument("--rows", type=int, default=10 ** 7)
+
+    payload = subparsers.add_parser("payload", help="ReliabilityTools solver JSON")
+    payload.add_argument("path")
+    payload.add_argument("--materials", type=int, default=10000)
+    payload.add_argument("--all-models", action="store_true", help="Populate every model on every material.")
+
+    for subparser in (run, history, payload):
+        subparser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.kind == "run":
+        written = write_run_file(args.path, args.materials, int(args.padding_mb * (1 << 20)), args.seed)
+    elif args.kind == "history":
+        written = write_history_csv(args.path, args.rows, args.seed)
+    else:
+        written = write_reliability_payload(args.path, args.materials, args.seed, args.all_models)
+    print(f"Wrote {written} characters to {args.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""Named MDXICAdvancedTool builds and side-by-side benchmarks of them."""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import os
+import statistics
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import json_io
+from json_store import atomic_write_text, file_signature
+from tool_runner import SOLVER_CODES, ToolRun, build_command, run_tool_process
+
+REGISTRY_PATH = Path(__file__).resolve().parent / ".ICAdvTools"
+REGISTRY_VERSION = 1
+# A build is flagged when it is this much slower or hungrier than the baseline.
+REGRESSION_TOLERANCE = 0.05
+
+
+def hash_file(path, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ToolRegistry:
+    """Persistent ``name -> executable`` catalog plus the latest benchmark per solver."""
+
+    def __init__(self, path=REGISTRY_PATH):
+        self.path = Path(path)
+        self.tools: Dict[str, Dict[str, Any]] = {}
+        self.benchmarks: Dict[str, Dict[str, Any]] = {}
+        self.load()
+
+    def load(self) -> None:
+        try:
+            data = json_io.load_path(self.path)
+        except (OSError, json_io.JSONDecodeError, UnicodeDecodeError):
+            data = {}
+        if not isinstance(data, dict) or data.get("version") != REGISTRY_VERSION:
+            data = {}
+        self.tools = dict(data.get("tools") or {})
+        self.benchmarks = dict(data.get("benchmarks") or {})
+
+    def save(self) -> None:
+        payload = {"version": REGISTRY_VERSION, "tools": self.tools, "benchmarks": self.benchmarks}
+        try:
+            atomic_write_text(self.path, json_io.dumps(payload))
+        except OSError:
+            pass
+
+    def register(self, name: str, tool_path) -> Dict[str, Any]:
+        """Add or replace ``name``; raises ``OSError`` if the executable cannot be read."""
+        resolved = Path(tool_path).expanduser().resolve()
+        size, mtime_ns = file_signature(resolved) or (None, None)
+        entry = {
+            "path": os.fspath(resolved),
+            "sha256": hash_file(resolved),
+            "size": size,
+            "mtime_ns": mtime_ns,
+            "registered": datetime.now().isoformat(timespec="seconds"),
+        }
+        self.tools[name] = entry
+        self.save()
+        return entry
+
+    def remove(self, name: str) -> None:
+        if self.tools.pop(name, None) is not None:
+            self.save()
+
+    def names(self) -> List[str]:
+        return sorted(self.tools)
+
+    def changed_tools(self, names: Optional[Iterable[str]] = None) -> Dict[str, str]:
+        """Return ``{name: reason}`` for builds that are missing or no longer match their hash.
+
+        Executables are only re-hashed when their size or mtime changed.
+        """
+        changed = {}
+        for name in names or self.names():
+            entry = self.tools.get(name)
+            if entry is None:
+                changed[name] = "not registered"
+                continue
+            signature = file_signature(entry["path"])
+            if signature is None:
+                changed[name] = f"missing: {entry['path']}"
+            elif list(signature) != [entry.get("size"), entry.get("mtime_ns")]:
+                try:
+                    if hash_file(entry["path"]) != entry.get("sha256"):
+                        changed[name] = "executable changed since it was registered"
+                except OSError as exc:
+                    changed[name] = str(exc)
+        return changed
+
+    def record_benchmark(self, solver: str, results: Dict[str, Dict[str, Any]]) -> None:
+        self.benchmarks.setdefault(solver, {}).update(results)
+        self.save()
+
+
+def summarize_runs(runs: List[ToolRun]) -> Dict[str, Any]:
+    succeeded = [run for run in runs if run.return_code == 0]
+    cpu = [run.cpu_seconds for run in succeeded if run.cpu_seconds is not None]
+    rss = [run.peak_rss_bytes for run in succeeded if run.peak_rss_bytes is not None]
+    return {
+        "runs": len(runs),
+        "failures": len(runs) - len(succeeded),
+        "wall_seconds": statistics.median(run.wall_seconds for run in succeeded) if succeeded else None,
+        "wall_seconds_all": [round(run.wall_seconds, 6) for run in runs],
+        "cpu_seconds": statistics.median(cpu) if cpu else None,
+        "peak_rss_bytes": max(rss) if rss else None,
+        "measured": datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+def benchmark_tools(registry: ToolRegistry,
+                    names: List[str],
+                    solver: str,
+                    input_path,
+                    parameter: str = "",
+                    repeat: int = 3,
+                    warmup: int = 1,
+                    on_progress: Optional[Callable[[str, int, ToolRun], None]] = None) -> Dict[str, Dict[str, Any]]:
+    """Run the same input through every build ``repeat`` times and summarize each.
+
+    Builds are interleaved round-robin so drift in machine load affects all
+    of them alike. Warm-up runs are not measured.
+    """
+    solver_code = SOLVER_CODES.get(solver, solver)
+    solver = next((name for name, code in SOLVER_CODES.items() if code == solver), solver)
+    input_sha256 = hash_file(input_path)
+    commands = {
+        name: build_command(registry.tools[name]["path"], solver_code, input_path, parameter)
+        for name in names
+    }
+    runs: Dict[str, List[ToolRun]] = {name: [] for name in names}
+
+    for iteration in range(warmup + repeat):
+        for name in names:
+            run = run_tool_process(commands[name], capture=False)
+            if iteration >= warmup:
+                runs[name].append(run)
+            if on_progress is not None:
+                on_progress(name, iteration - warmup, run)
+
+    results = {}
+    for name in names:
+        summary = summarize_runs(runs[name])
+        summary.update({"sha256": registry.tools[name].get("sha256"), "input_sha256": input_sha256})
+        results[name] = summary
+    registry.record_benchmark(solver, results)
+    return results
+
+
+def _ratio(value, reference) -> Optional[float]:
+    if not value or not reference:
+        return None
+    return value / reference
+
+
+def compare_results(results: Dict[str, Dict[str, Any]],
+                    baseline: str,
+                    tolerance: float = REGRESSION_TOLERANCE) -> List[Dict[str, Any]]:
+    reference = results.get(baseline, {})
+    rows = []
+    for name, summary in sorted(results.items()):
+        wall_ratio = _ratio(summary.get("wall_seconds"), reference.get("wall_seconds"))
+        memory_ratio = _ratio(summary.get("peak_rss_bytes"), reference.get("peak_rss_bytes"))
+        regressions = []
+        if summary.get("failures"):
+            regressions.append(f"{summary['failures']} failed run(s)")
+        if wall_ratio is not None and wall_ratio > 1 + tolerance:
+            regressions.append(f"{(wall_ratio - 1) * 100:.1f}% slower")
+        if memory_ratio is not None and memory_ratio > 1 + tolerance:
+            regressions.append(f"{(memory_ratio - 1) * 100:.1f}% more memory")
+        rows.append({
+            "tool": name,
+            "speedup": 1 / wall_ratio if wall_ratio else None,
+            "memory_ratio": memory_ratio,
+            "regressions": regressions,
+            **summary,
+        })
+    return rows
+
+
+def _format_optional(value, pattern: str) -> str:
+    return "-" if value is None else pattern.format(value)
+
+
+def format_report(solver: str, results: Dict[str, Dict[str, Any]], baseline: str) -> str:
+    lines = [
+        f"Solver {solver}, baseline '{baseline}'",
+        f"{'Tool':<20} {'Wall (s)':>10} {'CPU (s)':>10} {'Peak MB':>10} {'Speedup':>8}  Notes",
+    ]
+    for row in compare_results(results, baseline):
+        peak_mb = row["peak_rss_bytes"] / (1024 * 1024) if row["peak_rss_bytes"] else None
+        lines.append(
+            f"{row['tool']:<20} "
+            f"{_format_optional(row['wall_seconds'], '{:.3f}'):>10} "
+            f"{_format_optional(row['cpu_seconds'], '{:.3f}'):>10} "
+            f"{_format_optional(peak_mb, '{:.1f}'):>10} "
+            f"{_format_optional(row['speedup'], '{:.2f}x'):>8}  "
+            + ("; ".join(row["regressions"]) or "ok")
+        )
+    return "\n".join(lines)
+
+
+def format_registry_report(registry: ToolRegistry, baseline: Optional[str] = None) -> str:
+    """Latest benchmark of every solver, one table each."""
+    sections = []
+    for solver, results in sorted(registry.benchmarks.items()):
+        solver_baseline = baseline if baseline in results else sorted(results)[0]
+        sections.append(format_report(solver, results, solver_baseline))
+    return "\n\n".join(sections) or "No benchmarks recorded."
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Register MDXICAdvancedTool builds and compare their performance.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    register = subparsers.add_parser("register", help="Add or replace a named build.")
+    register.add_argument("name")
+    register.add_argument("path")
+
+    subparsers.add_parser("list", help="List registered builds.")
+
+    bench = subparsers.add_parser("bench", help="Benchmark builds on one solver input.")
+    bench.add_argument("--solver", required=True, help="Solver name or code (e.g. PressureOven or po).")
+    bench.add_argument("-i", "--input", required=True, help="Solver input JSON.")
+    bench.add_argument("--param", default="", help="Extra --param string passed to every build.")
+    bench.add_argument("--tools", nargs="*", help="Builds to compare (default: all).")
+    bench.add_argument("--baseline", help="Build the others are compared with (default: first).")
+    bench.add_argument("--repeat", type=int, default=3)
+    bench.add_argument("--warmup", type=int, default=1)
+
+    report = subparsers.add_parser("report", help="Show the latest stored benchmarks.")
+    report.add_argument("--baseline")
+
+    args = parser.parse_args()
+    registry = ToolRegistry()
+
+    if args.command == "register":
+        entry = registry.register(args.name, args.path)
+        print(f"{args.name}: {entry['path']} ({entry['sha256'][:12]})")
+    elif args.command == "list":
+        changed = registry.changed_tools()
+        for name in registry.names():
+            entry = registry.tools[name]
+            note = f"  ! {changed[name]}" if name in changed else ""
+            print(f"{name:<20} {entry['sha256'][:12]}  {entry['path']}{note}")
+    elif args.command == "bench":
+        names = args.tools or registry.names()
+        changed = registry.changed_tools(names)
+        if changed:
+            parser.error("; ".join(f"{name}: {reason}" for name, reason in changed.items()))
+        results = benchmark_tools(
+            registry, names, args.solver, args.input, args.param, repeat=args.repeat, warmup=args.warmup
+        )
+        print(format_report(args.solver, results, args.baseline or names[0]))
+    else:
+        print(format_registry_report(registry, args.baseline))
+
+
+if __name__ == "__main__":
+    main()
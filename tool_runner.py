@@ -0,0 +1,180 @@
+"""Launching MDXICAdvancedTool and measuring what a run costs."""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import threading
+import time
+from typing import Callable, List, NamedTuple, Optional
+
+from execution_policy import ExecutionPolicy
+from tracing import span
+
+try:
+    import psutil  # type: ignore[import]
+except ImportError:  # pragma: no cover - optional dependency
+    psutil = None
+
+SOLVER_CODES = {
+    "MappingTool": "mt",
+    "ThermalCycleCalc": "tc",
+    "DelamAlert": "da",
+    "PressureOven": "po",
+}
+_PSUTIL_SAMPLE_SECONDS = 0.05
+
+
+class ToolRun(NamedTuple):
+    return_code: int
+    stdout: str
+    stderr: str
+    wall_seconds: float
+    cpu_seconds: Optional[float]
+    peak_rss_bytes: Optional[int]
+
+
+def build_command(tool_path, solver_code: str, input_path, parameter: str = "") -> List[str]:
+    command = [
+        os.fspath(tool_path),
+        "--solver",
+        solver_code,
+        "-i",
+        os.fspath(input_path),
+    ]
+    if parameter:
+        command.append("--param")
+        command.append(parameter)
+    return command
+
+
+def _maxrss_bytes(maxrss: int) -> int:
+    # Linux reports kilobytes, macOS bytes.
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+class _PsutilSampler:
+    """Polls a child's RSS and CPU times where ``os.wait4`` is unavailable."""
+
+    def __init__(self, pid: int):
+        self.peak_rss: Optional[int] = None
+        self.cpu_seconds: Optional[float] = None
+        self._stop = threading.Event()
+        try:
+            self._process = psutil.Process(pid)
+        except psutil.Error:
+            self._process = None
+            return
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+
+    def _sample(self) -> None:
+        while True:
+            try:
+                with self._process.oneshot():
+                    memory = self._process.memory_info()
+                    cpu = self._process.cpu_times()
+            except psutil.Error:
+                return
+            rss = getattr(memory, "peak_wset", None) or memory.rss
+            self.peak_rss = max(self.peak_rss or 0, rss)
+            self.cpu_seconds = cpu.user + cpu.system
+            if self._stop.wait(_PSUTIL_SAMPLE_SECONDS):
+                return
+
+    def stop(self) -> None:
+        if self._process is not None:
+            self._stop.set()
+            self._thread.join()
+
+
+def _reap(process: subprocess.Popen):
+    """Wait for ``process``; returns ``(return_code, cpu_seconds, peak_rss_bytes)``."""
+    if hasattr(os, "wait4"):
+        try:
+            _, status, usage = os.wait4(process.pid, 0)
+        except ChildProcessError:
+            return process.wait(), None, None
+        return_code = os.waitstatus_to_exitcode(status)
+        process.returncode = return_code
+        return return_code, usage.ru_utime + usage.ru_stime, _maxrss_bytes(usage.ru_maxrss)
+    return process.wait(), None, None
+
+
+def run_tool_process(command: List[str],
+                     on_line: Optional[Callable[[str, str], None]] = None,
+                     capture: bool = True,
+                     on_start: Optional[Callable[[int], None]] = None,
+                     policy: Optional[ExecutionPolicy] = None,
+                     cwd=None) -> ToolRun:
+    """Run ``command`` to completion, streaming each output line to ``on_line(label, line)``.
+
+    ``on_start(pid)`` is called once the process has been spawned. ``policy``
+    sets the CPUs, priority and environment of the process; ``cwd`` its
+    working directory.
+
+    Raises ``OSError`` if the executable cannot be started.
+    """
+    stdout_lines: List[str] = []
+    stderr_lines: List[str] = []
+
+    options = {}
+    after_start = None
+    if policy is not None:
+        command, options, after_start = policy.launch_options(command)
+
+    started = time.perf_counter()
+    with span("process.spawn"):
+        process = subprocess.Popen(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+            cwd=cwd,
+            **options,
+        )
+    if after_start is not None:
+        after_start(process.pid)
+    sampler = _PsutilSampler(process.pid) if psutil is not None and not hasattr(os, "wait4") else None
+    if on_start is not None:
+        on_start(process.pid)
+
+    def reader(stream, label, collector):
+        try:
+            for line in iter(stream.readline, ""):
+                if capture:
+                    collector.append(line)
+                if on_line is not None:
+                    on_line(label, line.rstrip("\n"))
+        finally:
+            stream.close()
+
+    threads = []
+    for stream, label, collector in (
+        (process.stdout, "STDOUT", stdout_lines),
+        (process.stderr, "STDERR", stderr_lines),
+    ):
+        if stream:
+            thread = threading.Thread(target=reader, args=(stream, label, collector), daemon=True)
+            thread.start()
+            threads.append(thread)
+
+    with span("process.run"):
+        for thread in threads:
+            thread.join()
+        return_code, cpu_seconds, peak_rss = _reap(process)
+    wall_seconds = time.perf_counter() - started
+    if sampler is not None:
+        sampler.stop()
+        cpu_seconds, peak_rss = sampler.cpu_seconds, sampler.peak_rss
+
+    return ToolRun(
+        return_code,
+        "".join(stdout_lines),
+        "".join(stderr_lines),
+        wall_seconds,
+        cpu_seconds,
+        peak_rss,
+    )
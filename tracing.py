@@ -0,0 +1,142 @@
+"""Lightweight span tracing with Chrome trace-event export.
+
+Spans are recorded only while the tracer is enabled; a disabled tracer
+hands out a shared no-op context manager. Set ``ICADV_TRACE=1`` to enable
+tracing at startup, or ``ICADV_TRACE=<path.json>`` to also write the trace
+there on exit. The file opens in ``chrome://tracing`` or Perfetto.
+
+The outermost span on a thread is an *operation*; the last
+``max_operations`` operations are kept with their nested spans.
+"""
+
+from __future__ import annotations
+
+import atexit
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, Deque, Dict, List
+
+import json_io
+from json_store import atomic_write_text
+
+TRACE_ENV = "ICADV_TRACE"
+DEFAULT_MAX_OPERATIONS = 50
+_NO_SPAN = nullcontext()
+
+
+class Span:
+    __slots__ = ("name", "start", "duration", "thread_id", "args", "children")
+
+    def __init__(self, name: str, start: float, thread_id: int, args: Dict[str, Any]):
+        self.name = name
+        self.start = start
+        self.duration = 0.0
+        self.thread_id = thread_id
+        self.args = args
+        self.children: List["Span"] = []
+
+    def walk(self, depth: int = 0):
+        yield depth, self
+        for child in self.children:
+            yield from child.walk(depth + 1)
+
+
+class Tracer:
+    def __init__(self, enabled: bool = False, max_operations: int = DEFAULT_MAX_OPERATIONS):
+        self.enabled = enabled
+        self.max_operations = max_operations
+        self._operations: Deque[Span] = deque(maxlen=max_operations)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._listeners: List[Callable[[Span], None]] = []
+        self._origin = time.perf_counter()
+
+    def set_enabled(self, enabled: bool) -> None:
+        self.enabled = enabled
+
+    def add_listener(self, callback: Callable[[Span], None]) -> None:
+        """Call ``callback(operation)`` whenever an operation finishes (on the tracing thread)."""
+        self._listeners.append(callback)
+
+    def span(self, name: str, **args):
+        if not self.enabled:
+            return _NO_SPAN
+        return self._record(name, args)
+
+    @contextmanager
+    def _record(self, name: str, args: Dict[str, Any]):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        span = Span(name, time.perf_counter(), threading.get_ident(), args)
+        if stack:
+            stack[-1].children.append(span)
+        stack.append(span)
+        try:
+            yield span
+        finally:
+            span.duration = time.perf_counter() - span.start
+            stack.pop()
+            if not stack:
+                with self._lock:
+                    self._operations.append(span)
+                for listener in list(self._listeners):
+                    listener(span)
+
+    def operations(self) -> List[Span]:
+        with self._lock:
+            return list(self._operations)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._operations.clear()
+
+    def trace_events(self) -> List[Dict[str, Any]]:
+        pid = os.getpid()
+        events = []
+        for operation in self.operations():
+            for _, span in operation.walk():
+                events.append({
+                    "name": span.name,
+                    "ph": "X",
+                    "ts": round((span.start - self._origin) * 1e6, 3),
+                    "dur": round(span.duration * 1e6, 3),
+                    "pid": pid,
+                    "tid": span.thread_id,
+                    "args": {key: str(value) for key, value in span.args.items()},
+                })
+        return events
+
+    def export_chrome_trace(self, path) -> int:
+        """Write the kept operations as Chrome trace-event JSON; returns the event count."""
+        events = self.trace_events()
+        atomic_write_text(path, json_io.dumps({"traceEvents": events, "displayTimeUnit": "ms"}, compact=True))
+        return len(events)
+
+
+def _tracer_from_environment() -> Tracer:
+    setting = os.environ.get(TRACE_ENV, "").strip()
+    enabled = setting.lower() not in ("", "0", "false", "no", "off")
+    instance = Tracer(enabled=enabled)
+    if enabled and setting.lower().endswith(".json"):
+        def export_on_exit(path=setting):
+            try:
+                instance.export_chrome_trace(path)
+            except OSError:
+                pass
+
+        atexit.register(export_on_exit)
+    return instance
+
+
+tracer = _tracer_from_environment()
+span = tracer.span
+
+
+def format_operation(operation: Span) -> str:
+    return "\n".join(
+        f"{'  ' * depth}{item.name}: {item.duration * 1000:.2f} ms" for depth, item in operation.walk()
+    )
@@ -0,0 +1,35 @@
+import threading
+
+from PySide6 import QtCore
+
+
+class BackgroundTask(QtCore.QObject):
+    """Run a callable on a worker thread and report back on the UI thread.
+
+    ``progress`` may be emitted from the callable through the ``report``
+    argument it receives.
+    """
+
+    finished = QtCore.Signal(object)
+    failed = QtCore.Signal(str)
+    progress = QtCore.Signal(str)
+
+    def __init__(self, function, parent=None):
+        super().__init__(parent)
+        self._function = function
+        self._thread = None
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        try:
+            result = self._function(self.progress.emit)
+        except Exception as exc:
+            self.failed.emit(str(exc))
+            return
+        self.finished.emit(result)
@@ -0,0 +1,241 @@
+import os
+
+from PySide6 import QtCore, QtWidgets
+
+from adaptive_concurrency import controller_from_config
+from batch import BATCH_EVENT, ORDERS, BatchRunner, format_plan, make_jobs, order_jobs, predicted_seconds, simulate_makespan
+from runtime_model import RuntimeModel, format_duration
+from tool_runner import SOLVER_CODES
+from ui.background import BackgroundTask
+
+ORDER_LABELS = {"longest": "Longest first", "shortest": "Shortest first", "listed": "As listed"}
+
+
+class BatchDialog(QtWidgets.QDialog):
+    """Queue solver inputs, preview predicted runtimes and run them as one batch."""
+
+    # Job events arrive on worker threads; the signal queues them to the UI thread.
+    _jobEvent = QtCore.Signal(str, str)
+
+    def __init__(self, tool_path, parameter, concurrency, snapshot_store, solver="", start_dir="",
+                 adaptive_settings=None, execution_policy=None, scratch_dir="", on_log_finished=None, base_dir=None,
+                 parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Run Batch")
+        self.tool_path = tool_path
+        self.parameter = parameter
+        self.snapshot_store = snapshot_store
+        self.adaptive_settings = adaptive_settings or {}
+        self.execution_policy = execution_policy
+        self.scratch_dir = scratch_dir
+        self.on_log_finished = on_log_finished
+        self.base_dir = base_dir
+        self.start_dir = os.fspath(start_dir)
+        self.model = None
+        self.jobs = []
+        self._task = None
+        self._model_task = None
+        self._statuses = {}
+
+        layout = QtWidgets.QVBoxLayout(self)
+        options = QtWidgets.QHBoxLayout()
+        self.solver_combo = QtWidgets.QComboBox(self)
+        self.solver_combo.addItems(list(SOLVER_CODES))
+        if solver in SOLVER_CODES:
+            self.solver_combo.setCurrentText(solver)
+        self.order_combo = QtWidgets.QComboBox(self)
+        for order in ORDERS:
+            self.order_combo.addItem(ORDER_LABELS[order], order)
+        self.workers_spin = QtWidgets.QSpinBox(self)
+        self.workers_spin.setRange(1, max(1, os.cpu_count() or 1) * 4)
+        self.workers_spin.setValue(max(1, concurrency))
+        for label, widget in (("Solver:", self.solver_combo), ("Order:", self.order_combo), ("Parallel:", self.workers_spin)):
+            options.addWidget(QtWidgets.QLabel(label, self))
+            options.addWidget(widget)
+        self.adaptive_check = QtWidgets.QCheckBox("Adapt to load", self)
+        self.adaptive_check.setToolTip(
+            "Start with the parallel count above, then run more or fewer tools as CPU load and free memory allow."
+        )
+        self.adaptive_check.setChecked(bool(adaptive_settings) and bool(self.adaptive_settings.get("enabled", True)))
+        options.addWidget(self.adaptive_check)
+        options.addStretch(1)
+        layout.addLayout(options)
+
+        self.table = QtWidgets.QTableWidget(0, 4, self)
+        self.table.setHorizontalHeaderLabels(["Job", "Predicted", "Status", "Input"])
+        self.table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(3, QtWidgets.QHeaderView.Stretch)
+        layout.addWidget(self.table)
+
+        self.eta_label = QtWidgets.QLabel("Fitting runtime model…", self)
+        layout.addWidget(self.eta_label)
+        self.concurrency_label = QtWidgets.QLabel("", self)
+        layout.addWidget(self.concurrency_label)
+
+        buttons = QtWidgets.QHBoxLayout()
+        self.add_button = QtWidgets.QPushButton("Add Inputs…", self)
+        self.add_button.clicked.connect(self._add_inputs)
+        self.remove_button = QtWidgets.QPushButton("Remove", self)
+        self.remove_button.clicked.connect(self._remove_selected)
+        self.model_button = QtWidgets.QPushButton("Runtime Model…", self)
+        self.model_button.clicked.connect(self._show_model)
+        self.run_button = QtWidgets.QPushButton("Run Batch", self)
+        self.run_button.clicked.connect(self._run)
+        close_button = QtWidgets.QPushButton("Close", self)
+        close_button.clicked.connect(self.close)
+        for button in (self.add_button, self.remove_button, self.model_button):
+            buttons.addWidget(button)
+        buttons.addStretch(1)
+        buttons.addWidget(self.run_button)
+        buttons.addWidget(close_button)
+        layout.addLayout(buttons)
+
+        self.solver_combo.currentTextChanged.connect(lambda _: self._reload_jobs())
+        self.order_combo.currentIndexChanged.connect(lambda _: self._refresh_table())
+        self.workers_spin.valueChanged.connect(lambda _: self._refresh_table())
+        self._jobEvent.connect(self._job_event)
+        self.resize(760, 420)
+        self._fit_model()
+
+    def _fit_model(self):
+        store = self.snapshot_store
+        task = BackgroundTask(lambda report: RuntimeModel.fit(snapshot_store=store), parent=self)
+        task.finished.connect(self._model_ready)
+        task.failed.connect(lambda message: self.eta_label.setText(f"Runtime model unavailable: {message}"))
+        task.start()
+        self._model_task = task
+
+    def _model_ready(self, model):
+        self.model = model
+        self._reload_jobs()
+
+    def _input_paths(self):
+        return [job.input_path for job in self.jobs]
+
+    def _reload_jobs(self, paths=None):
+        paths = self._input_paths() if paths is None else paths
+        try:
+            self.jobs = make_jobs(self.solver_combo.currentText(), paths, self.model)
+        except ValueError as exc:
+            QtWidgets.QMessageBox.warning(self, "Run Batch", str(exc))
+            return
+        self._refresh_table()
+
+    def _order(self):
+        return self.order_combo.currentData()
+
+    def _refresh_table(self):
+        ordered = order_jobs(self.jobs, self._order())
+        self.table.setRowCount(len(ordered))
+        for row, job in enumerate(ordered):
+            predicted = format_duration(job.estimate.seconds) if job.estimate is not None else "unknown"
+            values = (job.name, predicted, self._statuses.get(job.name, "queued"), os.fspath(job.input_path))
+            for column, value in enumerate(values):
+                item = QtWidgets.QTableWidgetItem(value)
+                if column == 1 and job.estimate is not None:
+                    item.setToolTip(f"{job.estimate.method}, {job.estimate.samples} logged run(s)")
+                self.table.setItem(row, column, item)
+        self.table.resizeColumnsToContents()
+        self._update_eta()
+
+    def _update_eta(self):
+        if self.model is None:
+            return
+        if not self.jobs:
+            self.eta_label.setText("Add solver inputs to the batch.")
+        elif all(job.estimate is None for job in self.jobs):
+            self.eta_label.setText("Predicted batch time: unknown (no successful runs logged yet)")
+        else:
+            ordered = order_jobs(self.jobs, self._order())
+            eta = simulate_makespan(predicted_seconds(ordered), self.workers_spin.value())
+            self.eta_label.setText(f"Predicted batch time: {format_duration(eta)}")
+
+    def _add_inputs(self):
+        paths, _ = QtWidgets.QFileDialog.getOpenFileNames(
+            self, "Add Solver Inputs", self.start_dir, "JSON Files (*.json);;All Files (*)"
+        )
+        if paths:
+            self._reload_jobs(self._input_paths() + paths)
+
+    def _remove_selected(self):
+        names = {self.table.item(index.row(), 0).text() for index in self.table.selectionModel().selectedRows()}
+        if names:
+            self._reload_jobs([job.input_path for job in self.jobs if job.name not in names])
+
+    def _show_model(self):
+        text = self.model.describe() if self.model is not None else "The runtime model is still being fitted."
+        QtWidgets.QMessageBox.information(self, "Runtime Model", text)
+
+    def _set_running(self, running):
+        for widget in (self.run_button, self.add_button, self.remove_button,
+                       self.solver_combo, self.order_combo, self.workers_spin, self.adaptive_check):
+            widget.setEnabled(not running)
+
+    def _run(self):
+        if not self.jobs or (self._task is not None and self._task.is_running()):
+            return
+        self._statuses = {}
+        workers = self.workers_spin.value()
+        controller = controller_from_config(dict(self.adaptive_settings, enabled=self.adaptive_check.isChecked()), workers)
+        self.concurrency_label.setText("Concurrency adapts to CPU load and free memory." if controller else "")
+        runner = BatchRunner(
+            self.jobs,
+            self.tool_path,
+            parameter=self.parameter,
+            max_workers=workers,
+            order=self._order(),
+            snapshot_store=self.snapshot_store,
+            on_event=self._jobEvent.emit,
+            controller=controller,
+            execution_policy=self.execution_policy,
+            scratch_dir=self.scratch_dir,
+            on_log_finished=self.on_log_finished,
+            base_dir=self.base_dir,
+        )
+        plan = format_plan(self.jobs, workers, self._order())
+        task = BackgroundTask(lambda report: runner.run(), parent=self)
+        task.finished.connect(self._batch_finished)
+        task.failed.connect(self._batch_failed)
+        self._set_running(True)
+        self.eta_label.setText(plan.splitlines()[-1])
+        self._task = task
+        task.start()
+
+    def reject(self):
+        # Escape goes through closeEvent too, so a running batch keeps its dialog.
+        if self._task is not None and self._task.is_running():
+            return
+        super().reject()
+
+    def closeEvent(self, event):
+        if self._task is not None and self._task.is_running():
+            QtWidgets.QMessageBox.information(self, "Run Batch", "Wait for the batch to finish before closing.")
+            event.ignore()
+            return
+        super().closeEvent(event)
+
+    def _job_event(self, name, message):
+        if name == BATCH_EVENT:
+            self.concurrency_label.setText(message.capitalize())
+            return
+        status, _, eta = message.partition("; ")
+        self._statuses[name] = status
+        for row in range(self.table.rowCount()):
+            if self.table.item(row, 0).text() == name:
+                self.table.item(row, 2).setText(status)
+        if eta:
+            self.eta_label.setText(eta.replace("batch ETA", "Batch ETA:"))
+
+    def _batch_finished(self, results):
+        self._set_running(False)
+        failed = sum(1 for result in results.values() if result.status == "failed")
+        total = sum(result.seconds for result in results.values())
+        self.eta_label.setText(
+            f"Batch finished: {len(results) - failed} succeeded, {failed} failed, {format_duration(total)} of tool time."
+        )
+
+    def _batch_failed(self, message):
+        self._set_running(False)
+        QtWidgets.QMessageBox.critical(self, "Run Batch", f"Batch failed:\n{message}")
@@ -83,6 +83,7 @@ STRUCTURE_DEFINITION = {
                         {
                             "Name": "Materials",
                             "type": "table",
+                            "view": "table",
                             "columns": [
                                 {
                                     "Name": "Name",
@@ -179,29 +179,91 @@ class NumberFieldWidget(BaseFieldWidget):
         self.line_edit.setText(str(value))
 
 
+class CollapsibleBox(QtWidgets.QWidget):
+    """Header button plus a content widget that is built on first expand."""
+
+    built = QtCore.Signal(object)
+
+    def __init__(self, title, builder, expanded=False, parent=None):
+        super().__init__(parent)
+        self._builder = builder
+        self.content = None
+
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(4)
+
+        self.toggle_button = QtWidgets.QToolButton(self)
+        self.toggle_button.setText(title)
+        self.toggle_button.setCheckable(True)
+        self.toggle_button.setToolButtonStyle(QtCore.Qt.ToolButtonTextBesideIcon)
+        self.toggle_button.setArrowType(QtCore.Qt.RightArrow)
+        self.toggle_button.setStyleSheet("QToolButton { border: none; font-weight: 600; }")
+        self.toggle_button.toggled.connect(self.set_expanded)
+        layout.addWidget(self.toggle_button)
+
+        if expanded:
+            self.toggle_button.setChecked(True)
+
+    def is_built(self):
+        return self.content is not None
+
+    def is_expanded(self):
+        return self.toggle_button.isChecked()
+
+    def ensure_built(self):
+        if self.content is None:
+            self.content = self._builder(self)
+            self.content.setVisible(self.is_expanded())
+            self.layout().addWidget(self.content)
+            self.built.emit(self.content)
+        return self.content
+
+    def set_expanded(self, expanded):
+        if self.toggle_button.isChecked() != expanded:
+            self.toggle_button.setChecked(expanded)
+            return
+        self.toggle_button.setArrowType(QtCore.Qt.DownArrow if expanded else QtCore.Qt.RightArrow)
+        if expanded:
+            self.ensure_built()
+        if self.content is not None:
+            self.content.setVisible(expanded)
+
+
 class KeyValueGroupWidget(BaseFieldWidget):
-    def __init__(self, field_def, parent=None):
+    def __init__(self, field_def, parent=None, expanded=False):
         super().__init__(field_def, parent)
         outer_layout = QtWidgets.QVBoxLayout(self)
         outer_layout.setContentsMargins(0, 0, 0, 0)
-        group_box = QtWidgets.QGroupBox(field_def.get("Name", ""), self)
+
+        self.widgets = {}
+        self.box = CollapsibleBox(field_def.get("Name", ""), self._build_fields, expanded=expanded, parent=self)
+        outer_layout.addWidget(self.box)
+
+    def _build_fields(self, parent):
+        group_box = QtWidgets.QGroupBox(parent)
         form_layout = QtWidgets.QFormLayout(group_box)
         form_layout.setContentsMargins(10, 10, 10, 10)
         form_layout.setSpacing(6)
-        outer_layout.addWidget(group_box)
-
-        self.widgets = {}
-        for sub_field in field_def.get("fields", []):
+        for sub_field in self.field_def.get("fields", []):
             widget = create_field_widget(sub_field, parent=group_box)
             form_layout.addRow(sub_field["Name"], widget)
             self.widgets[sub_field["Name"]] = widget
+        return group_box
 
     def value(self):
+        if not self.box.is_built():
+            return default_field_value(self.field_def)
         return {name: widget.value() for name, widget in self.widgets.items()}
 
     def set_value(self, values):
         if not isinstance(values, dict):
             return
+        if not self.box.is_built():
+            field_names = [sub_field["Name"] for sub_field in self.field_def.get("fields", [])]
+            if all(values.get(name) is None for name in field_names):
+                return
+            self.box.ensure_built()
         for name, widget in self.widgets.items():
             raw_value = values.get(name)
             if raw_value is None:
@@ -430,6 +492,75 @@ class ModelDialog(QtWidgets.QDialog):
         }
 
 
+def summarize_model_parameters(model_entry):
+    parameters = model_entry["Model"].get("Parameters", [])
+    return ", ".join(
+        f"{list(p.keys())[0]}={list(p.values())[0]}" for p in parameters
+    ) or "No parameters specified"
+
+
+def normalize_model_entry(model_info):
+    if not isinstance(model_info, dict):
+        return None
+    name = stringify_value(model_info.get("Name", ""))
+    parameters = model_info.get("Parameters", [])
+    normalized_parameters = []
+    if isinstance(parameters, dict):
+        source_items = parameters.items()
+    else:
+        source_items = []
+        for item in parameters or []:
+            if isinstance(item, dict) and item:
+                source_items.extend(item.items())
+
+    for key, value in source_items:
+        normalized_parameters.append({str(key): stringify_value(value)})
+
+    return {
+        "Model": {
+            "Name": name,
+            "Parameters": normalized_parameters,
+        }
+    }
+
+
+def extract_model_payloads(material_data):
+    def extract_model_payload(raw_entry):
+        if not isinstance(raw_entry, dict):
+            return None
+        if isinstance(raw_entry.get("Model"), dict):
+            return raw_entry.get("Model")
+        return raw_entry
+
+    payloads = []
+    models_field = material_data.get("Models")
+    if isinstance(models_field, list):
+        for raw_model in models_field:
+            payload = extract_model_payload(raw_model)
+            if payload:
+                payloads.append(payload)
+    payload = extract_model_payload(material_data.get("Model"))
+    if payload:
+        payloads.append(payload)
+    return payloads
+
+
+def build_material_value(material_name, model_entries):
+    material_data = {}
+    if material_name:
+        material_data["Name"] = stringify_value(material_name)
+
+    entries = [entry for entry in model_entries if entry.get("Model")]
+    if not entries:
+        return material_data
+
+    if len(entries) == 1:
+        material_data["Model"] = entries[0]["Model"]
+    else:
+        material_data["Models"] = entries
+    return material_data
+
+
 class ModelDisplayWidget(QtWidgets.QFrame):
     removed = QtCore.Signal(object)
 
@@ -444,10 +575,7 @@ class ModelDisplayWidget(QtWidgets.QFrame):
         layout.setSpacing(8)
 
         name = model_entry["Model"]["Name"]
-        parameters = model_entry["Model"].get("Parameters", [])
-        params_summary = ", ".join(
-            f"{list(p.keys())[0]}={list(p.values())[0]}" for p in parameters
-        ) or "No parameters specified"
+        params_summary = summarize_model_parameters(model_entry)
 
         label = QtWidgets.QLabel(f"🧠 {name}\n🔢 {params_summary}", self)
         label.setWordWrap(True)
@@ -525,20 +653,7 @@ class MaterialRowWidget(QtWidgets.QFrame):
         widget.deleteLater()
 
     def value(self):
-        material_name = self.name_edit.text()
-        material_data = {}
-        if material_name:
-            material_data["Name"] = stringify_value(material_name)
-
-        entries = [entry for entry in self.model_entries if entry.get("Model")]
-        if not entries:
-            return material_data
-
-        if len(entries) == 1:
-            material_data["Model"] = entries[0]["Model"]
-        else:
-            material_data["Models"] = entries
-        return material_data
+        return build_material_value(self.name_edit.text(), self.model_entries)
 
     def set_material_name(self, name):
         self.name_edit.setText(stringify_value(name))
@@ -552,28 +667,9 @@ class MaterialRowWidget(QtWidgets.QFrame):
         self.model_entries = []
 
     def _append_model_entry(self, model_info):
-        if not isinstance(model_info, dict):
+        entry = normalize_model_entry(model_info)
+        if entry is None:
             return
-        name = stringify_value(model_info.get("Name", ""))
-        parameters = model_info.get("Parameters", [])
-        normalized_parameters = []
-        if isinstance(parameters, dict):
-            source_items = parameters.items()
-        else:
-            source_items = []
-            for item in parameters or []:
-                if isinstance(item, dict) and item:
-                    source_items.extend(item.items())
-
-        for key, value in source_items:
-            normalized_parameters.append({str(key): stringify_value(value)})
-
-        entry = {
-            "Model": {
-                "Name": name,
-                "Parameters": normalized_parameters,
-            }
-        }
         self.model_entries.append(entry)
         widget = ModelDisplayWidget(entry, parent=self.models_container)
         widget.removed.connect(self._remove_model)
@@ -585,23 +681,7 @@ class MaterialRowWidget(QtWidgets.QFrame):
             return
         self.name_edit.setText(stringify_value(material_data.get("Name", "")))
         self._clear_model_entries()
-
-        def extract_model_payload(raw_entry):
-            if not isinstance(raw_entry, dict):
-                return None
-            if isinstance(raw_entry.get("Model"), dict):
-                return raw_entry.get("Model")
-            return raw_entry
-
-        models_field = material_data.get("Models")
-        if isinstance(models_field, list):
-            for raw_model in models_field:
-                payload = extract_model_payload(raw_model)
-                if payload:
-                    self._append_model_entry(payload)
-        single_model = material_data.get("Model")
-        payload = extract_model_payload(single_model)
-        if payload:
+        for payload in extract_model_payloads(material_data):
             self._append_model_entry(payload)
 
 
@@ -637,9 +717,13 @@ class MaterialsTableWidget(BaseFieldWidget):
 
         self.row_widgets = []
 
-    def add_row(self, material_name=None):
+    def _create_row(self):
         row = MaterialRowWidget(self.model_column, self.parameters_column, parent=self.rows_container)
         row.removed.connect(self._remove_row)
+        return row
+
+    def add_row(self, material_name=None):
+        row = self._create_row()
         self.rows_layout.addWidget(row)
         self.row_widgets.append(row)
         if material_name:
@@ -657,9 +741,43 @@ class MaterialsTableWidget(BaseFieldWidget):
             self._remove_row(row)
 
     def populate_from_names(self, material_names):
-        self.clear_rows()
-        for material_name in material_names or []:
-            self.add_row(material_name=material_name)
+        """Reconcile rows with ``material_names`` instead of rebuilding them.
+
+        Rows whose name survives keep their model entries; only rows for
+        new names are created and rows for vanished names removed.
+        """
+        target_names = [stringify_value(name) for name in material_names or []]
+        if target_names == [row.name_edit.text() for row in self.row_widgets]:
+            return
+
+        rows_by_name = {}
+        for row in self.row_widgets:
+            rows_by_name.setdefault(row.name_edit.text(), []).append(row)
+
+        matched_rows = []
+        for name in target_names:
+            candidates = rows_by_name.get(name)
+            matched_rows.append(candidates.pop(0) if candidates else None)
+
+        self.rows_container.setUpdatesEnabled(False)
+        try:
+            for leftovers in rows_by_name.values():
+                for row in leftovers:
+                    self._remove_row(row)
+
+            ordered_rows = []
+            for index, (name, row) in enumerate(zip(target_names, matched_rows)):
+                if row is None:
+                    row = self._create_row()
+                    row.set_material_name(name)
+                    self.rows_layout.insertWidget(index, row)
+                elif self.rows_layout.indexOf(row) != index:
+                    self.rows_layout.removeWidget(row)
+                    self.rows_layout.insertWidget(index, row)
+                ordered_rows.append(row)
+            self.row_widgets = ordered_rows
+        finally:
+            self.rows_container.setUpdatesEnabled(True)
 
     def value(self):
         values = []
@@ -670,12 +788,319 @@ class MaterialsTableWidget(BaseFieldWidget):
         return values
 
     def set_value(self, materials):
-        self.clear_rows()
+        self.rows_container.setUpdatesEnabled(False)
+        try:
+            self.clear_rows()
+            for entry in materials or []:
+                if not isinstance(entry, dict):
+                    continue
+                row = self.add_row()
+                row.set_data(entry)
+        finally:
+            self.rows_container.setUpdatesEnabled(True)
+
+
+class MaterialsTableModel(QtCore.QAbstractTableModel):
+    NAME_COLUMN = 0
+    MODELS_COLUMN = 1
+    HEADERS = ("🧪 Material Name", "🔧 Models")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._materials = []
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._materials)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.DisplayRole and orientation == QtCore.Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def flags(self, index):
+        if not index.isValid():
+            return QtCore.Qt.NoItemFlags
+        return QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsEditable
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        material = self._materials[index.row()]
+        if index.column() == self.NAME_COLUMN:
+            if role in (QtCore.Qt.DisplayRole, QtCore.Qt.EditRole):
+                return material["name"]
+            return None
+        if role == QtCore.Qt.DisplayRole:
+            return "; ".join(entry["Model"]["Name"] for entry in material["models"]) or "➕ Double-click to add a model"
+        if role == QtCore.Qt.ToolTipRole:
+            return "\n".join(
+                f"🧠 {entry['Model']['Name']}: {summarize_model_parameters(entry)}"
+                for entry in material["models"]
+            ) or None
+        return None
+
+    def setData(self, index, value, role=QtCore.Qt.EditRole):
+        if not index.isValid() or role != QtCore.Qt.EditRole or index.column() != self.NAME_COLUMN:
+            return False
+        self._materials[index.row()]["name"] = stringify_value(value)
+        self.dataChanged.emit(index, index, [QtCore.Qt.DisplayRole, QtCore.Qt.EditRole])
+        return True
+
+    def material_names(self):
+        return [material["name"] for material in self._materials]
+
+    def model_entries(self, row):
+        return list(self._materials[row]["models"])
+
+    def insert_material(self, name="", row=None):
+        row = len(self._materials) if row is None else row
+        self.beginInsertRows(QtCore.QModelIndex(), row, row)
+        self._materials.insert(row, {"name": stringify_value(name), "models": []})
+        self.endInsertRows()
+        return row
+
+    def remove_materials(self, rows):
+        for row in sorted(set(rows), reverse=True):
+            if 0 <= row < len(self._materials):
+                self.beginRemoveRows(QtCore.QModelIndex(), row, row)
+                del self._materials[row]
+                self.endRemoveRows()
+
+    def add_model(self, row, model_info):
+        entry = normalize_model_entry(model_info.get("Model", model_info))
+        if entry is None:
+            return
+        self._materials[row]["models"].append(entry)
+        self._emit_models_changed(row)
+
+    def remove_model(self, row, model_position):
+        models = self._materials[row]["models"]
+        if 0 <= model_position < len(models):
+            del models[model_position]
+            self._emit_models_changed(row)
+
+    def _emit_models_changed(self, row):
+        index = self.index(row, self.MODELS_COLUMN)
+        self.dataChanged.emit(index, index, [QtCore.Qt.DisplayRole, QtCore.Qt.ToolTipRole])
+
+    def set_materials(self, materials):
+        records = []
         for entry in materials or []:
             if not isinstance(entry, dict):
                 continue
-            row = self.add_row()
-            row.set_data(entry)
+            models = [normalize_model_entry(payload) for payload in extract_model_payloads(entry)]
+            records.append({"name": stringify_value(entry.get("Name", "")), "models": models})
+        self.beginResetModel()
+        self._materials = records
+        self.endResetModel()
+
+    def reconcile_names(self, material_names):
+        target_names = [stringify_value(name) for name in material_names or []]
+        if target_names == self.material_names():
+            return
+        records_by_name = {}
+        for record in self._materials:
+            records_by_name.setdefault(record["name"], []).append(record)
+        records = []
+        for name in target_names:
+            candidates = records_by_name.get(name)
+            records.append(candidates.pop(0) if candidates else {"name": name, "models": []})
+        # Edit the rows in place rather than resetting, so views keep their selection and scroll position.
+        kept = {id(record) for record in records}
+        current = {id(record) for record in self._materials}
+        parent = QtCore.QModelIndex()
+        for row, record in enumerate(records):
+            if id(record) in current:
+                dropped = row
+                while self._materials[dropped] is not record and id(self._materials[dropped]) not in kept:
+                    dropped += 1
+                if dropped > row:
+                    self.beginRemoveRows(parent, row, dropped - 1)
+                    del self._materials[row:dropped]
+                    self.endRemoveRows()
+                if self._materials[row] is not record:
+                    source = next(i for i in range(row, len(self._materials)) if self._materials[i] is record)
+                    self.beginMoveRows(parent, source, source, parent, row)
+                    self._materials.insert(row, self._materials.pop(source))
+                    self.endMoveRows()
+            elif row < len(self._materials) and id(self._materials[row]) not in kept:
+                self._materials[row] = record
+                self.dataChanged.emit(self.index(row, 0), self.index(row, self.columnCount() - 1))
+            else:
+                self.beginInsertRows(parent, row, row)
+                self._materials.insert(row, record)
+                self.endInsertRows()
+        if len(self._materials) > len(records):
+            self.beginRemoveRows(parent, len(records), len(self._materials) - 1)
+            del self._materials[len(records):]
+            self.endRemoveRows()
+
+    def value(self):
+        values = []
+        for record in self._materials:
+            data = build_material_value(record["name"], record["models"])
+            if data:
+                values.append(data)
+        return values
+
+
+class MaterialModelsDelegate(QtWidgets.QStyledItemDelegate):
+    """Edits the Models column through ``ModelDialog`` instead of an inline editor."""
+
+    def __init__(self, model_column, parameters_column, parent=None):
+        super().__init__(parent)
+        self.model_column = model_column
+        self.parameters_column = parameters_column
+
+    def createEditor(self, parent, option, index):
+        if index.column() == MaterialsTableModel.MODELS_COLUMN:
+            return None
+        return super().createEditor(parent, option, index)
+
+    def editorEvent(self, event, model, option, index):
+        if (
+            index.column() == MaterialsTableModel.MODELS_COLUMN
+            and event.type() == QtCore.QEvent.MouseButtonDblClick
+        ):
+            self.add_model(index)
+            return True
+        return super().editorEvent(event, model, option, index)
+
+    def add_model(self, index):
+        dialog = ModelDialog(self.model_column, self.parameters_column, parent=self.parent())
+        if dialog.exec() == QtWidgets.QDialog.Accepted:
+            entry = dialog.model_entry()
+            if entry:
+                index.model().add_model(index.row(), entry)
+
+
+class MaterialsTableViewWidget(BaseFieldWidget):
+    """Materials editor backed by a model/view table.
+
+    Only the visible rows are painted, which keeps large .run files with
+    thousands of materials responsive. ``value()``/``set_value()`` use the
+    same payload as ``MaterialsTableWidget``.
+    """
+
+    def __init__(self, field_def, parent=None):
+        super().__init__(field_def, parent)
+        self.columns = field_def.get("columns", [])
+        self.model_column = next((col for col in self.columns if col.get("Name") == "Model"), {})
+        self.parameters_column = next(
+            (col for col in self.columns if col.get("Name") == "Parameters"), {}
+        )
+
+        outer_layout = QtWidgets.QVBoxLayout(self)
+        outer_layout.setContentsMargins(0, 0, 0, 0)
+        outer_layout.setSpacing(8)
+
+        title = QtWidgets.QLabel("🧬 Materials", self)
+        title.setStyleSheet("font-weight: 600; font-size: 14px;")
+        outer_layout.addWidget(title)
+
+        self.table_model = MaterialsTableModel(self)
+        self.table_view = QtWidgets.QTableView(self)
+        self.table_view.setModel(self.table_model)
+        self.delegate = MaterialModelsDelegate(self.model_column, self.parameters_column, parent=self.table_view)
+        self.table_view.setItemDelegate(self.delegate)
+        self.table_view.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.table_view.setEditTriggers(
+            QtWidgets.QAbstractItemView.DoubleClicked | QtWidgets.QAbstractItemView.EditKeyPressed
+        )
+        self.table_view.setWordWrap(False)
+        self.table_view.verticalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Fixed)
+        self.table_view.horizontalHeader().setSectionResizeMode(
+            MaterialsTableModel.NAME_COLUMN, QtWidgets.QHeaderView.Interactive
+        )
+        self.table_view.horizontalHeader().setStretchLastSection(True)
+        self.table_view.setColumnWidth(MaterialsTableModel.NAME_COLUMN, 260)
+        self.table_view.setMinimumHeight(320)
+        self.table_view.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
+        self.table_view.customContextMenuRequested.connect(self._show_context_menu)
+        outer_layout.addWidget(self.table_view)
+
+        buttons_layout = QtWidgets.QHBoxLayout()
+        buttons_layout.addStretch()
+        add_model_btn = QtWidgets.QPushButton("🔧 Add Model", self)
+        add_model_btn.clicked.connect(self._add_model_to_current)
+        buttons_layout.addWidget(add_model_btn)
+        remove_btn = QtWidgets.QPushButton("🗑️ Remove Material", self)
+        remove_btn.clicked.connect(self._remove_selected)
+        buttons_layout.addWidget(remove_btn)
+        add_btn = QtWidgets.QPushButton("➕ Add Material", self)
+        add_btn.clicked.connect(self.add_row)
+        buttons_layout.addWidget(add_btn)
+        outer_layout.addLayout(buttons_layout)
+
+    def add_row(self, material_name=None):
+        row = self.table_model.insert_material(material_name or "")
+        index = self.table_model.index(row, MaterialsTableModel.NAME_COLUMN)
+        self.table_view.scrollTo(index)
+        if not material_name:
+            self.table_view.setCurrentIndex(index)
+            self.table_view.edit(index)
+        return row
+
+    def _selected_rows(self):
+        return sorted({index.row() for index in self.table_view.selectionModel().selectedRows()})
+
+    def _remove_selected(self):
+        self.table_model.remove_materials(self._selected_rows())
+
+    def _add_model_to_current(self):
+        current = self.table_view.currentIndex()
+        if not current.isValid():
+            return
+        self.delegate.add_model(self.table_model.index(current.row(), MaterialsTableModel.MODELS_COLUMN))
+
+    def _show_context_menu(self, position):
+        index = self.table_view.indexAt(position)
+        if not index.isValid():
+            return
+        row = index.row()
+        menu = QtWidgets.QMenu(self)
+        menu.addAction(
+            "➕ Add Model…",
+            lambda: self.delegate.add_model(self.table_model.index(row, MaterialsTableModel.MODELS_COLUMN)),
+        )
+        for position_in_row, entry in enumerate(self.table_model.model_entries(row)):
+            menu.addAction(
+                f"✖ Remove {entry['Model']['Name']}",
+                lambda checked=False, pos=position_in_row: self.table_model.remove_model(row, pos),
+            )
+        menu.addSeparator()
+        menu.addAction("🗑️ Remove Material", lambda: self.table_model.remove_materials([row]))
+        menu.exec(self.table_view.viewport().mapToGlobal(position))
+
+    def clear_rows(self):
+        self.table_model.set_materials([])
+
+    def populate_from_names(self, material_names):
+        self.table_model.reconcile_names(material_names)
+
+    def value(self):
+        return self.table_model.value()
+
+    def set_value(self, materials):
+        self.table_model.set_materials(materials)
+
+
+def default_field_value(field_def):
+    """Value a freshly built widget for ``field_def`` would report."""
+    if "type" not in field_def and "fields" in field_def:
+        return {sub_field["Name"]: default_field_value(sub_field) for sub_field in field_def["fields"]}
+    ftype = field_def.get("type", "").lower()
+    if ftype == "list":
+        options = field_def.get("list", [])
+        return options[0] if options else ""
+    if ftype == "key-value list":
+        return {sub_field["Name"]: default_field_value(sub_field) for sub_field in field_def.get("fields", [])}
+    if ftype == "table":
+        return []
+    return ""
 
 
 def create_field_widget(field_def, parent=None):
@@ -692,6 +1117,8 @@ def create_field_widget(field_def, parent=None):
         return KeyValueListWidget(field_def, parent=parent)
     if ftype == "table":
         if field_def.get("Name") == "Materials":
+            if field_def.get("view") == "table":
+                return MaterialsTableViewWidget(field_def, parent=parent)
             return MaterialsTableWidget(field_def, parent=parent)
         return TableFieldWidget(field_def, parent=parent)
     raise ValueError(f"Unsupported field type: {field_def.get('type')}")
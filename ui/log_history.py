@@ -0,0 +1,134 @@
+from PySide6 import QtCore, QtGui, QtWidgets
+
+from log_store import describe_log, format_size, read_log_text
+from runtime_model import format_duration
+from ui.background import BackgroundTask
+
+# Very long logs are shown from their end, where failures are reported.
+MAX_VIEW_CHARS = 4_000_000
+
+
+class RunHistoryDialog(QtWidgets.QDialog):
+    """Browse the run logs, compressed or not, and read one of them."""
+
+    def __init__(self, log_store, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Run History")
+        self.log_store = log_store
+        self._list_task = None
+        self._view_task = None
+        self._maintain_task = None
+        self._maintenance_note = ""
+
+        layout = QtWidgets.QVBoxLayout(self)
+        splitter = QtWidgets.QSplitter(QtCore.Qt.Vertical, self)
+        self.table = QtWidgets.QTableWidget(0, 5, splitter)
+        self.table.setHorizontalHeaderLabels(["Started", "Solver", "Exit code", "Wall time", "Size"])
+        self.table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QtWidgets.QAbstractItemView.SingleSelection)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.itemSelectionChanged.connect(self._show_selected)
+        self.viewer = QtWidgets.QPlainTextEdit(splitter)
+        self.viewer.setReadOnly(True)
+        self.viewer.setLineWrapMode(QtWidgets.QPlainTextEdit.NoWrap)
+        self.viewer.setFont(QtGui.QFontDatabase.systemFont(QtGui.QFontDatabase.FixedFont))
+        layout.addWidget(splitter, 1)
+
+        self.status_label = QtWidgets.QLabel(f"Reading logs in {log_store.root}…", self)
+        layout.addWidget(self.status_label)
+
+        buttons = QtWidgets.QHBoxLayout()
+        refresh_button = QtWidgets.QPushButton("Refresh", self)
+        refresh_button.clicked.connect(self._refresh)
+        self.maintain_button = QtWidgets.QPushButton("Compress && Prune Now", self)
+        self.maintain_button.setToolTip("Compress finished logs and apply the retention limits.")
+        self.maintain_button.clicked.connect(self._maintain)
+        close_button = QtWidgets.QPushButton("Close", self)
+        close_button.clicked.connect(self.close)
+        buttons.addWidget(refresh_button)
+        buttons.addWidget(self.maintain_button)
+        buttons.addStretch(1)
+        buttons.addWidget(close_button)
+        layout.addLayout(buttons)
+
+        self.resize(820, 600)
+        self._refresh()
+
+    def _refresh(self):
+        if self._list_task is not None and self._list_task.is_running():
+            return
+        store = self.log_store
+
+        def list_logs(report):
+            return [describe_log(entry.path) for entry in reversed(store.entries())]
+
+        task = BackgroundTask(list_logs, parent=self)
+        task.finished.connect(self._fill_table)
+        task.failed.connect(lambda message: self.status_label.setText(f"Could not read the logs: {message}"))
+        task.start()
+        self._list_task = task
+
+    def _fill_table(self, infos):
+        self.table.setRowCount(len(infos))
+        total = 0
+        for row, info in enumerate(infos):
+            total += info.size
+            exit_code = "running" if info.exit_code is None else str(info.exit_code)
+            wall = format_duration(info.wall_seconds) if info.wall_seconds is not None else ""
+            size = format_size(info.size) + (" (gz)" if info.compressed else "")
+            values = (info.started.replace("T", " ")[:19], info.solver, exit_code, wall, size)
+            for column, value in enumerate(values):
+                item = QtWidgets.QTableWidgetItem(value)
+                if column == 0:
+                    item.setData(QtCore.Qt.UserRole, str(info.path))
+                    item.setToolTip(str(info.path))
+                self.table.setItem(row, column, item)
+        self.table.resizeColumnsToContents()
+        status = f"{len(infos)} run log(s), {format_size(total)} in {self.log_store.root}"
+        if self._maintenance_note:
+            status += f" (last clean-up: {self._maintenance_note})"
+        self.status_label.setText(status)
+
+    def _show_selected(self):
+        rows = self.table.selectionModel().selectedRows()
+        if not rows:
+            return
+        path = self.table.item(rows[0].row(), 0).data(QtCore.Qt.UserRole)
+        self.viewer.setPlainText("Loading…")
+        task = BackgroundTask(lambda report: (path, read_log_text(path, MAX_VIEW_CHARS)), parent=self)
+        task.finished.connect(self._show_text)
+        task.failed.connect(lambda message: self.viewer.setPlainText(f"Could not read {path}:\n{message}"))
+        task.start()
+        self._view_task = task
+
+    def _show_text(self, result):
+        path, text = result
+        rows = self.table.selectionModel().selectedRows()
+        # A slower read for an earlier selection must not replace the current one.
+        if not rows or self.table.item(rows[0].row(), 0).data(QtCore.Qt.UserRole) != path:
+            return
+        if len(text) >= MAX_VIEW_CHARS:
+            text = f"[showing the last {MAX_VIEW_CHARS:,} characters]\n" + text
+        self.viewer.setPlainText(text)
+
+    def _maintain(self):
+        if self._maintain_task is not None and self._maintain_task.is_running():
+            return
+        store = self.log_store
+        task = BackgroundTask(lambda report: store.maintain(), parent=self)
+        task.finished.connect(self._maintained)
+        task.failed.connect(self._maintenance_failed)
+        self.maintain_button.setEnabled(False)
+        task.start()
+        self._maintain_task = task
+
+    def _maintained(self, report):
+        self.maintain_button.setEnabled(True)
+        self._maintenance_note = report.describe()
+        self._refresh()
+
+    def _maintenance_failed(self, message):
+        self.maintain_button.setEnabled(True)
+        QtWidgets.QMessageBox.critical(self, "Run History", f"Log clean-up failed:\n{message}")
@@ -0,0 +1,175 @@
+import html
+import time
+
+from PySide6 import QtCore, QtWidgets
+
+from log_search import HIGHLIGHT, context_lines, group_by_run
+from tool_runner import SOLVER_CODES
+from ui.background import BackgroundTask
+
+EXIT_CHOICES = (("Any exit code", "any"), ("Succeeded", "succeeded"), ("Failed", "failed"))
+SEARCH_DELAY_MS = 250
+CONTEXT_RADIUS = 8
+
+
+class LogSearchDialog(QtWidgets.QDialog):
+    """Search the indexed tool output of past runs."""
+
+    def __init__(self, log_index, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Search Logs")
+        self.log_index = log_index
+        self._update_task = None
+        self._search_task = None
+        self._preview_task = None
+        self._generation = 0
+
+        layout = QtWidgets.QVBoxLayout(self)
+        self.query_edit = QtWidgets.QLineEdit(self)
+        self.query_edit.setPlaceholderText("Words from a STDOUT/STDERR line, e.g. ERR_CONVERGENCE (end a word with * for a prefix)")
+        self.query_edit.setClearButtonEnabled(True)
+        layout.addWidget(self.query_edit)
+
+        filters = QtWidgets.QHBoxLayout()
+        self.solver_combo = QtWidgets.QComboBox(self)
+        self.solver_combo.addItem("Any solver", "")
+        for solver in SOLVER_CODES:
+            self.solver_combo.addItem(solver, solver)
+        self.exit_combo = QtWidgets.QComboBox(self)
+        for label, value in EXIT_CHOICES:
+            self.exit_combo.addItem(label, value)
+        today = QtCore.QDate.currentDate()
+        self.since_check = QtWidgets.QCheckBox("From:", self)
+        self.since_edit = QtWidgets.QDateEdit(today.addDays(-30), self)
+        self.until_check = QtWidgets.QCheckBox("To:", self)
+        self.until_edit = QtWidgets.QDateEdit(today, self)
+        for edit in (self.since_edit, self.until_edit):
+            edit.setCalendarPopup(True)
+            edit.setDisplayFormat("yyyy-MM-dd")
+            edit.setEnabled(False)
+        self.since_check.toggled.connect(self.since_edit.setEnabled)
+        self.until_check.toggled.connect(self.until_edit.setEnabled)
+        for widget in (self.solver_combo, self.exit_combo, self.since_check, self.since_edit,
+                       self.until_check, self.until_edit):
+            filters.addWidget(widget)
+        filters.addStretch(1)
+        layout.addLayout(filters)
+
+        splitter = QtWidgets.QSplitter(QtCore.Qt.Vertical, self)
+        self.results = QtWidgets.QTreeWidget(splitter)
+        self.results.setHeaderLabels(["Run / line", "Solver", "Started", "Exit", "Output"])
+        self.results.setUniformRowHeights(True)
+        self.results.header().setStretchLastSection(True)
+        self.results.currentItemChanged.connect(lambda current, _: self._preview(current))
+        self.preview = QtWidgets.QTextEdit(splitter)
+        self.preview.setReadOnly(True)
+        self.preview.setLineWrapMode(QtWidgets.QTextEdit.NoWrap)
+        layout.addWidget(splitter, 1)
+
+        self.status_label = QtWidgets.QLabel("Updating the index…", self)
+        layout.addWidget(self.status_label)
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(SEARCH_DELAY_MS)
+        self._timer.timeout.connect(self._search)
+        self.query_edit.textChanged.connect(lambda _: self._timer.start())
+        self.query_edit.returnPressed.connect(self._search)
+        for signal in (self.solver_combo.currentIndexChanged, self.exit_combo.currentIndexChanged,
+                       self.since_check.toggled, self.until_check.toggled,
+                       self.since_edit.dateChanged, self.until_edit.dateChanged):
+            signal.connect(lambda *_: self._timer.start())
+
+        self.resize(900, 620)
+        self._update_index()
+
+    def _update_index(self):
+        index = self.log_index
+        task = BackgroundTask(lambda report: index.update(), parent=self)
+        task.finished.connect(self._index_updated)
+        task.failed.connect(lambda message: self.status_label.setText(f"Index update failed: {message}"))
+        task.start()
+        self._update_task = task
+
+    def _index_updated(self, report):
+        if report.indexed:
+            self.status_label.setText(f"Indexed {report.indexed} new run(s) in {report.seconds:.1f} s.")
+        else:
+            self.status_label.setText("The index is up to date.")
+        if self.query_edit.text().strip():
+            self._search()
+
+    def _filters(self):
+        since = self.since_edit.date().toPython() if self.since_check.isChecked() else None
+        until = self.until_edit.date().toPython() if self.until_check.isChecked() else None
+        return self.solver_combo.currentData(), since, until, self.exit_combo.currentData()
+
+    def _search(self):
+        self._timer.stop()
+        text = self.query_edit.text().strip()
+        self._generation += 1
+        if not text:
+            self.results.clear()
+            return
+        generation = self._generation
+        index = self.log_index
+        solver, since, until, exit_filter = self._filters()
+
+        def search(report):
+            started = time.perf_counter()
+            hits = index.search(text, solver, since, until, exit_filter)
+            return generation, hits, time.perf_counter() - started
+
+        task = BackgroundTask(search, parent=self)
+        task.finished.connect(self._show_results)
+        task.failed.connect(lambda message: self.status_label.setText(message))
+        task.start()
+        self._search_task = task
+
+    def _show_results(self, result):
+        generation, hits, seconds = result
+        if generation != self._generation:
+            return  # a newer search is on its way
+        self.results.clear()
+        groups = group_by_run(hits)
+        for run, run_hits in groups:
+            started = run.started.replace("T", " ")[:19]
+            run_item = QtWidgets.QTreeWidgetItem(
+                [run.name, run.solver, started, "" if run.exit_code is None else str(run.exit_code), f"{len(run_hits)} line(s)"]
+            )
+            run_item.setToolTip(0, str(run.path))
+            for hit in run_hits:
+                line_item = QtWidgets.QTreeWidgetItem([f"line {hit.line_no}", "", "", hit.label, hit.text])
+                line_item.setData(0, QtCore.Qt.UserRole, hit)
+                run_item.addChild(line_item)
+            self.results.addTopLevelItem(run_item)
+            run_item.setExpanded(True)
+        for column in range(4):
+            self.results.resizeColumnToContents(column)
+        self.status_label.setText(f"{len(hits)} line(s) in {len(groups)} run(s), {seconds * 1000:.0f} ms")
+
+    def _preview(self, item):
+        hit = item.data(0, QtCore.Qt.UserRole) if item is not None else None
+        if hit is None:
+            return
+        task = BackgroundTask(lambda report: (hit, context_lines(hit.run.path, hit.line_no, CONTEXT_RADIUS)), parent=self)
+        task.finished.connect(self._show_preview)
+        task.failed.connect(lambda message: self.preview.setPlainText(f"Could not read {hit.run.path}:\n{message}"))
+        task.start()
+        self._preview_task = task
+
+    def _show_preview(self, result):
+        hit, lines = result
+        current = self.results.currentItem()
+        if current is None or current.data(0, QtCore.Qt.UserRole) != hit:
+            return
+        rows = []
+        for line_no, text in lines:
+            if line_no == hit.line_no:
+                marked = html.escape(hit.highlighted)
+                marked = marked.replace(HIGHLIGHT[0], '<span style="background:#ffe08a">').replace(HIGHLIGHT[1], "</span>")
+                rows.append(f"<b>{line_no:>7}  {hit.label}: {marked}</b>")
+            else:
+                rows.append(f"{line_no:>7}  {html.escape(text)}")
+        self.preview.setHtml(f"<pre>{html.escape(str(hit.run.path))}\n\n" + "\n".join(rows) + "</pre>")
+
@@ -0,0 +1,123 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from PySide6 import QtCore
+
+from run_reader import run_reader
+
+
+def file_signature(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+class RunMaterialsWatcher(QtCore.QObject):
+    """Watch a .run file and re-read its materials off the UI thread.
+
+    Change events are debounced, and the file is only re-parsed when its
+    size or mtime differs from the last parse. The containing folder is
+    watched as well so a file regenerated via delete/rename is picked up.
+    """
+
+    materialsLoaded = QtCore.Signal(str, list)
+    loadFailed = QtCore.Signal(str, str)
+    _parsed = QtCore.Signal(int, str, object, str)
+
+    def __init__(self, debounce_ms=400, parent=None):
+        super().__init__(parent)
+        self._path = None
+        self._signature = None
+        self._generation = 0
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+        self._watcher = QtCore.QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._schedule_check)
+        self._watcher.directoryChanged.connect(self._schedule_check)
+
+        self._debounce = QtCore.QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(debounce_ms)
+        self._debounce.timeout.connect(self._check)
+
+        self._parsed.connect(self._deliver)
+
+    def path(self):
+        return self._path
+
+    def signature(self):
+        return self._signature
+
+    def watch(self, path, load_now=True, known_signature=None):
+        """Start watching ``path``.
+
+        ``known_signature`` is the signature of the content the caller
+        already shows; the file is only re-parsed if it differs.
+        """
+        self.stop()
+        self._path = os.fspath(path)
+        self._rewatch()
+        if load_now:
+            self._signature = known_signature
+            self._check()
+        else:
+            self._signature = file_signature(self._path)
+
+    def stop(self):
+        self._debounce.stop()
+        self._generation += 1
+        self._path = None
+        self._signature = None
+        watched = self._watcher.files() + self._watcher.directories()
+        if watched:
+            self._watcher.removePaths(watched)
+
+    def shutdown(self):
+        self.stop()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _rewatch(self):
+        if not self._path:
+            return
+        watched_files = self._watcher.files()
+        if self._path not in watched_files and os.path.exists(self._path):
+            self._watcher.addPath(self._path)
+        parent = os.fspath(Path(self._path).parent)
+        if parent not in self._watcher.directories() and os.path.isdir(parent):
+            self._watcher.addPath(parent)
+
+    def _schedule_check(self, _changed_path=None):
+        if self._path:
+            self._debounce.start()
+
+    def _check(self):
+        if not self._path:
+            return
+        # Editors and generators often replace the file, which drops the watch.
+        self._rewatch()
+        signature = file_signature(self._path)
+        if signature is None or signature == self._signature:
+            return
+        self._signature = signature
+        self._executor.submit(self._parse, self._generation, self._path)
+
+    def _parse(self, generation, path):
+        try:
+            material_names = run_reader(path)
+        except FileNotFoundError:
+            return
+        except Exception as exc:
+            self._parsed.emit(generation, path, None, str(exc))
+            return
+        self._parsed.emit(generation, path, material_names, "")
+
+    def _deliver(self, generation, path, material_names, error):
+        if generation != self._generation:
+            return
+        if material_names is None:
+            self.loadFailed.emit(path, error)
+        else:
+            self.materialsLoaded.emit(path, list(material_names))
@@ -0,0 +1,19 @@
+import copy
+
+
+def load_structure(structure):
+    parameters_section = structure.get("parameters")
+    if parameters_section is None:
+        parameters_section = structure.get("Parameters", [])
+    solver_defs = {}
+    for entry in parameters_section:
+        for solver_name, groups in entry.items():
+            sections = {}
+            for group in groups:
+                for section_name, fields in group.items():
+                    sections[section_name] = copy.deepcopy(fields)
+            solver_defs[solver_name] = sections
+    solvers = structure.get("solver")
+    if solvers is None:
+        solvers = structure.get("Solver", [])
+    return list(solvers or []), solver_defs
@@ -0,0 +1,401 @@
+"""Solver payload codec compiled once from ``STRUCTURE_DEFINITION``.
+
+``serialize_solver_payload`` produces exactly what
+``formatters.format_solver_payload`` produces, but each field gets a
+converter chosen from its schema type up front. Converters take a fast
+path for the types the widgets actually return and fall back to
+``stringify_value`` for anything else, so their output never differs from
+the generic walk.
+
+``decode_solver_payload`` is the mirror image: it maps a solver's JSON
+payload back to ``{section: {field: widget value}}`` using one case-folded
+key index per JSON object.
+"""
+
+from ui.constants import STRUCTURE_DEFINITION
+from ui.formatters import derive_run_metadata, format_materials, stringify_value
+from ui.schema import load_structure
+
+
+def _convert_text(value):
+    if type(value) is str:
+        return value
+    return stringify_value(value)
+
+
+def _convert_number(value):
+    value_type = type(value)
+    if value_type is int or value_type is str:
+        return value
+    if value_type is float:
+        return int(value) if value.is_integer() else value
+    return stringify_value(value)
+
+
+def _convert_mapping(value):
+    if type(value) is not dict:
+        return stringify_value(value)
+    return {
+        key: _convert_mapping(item) if type(item) is dict else _convert_number(item)
+        for key, item in value.items()
+    }
+
+
+def _convert_model(model):
+    # Hot loop for large material lists: conversions are inlined on purpose.
+    if type(model) is not dict:
+        return stringify_value(model)
+    converted = {}
+    for key, value in model.items():
+        value_type = type(value)
+        if value_type is str:
+            converted[key] = value
+        elif value_type is list:
+            parameters = []
+            for item in value:
+                if type(item) is not dict:
+                    parameters.append(stringify_value(item))
+                    continue
+                converted_item = {}
+                for name, raw in item.items():
+                    raw_type = type(raw)
+                    if raw_type is str or raw_type is int:
+                        converted_item[name] = raw
+                    elif raw_type is float:
+                        converted_item[name] = int(raw) if raw.is_integer() else raw
+                    else:
+                        converted_item[name] = stringify_value(raw)
+                parameters.append(converted_item)
+            converted[key] = parameters
+        else:
+            converted[key] = _convert_number(value)
+    return converted
+
+
+def _convert_row(row):
+    # Table rows, including Materials rows carrying "Model"/"Models".
+    converted = {}
+    for key, value in row.items():
+        if key == "Model":
+            converted[key] = _convert_model(value)
+        elif key == "Models" and type(value) is list:
+            converted[key] = [
+                {
+                    entry_key: _convert_model(entry_value) if entry_key == "Model" else stringify_value(entry_value)
+                    for entry_key, entry_value in entry.items()
+                }
+                if type(entry) is dict
+                else stringify_value(entry)
+                for entry in value
+            ]
+        else:
+            converted[key] = _convert_number(value)
+    return converted
+
+
+def _convert_table(rows):
+    if type(rows) is not list:
+        return stringify_value(rows)
+    return [_convert_row(row) if type(row) is dict else stringify_value(row) for row in rows]
+
+
+def _serialize_materials(material_rows):
+    materials_output = []
+    for row in material_rows or []:
+        if not isinstance(row, dict):
+            continue
+        if "Models" in row or "Model" in row:
+            materials_output.append(_convert_row(row))
+        else:
+            # Column-style rows (Model choice + Parameters groups) are rare;
+            # keep the reference implementation for them.
+            materials_output.extend(format_materials([row]))
+    return materials_output
+
+
+_CONVERTERS_BY_TYPE = {
+    "text edit": _convert_text,
+    "path finder": _convert_text,
+    "list": _convert_text,
+    "number": _convert_number,
+    "key-value list": _convert_mapping,
+    "table": _convert_table,
+}
+
+
+def _converter_for(field_def):
+    return _CONVERTERS_BY_TYPE.get(field_def.get("type", "").lower(), stringify_value)
+
+
+def compile_field_converters(solver_definitions):
+    converters = {}
+    for sections in solver_definitions.values():
+        for fields in sections.values():
+            for field in fields:
+                converters.setdefault(field["Name"], _converter_for(field))
+    return converters
+
+
+def _compile_section(converters):
+    lookup = converters.get
+
+    def serialize_section(fields):
+        return {name: lookup(name, stringify_value)(value) for name, value in fields.items()}
+
+    return serialize_section
+
+
+def _compile_reliability_source(converters):
+    lookup = converters.get
+
+    def serialize_source(fields):
+        run_file_raw = fields.get("RunFile", "")
+        if isinstance(run_file_raw, str):
+            run_file_value = run_file_raw.strip()
+        else:
+            run_file_value = str(run_file_raw).strip()
+
+        formatted = derive_run_metadata(run_file_value)
+        for field_name, value in fields.items():
+            if field_name == "Materials":
+                formatted[field_name] = _serialize_materials(value)
+            elif field_name == "RunFile":
+                formatted.setdefault("RunFile", _convert_text(value))
+            else:
+                formatted[field_name] = lookup(field_name, stringify_value)(value)
+        return formatted
+
+    return serialize_source
+
+
+def _serialize_pressure_ramp_profile(rows):
+    if not rows:
+        return {}
+
+    increments = []
+    time_marks = []
+    for row in rows:
+        if not isinstance(row, dict):
+            continue
+        increment = row.get(PRESSURE_RAMP_COLUMNS[0])
+        time_mark = row.get(PRESSURE_RAMP_COLUMNS[1])
+        if increment in ("", None) or time_mark in ("", None):
+            continue
+        increments.append(_convert_number(increment))
+        time_marks.append(_convert_number(time_mark))
+
+    if not increments:
+        return {}
+    return dict(zip(PRESSURE_RAMP_COLUMNS, (increments, time_marks)))
+
+
+# PressureOven flattens its sections into these payload keys.
+PRESSURE_OVEN_SECTION_KEYS = {
+    "material properties": "MaterialProperties",
+    "process conditions": "ProcessConditions",
+}
+PRESSURE_OVEN_GENERAL_FIELDS = ("OutputFolder", "Void shape (Cylindrical/Spherical)")
+PRESSURE_RAMP_COLUMNS = ("Pressure increment (Pa)", "Time mark (s)")
+
+
+def _compile_pressure_oven(converters):
+    lookup = converters.get
+
+    def convert_filled(section):
+        return {
+            key: lookup(key, stringify_value)(value)
+            for key, value in section.items()
+            if value not in ("", None)
+        }
+
+    def serialize(parameters):
+        general = parameters.get("general", {})
+        payload = {}
+
+        for field_name in PRESSURE_OVEN_GENERAL_FIELDS:
+            value = general.get(field_name)
+            if value not in ("", None):
+                payload[field_name] = _convert_text(value)
+
+        for section_name, payload_key in PRESSURE_OVEN_SECTION_KEYS.items():
+            section_values = convert_filled(parameters.get(section_name, {}))
+            if section_values:
+                payload[payload_key] = section_values
+
+        ramp_section = parameters.get("pressure ramp profile", {})
+        ramp_profile = _serialize_pressure_ramp_profile(ramp_section.get("Pressure Ramp Profile"))
+        if ramp_profile:
+            payload["PressureRampProfile"] = ramp_profile
+
+        return {"PressureOven": payload}
+
+    return serialize
+
+
+def compile_solver_serializer(solver_name, converters):
+    """Return ``parameters -> payload`` for ``solver_name``."""
+    solver_name = solver_name or ""
+    if solver_name == "PressureOven":
+        return _compile_pressure_oven(converters)
+
+    serialize_section = _compile_section(converters)
+
+    if solver_name == "ReliabilityTools":
+        serialize_source = _compile_reliability_source(converters)
+
+        def serialize_reliability(parameters):
+            formatted = {}
+            for section_name, fields in parameters.items():
+                if section_name.lower() == "source":
+                    formatted[section_name.capitalize()] = serialize_source(fields)
+                else:
+                    formatted[section_name.capitalize()] = serialize_section(fields)
+            return {"ReliabilityTools": formatted}
+
+        return serialize_reliability
+
+    payload_key = "Maptools" if solver_name == "MappingTool" else (solver_name or "Solver")
+
+    def serialize_generic(parameters):
+        return {
+            payload_key: {
+                section_name.capitalize(): serialize_section(fields)
+                for section_name, fields in parameters.items()
+            }
+        }
+
+    return serialize_generic
+
+
+_, _SOLVER_DEFINITIONS = load_structure(STRUCTURE_DEFINITION)
+_FIELD_CONVERTERS = compile_field_converters(_SOLVER_DEFINITIONS)
+_COMPILED_SERIALIZERS = {}
+
+
+def serialize_solver_payload(solver_name, parameters):
+    serializer = _COMPILED_SERIALIZERS.get(solver_name)
+    if serializer is None:
+        serializer = compile_solver_serializer(solver_name, _FIELD_CONVERTERS)
+        _COMPILED_SERIALIZERS[solver_name] = serializer
+    return serializer(parameters)
+
+
+SOLVER_KEY_ALIASES = {
+    "MappingTool": ["MappingTool", "Maptools"],
+    "ReliabilityTools": ["ReliabilityTools"],
+    "PressureOven": ["PressureOven"],
+}
+_SOLVER_BY_ALIAS = {}
+for _solver, _aliases in SOLVER_KEY_ALIASES.items():
+    for _alias in _aliases:
+        _SOLVER_BY_ALIAS.setdefault(_alias.lower(), _solver)
+
+
+def fold_keys(container):
+    """Case-folded key index; the first key in payload order wins."""
+    index = {}
+    for key, value in container.items():
+        index.setdefault(str(key).lower(), value)
+    return index
+
+
+def select_solver_payload(payload, candidates, fallback_solver=None):
+    """Return ``(solver_name, solver_payload)`` for the first candidate present."""
+    if not isinstance(payload, dict):
+        return None, None
+
+    folded = fold_keys(payload)
+    for solver in candidates:
+        for alias in SOLVER_KEY_ALIASES.get(solver, []):
+            solver_payload = folded.get(alias.lower())
+            if isinstance(solver_payload, dict):
+                return solver, solver_payload
+
+    dict_entries = [(str(key), value) for key, value in payload.items() if isinstance(value, dict)]
+    if len(dict_entries) == 1:
+        key, value = dict_entries[0]
+        return _SOLVER_BY_ALIAS.get(key.lower()) or fallback_solver, value
+
+    return None, None
+
+
+def _compile_section_decoder(fields):
+    lookups = [(field["Name"], field["Name"].lower()) for field in fields]
+
+    def decode_section(section_payload):
+        folded = fold_keys(section_payload)
+        values = {}
+        for field_name, folded_name in lookups:
+            value = folded.get(folded_name)
+            if value is not None:
+                values[field_name] = value
+        return values
+
+    return decode_section
+
+
+def _compile_pressure_oven_decoder(sections):
+    section_decoders = [
+        (section_name, payload_key.lower(), _compile_section_decoder(sections.get(section_name, [])))
+        for section_name, payload_key in PRESSURE_OVEN_SECTION_KEYS.items()
+    ]
+    ramp_keys = [column.lower() for column in PRESSURE_RAMP_COLUMNS]
+
+    def decode(solver_payload):
+        folded = fold_keys(solver_payload)
+        decoded = {"general": {}}
+        for field_name in PRESSURE_OVEN_GENERAL_FIELDS:
+            # A missing general field clears the widget, as the encoder omits empty ones.
+            value = folded.get(field_name.lower(), "")
+            if value is not None:
+                decoded["general"][field_name] = value
+
+        for section_name, payload_key, decode_section in section_decoders:
+            section_payload = folded.get(payload_key)
+            decoded[section_name] = decode_section(section_payload) if isinstance(section_payload, dict) else {}
+
+        ramp_rows = []
+        ramp_payload = folded.get("pressurerampprofile") or {}
+        if isinstance(ramp_payload, dict):
+            folded_ramp = fold_keys(ramp_payload)
+            columns = [folded_ramp.get(key) or [] for key in ramp_keys]
+            ramp_rows = [dict(zip(PRESSURE_RAMP_COLUMNS, values)) for values in zip(*columns)]
+        decoded["pressure ramp profile"] = {"Pressure Ramp Profile": ramp_rows}
+        return decoded
+
+    return decode
+
+
+def compile_solver_decoder(solver_name, sections):
+    """Return ``solver_payload -> {section: {field: value}}`` for ``solver_name``."""
+    if solver_name == "PressureOven":
+        return _compile_pressure_oven_decoder(sections)
+
+    section_decoders = [
+        (section_name, section_name.lower(), _compile_section_decoder(fields))
+        for section_name, fields in sections.items()
+    ]
+
+    def decode(solver_payload):
+        folded = fold_keys(solver_payload)
+        decoded = {}
+        for section_name, folded_name, decode_section in section_decoders:
+            section_payload = folded.get(folded_name)
+            if isinstance(section_payload, dict):
+                decoded[section_name] = decode_section(section_payload)
+        return decoded
+
+    return decode
+
+
+_COMPILED_DECODERS = {}
+
+
+def decode_solver_payload(solver_name, solver_payload):
+    if not isinstance(solver_payload, dict):
+        return {}
+    decoder = _COMPILED_DECODERS.get(solver_name)
+    if decoder is None:
+        decoder = compile_solver_decoder(solver_name, _SOLVER_DEFINITIONS.get(solver_name, {}))
+        _COMPILED_DECODERS[solver_name] = decoder
+    return decoder(solver_payload)
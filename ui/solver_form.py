@@ -0,0 +1,131 @@
+from contextlib import contextmanager
+from functools import partial
+
+from PySide6 import QtCore, QtWidgets
+
+from ui.constants import SECTION_EMOJIS
+from ui.field_widgets import (
+    CollapsibleBox,
+    MaterialsTableViewWidget,
+    MaterialsTableWidget,
+    PathFieldWidget,
+    create_field_widget,
+    default_field_value,
+)
+
+
+class DeferredField:
+    """Stands in for a field widget until its section is first expanded."""
+
+    def __init__(self, field_def):
+        self.field_def = field_def
+        self.section_box = None
+        self.widget = None
+
+    def value(self):
+        if self.widget is None:
+            return default_field_value(self.field_def)
+        return self.widget.value()
+
+    def set_value(self, value):
+        if self.widget is None:
+            self.section_box.ensure_built()
+        setter = getattr(self.widget, "set_value", None)
+        if callable(setter):
+            setter(value)
+
+
+class SolverForm(QtWidgets.QWidget):
+    """All parameter sections of one solver, built from its definition.
+
+    Sections are collapsible and only construct their widgets on first
+    expand; only the first section starts expanded.
+    """
+
+    runFileChanged = QtCore.Signal(str)
+
+    def __init__(self, solver_name, sections, parent=None):
+        super().__init__(parent)
+        self.solver_name = solver_name
+        self.parameter_widgets = {}
+        self.section_boxes = {}
+        self.run_file_widget = None
+        self.materials_widget = None
+        self._bulk_blocked = None
+        # (path, signature) of the .run last loaded into this form's materials.
+        self.watched_run = None
+
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(10)
+
+        for index, (section_name, fields) in enumerate(sections.items()):
+            emoji = SECTION_EMOJIS.get(section_name.lower(), "📦")
+            title = f"{emoji} {section_name.capitalize()}"
+            deferred_fields = {field["Name"]: DeferredField(field) for field in fields}
+            self.parameter_widgets[section_name] = deferred_fields
+
+            box = CollapsibleBox(
+                title,
+                partial(self._build_section, section_name, fields),
+                expanded=index == 0,
+                parent=self,
+            )
+            for deferred in deferred_fields.values():
+                deferred.section_box = box
+            self.section_boxes[section_name] = box
+            layout.addWidget(box)
+
+        layout.addStretch(1)
+
+    def field_widgets(self):
+        for fields in self.parameter_widgets.values():
+            for deferred in fields.values():
+                if deferred.widget is not None:
+                    yield deferred.widget
+
+    @contextmanager
+    def bulk_update(self):
+        """Apply many values with repaints and field signals suspended.
+
+        Layout and painting happen once when the block exits.
+        """
+        self.setUpdatesEnabled(False)
+        form_signals_were_blocked = self.blockSignals(True)
+        blocked = []
+        self._bulk_blocked = blocked
+        try:
+            for widget in self.field_widgets():
+                blocked.append((widget, widget.blockSignals(True)))
+            yield self
+        finally:
+            self._bulk_blocked = None
+            for widget, was_blocked in blocked:
+                widget.blockSignals(was_blocked)
+            self.blockSignals(form_signals_were_blocked)
+            self.setUpdatesEnabled(True)
+            self.layout().activate()
+            self.updateGeometry()
+
+    def _build_section(self, section_name, fields, parent):
+        group_box = QtWidgets.QGroupBox(parent)
+        group_layout = QtWidgets.QFormLayout(group_box)
+        group_layout.setContentsMargins(10, 10, 10, 10)
+        group_layout.setSpacing(8)
+
+        for field in fields:
+            field_name = field["Name"]
+            widget = create_field_widget(field, parent=group_box)
+            self.parameter_widgets[section_name][field_name].widget = widget
+            if self._bulk_blocked is not None:
+                self._bulk_blocked.append((widget, widget.blockSignals(True)))
+            group_layout.addRow(field_name, widget)
+            if section_name.lower() == "source":
+                if field_name == "RunFile" and isinstance(widget, PathFieldWidget):
+                    self.run_file_widget = widget
+                    widget.pathChanged.connect(self.runFileChanged)
+                if field_name == "Materials" and isinstance(
+                    widget, (MaterialsTableWidget, MaterialsTableViewWidget)
+                ):
+                    self.materials_widget = widget
+        return group_box
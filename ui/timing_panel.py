@@ -0,0 +1,44 @@
+from PySide6 import QtCore, QtWidgets
+
+from tracing import tracer
+
+
+class TimingPanel(QtWidgets.QDockWidget):
+    """Dock listing the most recent traced operations with their phases."""
+
+    _operationFinished = QtCore.Signal(object)
+
+    def __init__(self, parent=None):
+        super().__init__("⏱ Timings", parent)
+        self.setObjectName("TimingPanel")
+        self.tree = QtWidgets.QTreeWidget(self)
+        self.tree.setColumnCount(2)
+        self.tree.setHeaderLabels(["Operation", "ms"])
+        self.tree.header().setSectionResizeMode(0, QtWidgets.QHeaderView.Stretch)
+        self.tree.header().setSectionResizeMode(1, QtWidgets.QHeaderView.ResizeToContents)
+        self.setWidget(self.tree)
+
+        # Operations may finish on worker threads; the signal queues them to the UI thread.
+        self._operationFinished.connect(self._add_operation)
+        tracer.add_listener(self._operationFinished.emit)
+        for operation in tracer.operations():
+            self._add_operation(operation)
+
+    def clear(self):
+        self.tree.clear()
+
+    def _add_operation(self, operation):
+        item = self._make_item(operation)
+        self.tree.insertTopLevelItem(0, item)
+        limit = tracer.max_operations
+        while self.tree.topLevelItemCount() > limit:
+            self.tree.takeTopLevelItem(self.tree.topLevelItemCount() - 1)
+
+    def _make_item(self, span):
+        item = QtWidgets.QTreeWidgetItem([span.name, f"{span.duration * 1000:.2f}"])
+        item.setTextAlignment(1, QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter)
+        if span.args:
+            item.setToolTip(0, "\n".join(f"{key}: {value}" for key, value in span.args.items()))
+        for child in span.children:
+            item.addChild(self._make_item(child))
+        return item